@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from app.core.executors import run_io
+from app.core.llm.factory import LLMFactory
+from app.core.llm import metrics, limiter
+from app.core import executors
+
+router = APIRouter()
+
+@router.get("/metrics/llm-cache")
+async def llm_cache_metrics():
+    """Hit/miss counters and size of the persistent LLM response cache."""
+    return await run_io(LLMFactory.cache_stats)
+
+
+@router.get("/metrics/llm-requests")
+async def llm_request_metrics():
+    """
+    In-flight, queued and completed LLM requests per provider, the LLM pool
+    size, and each provider's adaptive concurrency limit and queue depth by priority.
+    """
+    return {
+        "executor_workers": executors.LLM_WORKERS,
+        "providers": metrics.snapshot(),
+        "limits": limiter.snapshot(),
+    }
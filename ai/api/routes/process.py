@@ -2,6 +2,10 @@ from fastapi import APIRouter, UploadFile, File, Form, BackgroundTasks, HTTPExce
 from fastapi.responses import JSONResponse
 from app.core.pipelines.graph import create_pipeline
 from app.core.pipelines.state import PipelineState
+from app.core.executors import run_io
+from app.core.storage.workspace import Workspace, prune_old_files
+from app.core.progress import progress_hub
+from app.core.llm.limiter import llm_priority
 import shutil
 import os
 import uuid
@@ -12,9 +16,7 @@ router = APIRouter()
 pipeline = create_pipeline()
 
 OUTPUT_DIR = "output"
-INPUT_DIR = "input"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
-os.makedirs(INPUT_DIR, exist_ok=True)
 
 # In-memory store for results (use DB in production)
 results_store = {}
@@ -23,24 +25,41 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-async def run_pipeline_task(task_id: str, file_path: str, participants: list | None = None):
+def _save_upload(source, input_path: str):
+    with open(input_path, "wb") as buffer:
+        shutil.copyfileobj(source, buffer)
+
+async def run_pipeline_task(task_id: str, workspace: Workspace, file_path: str, participants: list | None = None):
     logger.info(f"Starting pipeline for task {task_id}")
     try:
         initial_state: PipelineState = {
             "input_path": file_path,
+            "input_uri": None,
+            "workspace": workspace,
             "audio_path": None,
             "clean_audio_path": None,
+            "audio_buffer": None,
+            "speech_regions": None,
+            "prior_segments": None,
+            "audio_start": None,
+            "participant_tracks": None,
             "transcript_segments": None,
             "transcript_text": None,
+            "transcript_refined": None,
+            "chunk_summaries": None,
             "summary": None,
             "events": None,
+            "action_items": None,
             "error": None,
             "meeting_id": task_id,
             "participants": participants,
             "distribution_results": None,
         }
         
-        final_state = await pipeline.ainvoke(initial_state)
+        progress_hub.start(task_id)
+        # Someone is waiting on /status: ahead of queued batch work for LLM slots
+        with llm_priority("interactive"):
+            final_state = await pipeline.ainvoke(initial_state)
         
         # Save results to disk
         output_file = os.path.join(OUTPUT_DIR, f"{task_id}.json")
@@ -48,19 +67,25 @@ async def run_pipeline_task(task_id: str, file_path: str, participants: list | N
         result_data = {
             "summary": final_state.get("summary"),
             "events": final_state.get("events"),
+            "action_items": final_state.get("action_items"),
             "text": final_state.get("transcript_text"),
             "distribution_results": final_state.get("distribution_results"),
             "error": final_state.get("error")
         }
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(result_data, f, ensure_ascii=False, indent=2)
+        prune_old_files(OUTPUT_DIR)
             
         results_store[task_id] = {"status": "completed", "result": result_data}
+        progress_hub.complete(task_id, "pipeline", result_data["summary"] or "", error=result_data["error"])
         logger.info(f"Pipeline finished for {task_id}")
         
     except Exception as e:
         logger.error(f"Pipeline crashed for {task_id}: {e}", exc_info=True)
         results_store[task_id] = {"status": "failed", "error": str(e)}
+        progress_hub.complete(task_id, "pipeline", "", error=str(e))
+    finally:
+        workspace.cleanup()
 
 @router.post("/process")
 async def process_file(
@@ -90,10 +115,15 @@ async def process_file(
         # Use simple file extension handling or default to nothing if missing
         filename = file.filename or "file"
         file_ext = os.path.splitext(filename)[1]
-        input_path = os.path.join(INPUT_DIR, f"{task_id}{file_ext}")
+        # Waits here (backpressure) while the workspace disk quota is exhausted
+        workspace = await Workspace.create(task_id)
+        input_path = workspace.path(f"input{file_ext}")
         
-        with open(input_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        try:
+            await run_io(_save_upload, file.file, input_path)
+        except Exception:
+            workspace.cleanup()
+            raise
             
         results_store[task_id] = {"status": "processing"}
         
@@ -103,10 +133,11 @@ async def process_file(
             try:
                 parsed_participants = json.loads(participants)
             except json.JSONDecodeError:
+                workspace.cleanup()
                 raise HTTPException(status_code=400, detail="Invalid participants JSON")
         
         # Start background task
-        background_tasks.add_task(run_pipeline_task, task_id, input_path, parsed_participants)
+        background_tasks.add_task(run_pipeline_task, task_id, workspace, input_path, parsed_participants)
         
         return {"task_id": task_id, "status": "processing"}
     except HTTPException:
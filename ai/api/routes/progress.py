@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from app.core.progress import progress_hub
+import json
+
+router = APIRouter()
+
+@router.get("/progress/{meeting_id}")
+async def stream_progress(meeting_id: str):
+    """
+    Server-sent events with live pipeline progress for a meeting (or /process
+    task id): the summary as it is generated, then a final `done` event.
+    """
+    async def events():
+        async for event in progress_hub.subscribe(meeting_id):
+            yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -0,0 +1,135 @@
+"""
+Single-call meeting analysis.
+
+The separate pipeline sends the transcript to the LLM twice: once to
+summarize it and once more to extract events. `MeetingAnalyzer` asks for
+the summary, action items and events in one JSON-schema-constrained call,
+so the transcript tokens are paid for once. Transcripts that don't fit one
+prompt are analyzed chunk by chunk, concurrently; chunk summaries are then
+merged like the summarizer's (see Summarizer.reduce) and the action items
+and events of all chunks are concatenated without duplicates.
+"""
+import json
+import asyncio
+import logging
+from typing import List
+
+from app.core.llm.base import BaseLLM
+from app.core.ai.chunking import ChunkPacker
+from app.core.ai.summarizer import Summarizer, SUMMARY_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+_NULLABLE_STRING = {"type": ["string", "null"]}
+
+# Every property is required and no others are allowed, as strict structured output expects
+ANALYSIS_SCHEMA = {
+    "title": "meeting_analysis",
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "action_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "task": {"type": "string"},
+                    "owner": _NULLABLE_STRING,
+                    "due": _NULLABLE_STRING,
+                },
+                "required": ["task", "owner", "due"],
+                "additionalProperties": False,
+            },
+        },
+        "events": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "date": _NULLABLE_STRING,
+                    "time": _NULLABLE_STRING,
+                    "attendees": {"type": "array", "items": {"type": "string"}},
+                    "description": _NULLABLE_STRING,
+                },
+                "required": ["title", "date", "time", "attendees", "description"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["summary", "action_items", "events"],
+    "additionalProperties": False,
+}
+
+
+class MeetingAnalyzer:
+    """Summary, action items and scheduled events of a transcript in one LLM call per chunk."""
+
+    INSTRUCTION = (
+        "Analyze the following meeting transcript and return a JSON object with:\n"
+        "- 'summary': a concise, structured summary focusing on key decisions and important discussions.\n"
+        "- 'action_items': tasks agreed on, each with 'task', 'owner' and 'due' (YYYY-MM-DD).\n"
+        "- 'events': scheduled meetings or events, each with 'title', 'date' (YYYY-MM-DD), "
+        "'time', 'attendees' (list) and 'description'.\n"
+        "Use null for anything not mentioned and empty lists when there are no action items or events."
+    )
+
+    def __init__(self, llm: BaseLLM, concurrency: int = SUMMARY_CONCURRENCY, packer: ChunkPacker = None):
+        self.llm = llm
+        self.packer = packer or ChunkPacker.for_llm(llm)
+        self.summarizer = Summarizer(llm, concurrency, self.packer)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def analyze(self, text: str, segments: List[dict] = None) -> dict:
+        """
+        Returns {"summary", "action_items", "events"}. With `segments` (raw
+        Whisper segments of the same transcript) chunks are cut between
+        segments, otherwise at line and sentence ends.
+        """
+        # The schema travels with the prompt (or is described in it), so it counts too
+        overhead = self.packer.estimate(self._prompt("")) + self.packer.estimate(json.dumps(ANALYSIS_SCHEMA))
+        if self.packer.fits(text, overhead):
+            return await self._analyze_chunk(text)
+
+        if segments:
+            chunks = self.packer.pack_segments(segments, overhead)
+        else:
+            chunks = self.packer.pack_text(text, overhead)
+        logger.info(f"Transcript packed into {len(chunks)} analysis chunks (budget {self.packer.budget} tokens)")
+        results = await asyncio.gather(*(self._analyze_chunk(chunk) for chunk in chunks))
+
+        summary = await self.summarizer.reduce([r["summary"] for r in results if r["summary"]] or [""])
+        return {
+            "summary": summary,
+            "action_items": self._unique(
+                [item for r in results for item in r["action_items"]],
+                lambda item: ((item.get("task") or "").strip().lower(), item.get("owner")),
+            ),
+            "events": self._unique(
+                [event for r in results for event in r["events"]],
+                lambda event: ((event.get("title") or "").strip().lower(), event.get("date"), event.get("time")),
+            ),
+        }
+
+    def _prompt(self, text: str) -> str:
+        return f"{self.INSTRUCTION}\n\nTranscript:\n{text}"
+
+    async def _analyze_chunk(self, text: str) -> dict:
+        async with self._semaphore:
+            result = await self.llm.agenerate_json(self._prompt(text), ANALYSIS_SCHEMA)
+        return {
+            "summary": (result.get("summary") or "").strip(),
+            "action_items": [item for item in result.get("action_items") or [] if isinstance(item, dict)],
+            "events": [event for event in result.get("events") or [] if isinstance(event, dict)],
+        }
+
+    @staticmethod
+    def _unique(items: List[dict], key) -> List[dict]:
+        """Items in order, dropping later ones that repeat an earlier one's key."""
+        seen, unique = set(), []
+        for item in items:
+            k = key(item)
+            if k not in seen:
+                seen.add(k)
+                unique.append(item)
+        return unique
@@ -0,0 +1,151 @@
+"""
+Token-budgeted chunk packing for LLM prompts.
+
+Transcripts are packed into as few prompts as fit the model's context,
+cutting only at Whisper segment boundaries (or, for free text, at line and
+sentence ends), never inside a word. Sizes are estimated in tokens per
+provider rather than characters: Arabic script costs noticeably more
+tokens per character than Latin text, and the ratio depends on the
+tokenizer. `tiktoken` is used for OpenAI models when it is installed.
+"""
+import os
+import re
+import math
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Tokens left for the model's answer in every prompt
+LLM_OUTPUT_TOKENS = int(os.getenv("LLM_OUTPUT_TOKENS", "1024"))
+# Estimates are approximate; only this share of the remaining context is filled
+LLM_CONTEXT_FILL = float(os.getenv("LLM_CONTEXT_FILL", "0.9"))
+
+# Context window per provider's default model; override with <PROVIDER>_CONTEXT_TOKENS
+CONTEXT_TOKENS = {
+    "openai": int(os.getenv("OPENAI_CONTEXT_TOKENS", "128000")),   # gpt-4o-mini
+    "google": int(os.getenv("GOOGLE_CONTEXT_TOKENS", "1000000")),  # gemini-2.0-flash
+    "ollama": int(os.getenv("OLLAMA_CONTEXT_TOKENS", "8192")),     # gemma2:9b
+}
+
+# Average characters per token by script, measured on meeting transcripts
+_CHARS_PER_TOKEN = {
+    "openai": {"latin": 4.0, "arabic": 2.6},
+    "google": {"latin": 4.0, "arabic": 3.0},
+    "ollama": {"latin": 3.6, "arabic": 1.9},
+}
+_ARABIC = re.compile(r"[\u0600-\u06ff\u0750-\u077f\u08a0-\u08ff\ufb50-\ufdff\ufe70-\ufeff]")
+# Free-text split points: line breaks, then sentence ends (incl. the Arabic question mark)
+_SENTENCE_END = re.compile(r"(?<=[.!?\u061f\u06d4])\s+")
+
+try:
+    import tiktoken
+    _OPENAI_ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _OPENAI_ENCODING = None
+
+_PROVIDER_CLASSES = {"OpenAILLM": "openai", "GoogleLLM": "google", "OllamaLLM": "ollama"}
+
+
+def provider_of(llm) -> str:
+    """Provider name of an LLM instance (CachedLLM records it; raw providers by class)."""
+    provider = getattr(llm, "provider", None)
+    if provider in CONTEXT_TOKENS:
+        return provider
+    return _PROVIDER_CLASSES.get(type(llm).__name__, "ollama")
+
+
+def segment_pieces(segments: List[dict]) -> List[str]:
+    """Text of each segment, prefixed with its speaker when known."""
+    return [
+        f"{seg['speaker']}: {seg.get('text', '').strip()}" if seg.get("speaker") else seg.get("text", "")
+        for seg in segments
+    ]
+
+
+class ChunkPacker:
+    """Estimates prompt sizes for one provider and packs text into its context budget."""
+
+    def __init__(self, provider: str = "ollama", context_tokens: int = None, output_tokens: int = LLM_OUTPUT_TOKENS, budget: int = None):
+        self.provider = provider if provider in _CHARS_PER_TOKEN else "ollama"
+        context = context_tokens or CONTEXT_TOKENS[self.provider]
+        # An explicit budget caps prompts below the context (e.g. when the answer is as long as the input)
+        context_budget = max(256, int((context - output_tokens) * LLM_CONTEXT_FILL))
+        self.budget = min(budget, context_budget) if budget else context_budget
+        self._rates = _CHARS_PER_TOKEN[self.provider]
+
+    @classmethod
+    def for_llm(cls, llm, **kwargs) -> "ChunkPacker":
+        return cls(provider_of(llm), **kwargs)
+
+    def _tokens(self, text: str) -> float:
+        # Fractional, so estimates of consecutive pieces add up to the joined text's
+        if not text:
+            return 0.0
+        if self.provider == "openai" and _OPENAI_ENCODING is not None:
+            return float(len(_OPENAI_ENCODING.encode(text, disallowed_special=())))
+        arabic = len(_ARABIC.findall(text))
+        return arabic / self._rates["arabic"] + (len(text) - arabic) / self._rates["latin"]
+
+    def estimate(self, text: str) -> int:
+        """Approximate token count of `text` for this provider."""
+        return math.ceil(self._tokens(text))
+
+    def fits(self, text: str, overhead: int = 0) -> bool:
+        return self.estimate(text) + overhead <= self.budget
+
+    def pack(self, pieces: List[str], overhead: int = 0, separator: str = " ") -> List[str]:
+        """
+        Greedily joins consecutive pieces into chunks that fit the budget
+        (minus `overhead` tokens for the instruction). A piece that is too
+        large on its own is split at sentence ends, then at words.
+        """
+        return [separator.join(group) for group in self.pack_groups(pieces, overhead, separator)]
+
+    def pack_groups(self, pieces: List[str], overhead: int = 0, separator: str = " ") -> List[List[str]]:
+        """Like `pack`, but returns each chunk's pieces instead of the joined text."""
+        limit = max(1, self.budget - overhead)
+        sep_tokens = self._tokens(separator)
+        groups, current, size = [], [], 0
+        for piece in pieces:
+            piece = piece.strip()
+            if not piece:
+                continue
+            tokens = self._tokens(piece)
+            if tokens > limit and len(piece.split()) > 1:
+                # Packed separately at sentence/word boundaries, each part within the limit
+                parts = [(part, self._tokens(part)) for part in self.pack(self._split_oversized(piece, limit), overhead)]
+            else:
+                parts = [(piece, tokens)]
+            for part, part_tokens in parts:
+                if current and size + sep_tokens + part_tokens > limit:
+                    groups.append(current)
+                    current, size = [], 0
+                size += part_tokens + (sep_tokens if current else 0)
+                current.append(part)
+        if current:
+            groups.append(current)
+        return groups
+
+    def pack_segments(self, segments: List[dict], overhead: int = 0) -> List[str]:
+        """Chunks of segment text, cut only between Whisper segments."""
+        return self.pack(segment_pieces(segments), overhead)
+
+    def pack_text(self, text: str, overhead: int = 0) -> List[str]:
+        """Chunks of free text, cut at line breaks (kept) or sentence ends."""
+        if self.fits(text, overhead):
+            return [text] if text.strip() else []
+        lines = text.splitlines()
+        if len(lines) > 1:
+            return self.pack(lines, overhead, separator="\n")
+        return self.pack(_SENTENCE_END.split(text), overhead)
+
+    def _split_oversized(self, text: str, limit: int) -> List[str]:
+        """Sentences of an oversized piece, and the words of any sentence still too long."""
+        parts = []
+        for sentence in _SENTENCE_END.split(text):
+            if self.estimate(sentence) > limit:
+                parts.extend(sentence.split())
+            elif sentence.strip():
+                parts.append(sentence)
+        return parts
@@ -0,0 +1,138 @@
+import os
+import time
+import asyncio
+import logging
+from typing import List
+from app.core.llm.base import BaseLLM
+from app.core.ai.chunking import ChunkPacker, segment_pieces
+
+logger = logging.getLogger(__name__)
+
+# Refinement answers are as long as their input, so chunks stay well below the context
+REFINE_CHUNK_TOKENS = int(os.getenv("REFINE_CHUNK_TOKENS", "1500"))
+# Neighbouring text shown (not corrected) on each side of a chunk
+REFINE_OVERLAP_TOKENS = int(os.getenv("REFINE_OVERLAP_TOKENS", "150"))
+REFINE_CONCURRENCY = int(os.getenv("REFINE_CONCURRENCY", "4"))
+
+class TranscriptRefiner:
+    """
+    Cleans up raw ASR output (spelling, grammar, misheard words) with an LLM.
+
+    Long transcripts are refined in segment-aligned chunks, concurrently.
+    Each chunk's prompt also shows a little of the neighbouring text as
+    read-only context, so corrections at chunk edges stay consistent, and
+    the corrected chunks are stitched back in order. A chunk that fails
+    keeps its raw text; the others are still refined.
+    """
+
+    SYSTEM_INSTRUCTION = (
+        "You are an expert transcriber specialized in Egyptian Arabic dialect (Masri) and English. "
+        "You will be given a raw automated transcription that may contain spelling errors, "
+        "phonetic misinterpretations, or context errors.\n"
+        "Your task is to:\n"
+        "1. Correct the spelling and grammar while strictly preserving the speaker's language, dialect and meaning.\n"
+        "2. Do NOT translate the text, and do NOT convert Egyptian Arabic to Modern Standard Arabic (MSA/Fusha) "
+        "unless the original speaker was speaking MSA.\n"
+        "3. Output ONLY the corrected transcript, in the same language as the raw transcript. "
+        "Do not add any explanations or preambles.\n"
+    )
+
+    def __init__(
+        self,
+        llm: BaseLLM,
+        chunk_tokens: int = REFINE_CHUNK_TOKENS,
+        overlap_tokens: int = REFINE_OVERLAP_TOKENS,
+        concurrency: int = REFINE_CONCURRENCY,
+    ):
+        self.llm = llm
+        self.packer = ChunkPacker.for_llm(llm, budget=chunk_tokens)
+        self.overlap_tokens = overlap_tokens
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    def _prompt(self, text: str, before: str = "", after: str = "") -> str:
+        prompt = f"{self.SYSTEM_INSTRUCTION}\n\n"
+        if before:
+            prompt += f"Preceding context (for reference only, do NOT output it):\n{before}\n\n"
+        prompt += f"Raw Transcript:\n{text}"
+        if after:
+            prompt += f"\n\nFollowing context (for reference only, do NOT output it):\n{after}"
+        return prompt
+
+    async def refine(self, text: str, before: str = "", after: str = "") -> str:
+        """Refine one piece of transcript in a single prompt."""
+        refined_text = await self.llm.agenerate(self._prompt(text, before, after))
+        return refined_text.strip()
+
+    async def refine_segments(self, segments: List[dict]) -> str:
+        """Refine a transcript given as Whisper segments, cutting chunks between segments."""
+        pieces = segment_pieces(segments)
+        separator = "\n" if any(seg.get("speaker") for seg in segments) else " "
+        return await self.refine_pieces(pieces, separator)
+
+    async def refine_text(self, text: str) -> str:
+        """Refine free text, cutting chunks at line breaks and sentence ends."""
+        overhead = self.packer.estimate(self._prompt(""))
+        chunks = self.packer.pack_text(text, overhead)
+        return await self.refine_pieces(chunks, "\n" if "\n" in text else " ")
+
+    async def refine_pieces(self, pieces: List[str], separator: str = " ") -> str:
+        overhead = self.packer.estimate(self._prompt(""))
+        groups = self.packer.pack_groups(pieces, overhead, separator)
+        if not groups:
+            return ""
+        if len(groups) == 1:
+            return await self.refine(separator.join(groups[0]))
+
+        started = time.perf_counter()
+        chunks = [separator.join(group) for group in groups]
+        refined = await asyncio.gather(*(
+            self._refine_chunk(
+                i,
+                chunks[i],
+                self._context(groups[i - 1], separator, from_end=True) if i > 0 else "",
+                self._context(groups[i + 1], separator) if i + 1 < len(groups) else "",
+            )
+            for i in range(len(chunks))
+        ))
+        logger.info(f"Refined {len(chunks)} transcript chunks in {time.perf_counter() - started:.1f}s")
+        return separator.join(refined)
+
+    async def _refine_chunk(self, index: int, text: str, before: str, after: str) -> str:
+        async with self._semaphore:
+            try:
+                refined = await self.refine(text, before, after)
+            except Exception as e:
+                logger.warning(f"Refinement of chunk {index} failed, keeping raw text: {e}")
+                return text
+        if not refined:
+            logger.warning(f"Refinement of chunk {index} came back empty, keeping raw text")
+            return text
+        return refined
+
+    def _context(self, pieces: List[str], separator: str, from_end: bool = False) -> str:
+        """Up to `overlap_tokens` from the start (or end) of a neighbouring chunk, in whole pieces where possible."""
+        picked, size = [], 0
+        for piece in (reversed(pieces) if from_end else pieces):
+            tokens = self.packer.estimate(piece)
+            if size + tokens > self.overlap_tokens:
+                if not picked:
+                    # One long segment: keep the words nearest to the chunk edge
+                    picked.append(self._words_within(piece, from_end))
+                break
+            picked.append(piece)
+            size += tokens
+        if from_end:
+            picked.reverse()
+        return separator.join(picked)
+
+    def _words_within(self, text: str, from_end: bool) -> str:
+        words = text.split()
+        picked, size = [], 0
+        for word in (reversed(words) if from_end else words):
+            size += self.packer.estimate(word)
+            if size > self.overlap_tokens:
+                break
+            picked.append(word)
+        if from_end:
+            picked.reverse()
+        return " ".join(picked)
@@ -1,32 +1,115 @@
-from typing import List
+import os
+import time
+import asyncio
+import logging
+from typing import List, Callable
 from app.core.llm.base import BaseLLM
+from app.core.ai.chunking import ChunkPacker
+
+logger = logging.getLogger(__name__)
+
+# Chunk summaries requested from the LLM at the same time
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))
 
 class Summarizer:
-    def __init__(self, llm: BaseLLM):
+    """
+    Map-reduce summarizer: the transcript is packed into as few chunks as
+    fit the model's context (see ChunkPacker), chunks are summarized
+    concurrently, and partial summaries are merged in a tree of reduce
+    calls, each kept under the same budget, so a long meeting costs about
+    one chunk's latency plus log(n) reduce steps. Per-level timings of the
+    last run are kept in `last_timings`.
+
+    With `on_partial`, the call that produces the final summary is streamed
+    and `on_partial` receives the text generated so far after every delta;
+    its time to first token is kept in `last_ttft`.
+    """
+    REDUCE_INSTRUCTION = "Combine these section summaries into a cohesive meeting summary."
+
+    def __init__(self, llm: BaseLLM, concurrency: int = SUMMARY_CONCURRENCY, packer: ChunkPacker = None):
         self.llm = llm
+        self.packer = packer or ChunkPacker.for_llm(llm)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.last_timings: List[dict] = []
+        self.last_ttft: float = None
 
-    async def summarize(self, text: str, max_chunk_size: int = 15000) -> str:
+    async def summarize(self, text: str, segments: List[dict] = None, on_partial: Callable[[str], None] = None) -> str:
         """
-        Summarizes the given text. Handles large texts by chunking.
+        Summarizes the given text. Handles large texts by chunking: with
+        `segments` (raw Whisper segments of the same transcript) chunks are
+        cut between segments, otherwise at line and sentence ends.
         """
-        if len(text) <= max_chunk_size:
-            return await self._summarize_chunk(text)
-        
-        chunks = self._split_text(text, max_chunk_size)
-        chunk_summaries = []
-        for chunk in chunks:
-            summary = await self._summarize_chunk(chunk)
-            chunk_summaries.append(summary)
-        
-        # Merge summaries
-        combined_text = "\n".join(chunk_summaries)
-        final_summary = await self._summarize_chunk(
-            combined_text, 
-            instruction="Combine these section summaries into a cohesive meeting summary."
-        )
-        return final_summary
+        overhead = self.packer.estimate(self._prompt(""))
+        if self.packer.fits(text, overhead):
+            return await self._summarize_chunk(text, on_partial=on_partial)
+
+        if segments:
+            chunks = self.packer.pack_segments(segments, overhead)
+        else:
+            chunks = self.packer.pack_text(text, overhead)
+        logger.info(f"Transcript packed into {len(chunks)} chunks (budget {self.packer.budget} tokens)")
+        timings = []
+        chunk_summaries = await self._run_level("map", chunks, self._summarize_chunk, timings)
+        return await self.reduce(chunk_summaries, timings, on_partial)
 
-    async def _summarize_chunk(self, text: str, instruction: str = None) -> str:
+    async def reduce(self, chunk_summaries: List[str], timings: List[dict] = None, on_partial: Callable[[str], None] = None) -> str:
+        """
+        Merges summaries of consecutive transcript sections into one summary.
+        Partials are reduced in groups that fit the prompt budget, level by
+        level, until a single summary is left.
+        """
+        timings = [] if timings is None else timings
+        overhead = self.packer.estimate(self._prompt("", self.REDUCE_INSTRUCTION))
+        partials = list(chunk_summaries)
+        level = 0
+        while len(partials) > 1:
+            level += 1
+            groups = self._group(partials, overhead)
+            if len(groups) == 1:
+                # The last reduce produces the summary: stream it
+                reduce_group = lambda group: self._reduce_group(group, on_partial)
+            else:
+                reduce_group = self._reduce_group
+            partials = await self._run_level(f"reduce {level}", groups, reduce_group, timings)
+        self.last_timings = timings
+        return partials[0]
+
+    async def _run_level(self, name: str, inputs: list, func, timings: List[dict]) -> List[str]:
+        """Runs `func` over all inputs concurrently (bounded) and records the level's wall time."""
+        started = time.perf_counter()
+        results = await asyncio.gather(*(func(item) for item in inputs))
+        elapsed = time.perf_counter() - started
+        timings.append({"level": name, "inputs": len(inputs), "seconds": round(elapsed, 3)})
+        logger.info(f"Summarization {name}: {len(inputs)} inputs in {elapsed:.1f}s")
+        return results
+
+    async def _reduce_group(self, group: List[str], on_partial: Callable[[str], None] = None) -> str:
+        if len(group) == 1:
+            return group[0]
+        combined_text = "\n".join(group)
+        return await self._summarize_chunk(combined_text, instruction=self.REDUCE_INSTRUCTION, on_partial=on_partial)
+
+    def _group(self, partials: List[str], overhead: int) -> List[List[str]]:
+        """
+        Consecutive partials packed into groups whose combined text fits the
+        prompt budget. Every group but a trailing one holds at least two
+        partials, so each level strictly shrinks the tree.
+        """
+        limit = self.packer.budget - overhead
+        groups, current, size = [], [], 0
+        for partial in partials:
+            tokens = self.packer.estimate(partial) + 1
+            if len(current) >= 2 and size + tokens > limit:
+                groups.append(current)
+                current, size = [], 0
+            current.append(partial)
+            size += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    @staticmethod
+    def _prompt(text: str, instruction: str = None) -> str:
         default_instruction = (
             "Summarize the following meeting transcript. "
             "Focus on key decisions, action items, and important discussions. "
@@ -36,10 +119,21 @@ class Summarizer:
             "summarize the following text in 5 sentences"
             
         )
-        prompt = f"{instruction or default_instruction}\n\nTranscript:\n{text}"
-        return await self.llm.agenerate(prompt)
+        return f"{instruction or default_instruction}\n\nTranscript:\n{text}"
+
+    async def _summarize_chunk(self, text: str, instruction: str = None, on_partial: Callable[[str], None] = None) -> str:
+        async with self._semaphore:
+            if on_partial is None:
+                return await self.llm.agenerate(self._prompt(text, instruction))
+            return await self._stream(self._prompt(text, instruction), on_partial)
 
-    def _split_text(self, text: str, chunk_size: int) -> List[str]:
-        # Simple splitting by character count for now. 
-        # Ideally, split by newlines or paragraphs to respect boundaries.
-        return [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
+    async def _stream(self, prompt: str, on_partial: Callable[[str], None]) -> str:
+        started = time.perf_counter()
+        parts = []
+        async for delta in self.llm.astream(prompt):
+            if not parts:
+                self.last_ttft = round(time.perf_counter() - started, 3)
+                logger.info(f"Summary time to first token: {self.last_ttft:.2f}s")
+            parts.append(delta)
+            on_partial("".join(parts))
+        return "".join(parts)
@@ -0,0 +1,77 @@
+"""
+Windowed LLM processing of a transcript that is still being decoded.
+
+Segments are fed in as Whisper yields them. Every WINDOW_SECONDS of audio
+closes a window, which is refined (in segment-aligned, overlapping chunks,
+see TranscriptRefiner.refine_segments) and then summarized (token-budgeted,
+see Summarizer.summarize) in the background while transcription carries on. When the last segment arrives only the
+final window and the reduce step are left, so LLM latency overlaps ASR
+instead of following it.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.ai.refiner import TranscriptRefiner
+from app.core.ai.summarizer import Summarizer
+
+logger = logging.getLogger(__name__)
+
+
+class WindowedTranscriptProcessor:
+    def __init__(self, refiner: TranscriptRefiner, summarizer: Summarizer, window_seconds: float):
+        self.refiner = refiner
+        self.summarizer = summarizer
+        self.window_seconds = window_seconds
+        self._window = []
+        self._window_start = None
+        self._tasks = []
+
+    def add(self, segment: dict):
+        """Add a decoded segment; closes the current window once it is long enough."""
+        if self._window_start is None:
+            self._window_start = segment.get("start") or 0.0
+        self._window.append(segment)
+        if (segment.get("end") or 0.0) - self._window_start >= self.window_seconds:
+            self._close_window()
+
+    def _close_window(self):
+        segments = self._window
+        text = " ".join(seg.get("text", "") for seg in segments).strip()
+        index = len(self._tasks)
+        self._window, self._window_start = [], None
+        if text:
+            logger.info(f"Transcript window {index} closed ({len(text)} chars) — starting LLM stages")
+            self._tasks.append(asyncio.create_task(self._process(index, segments, text)))
+
+    async def _process(self, index: int, segments: list[dict], text: str) -> tuple[str, Optional[str]]:
+        try:
+            refined = await self.refiner.refine_segments(segments)
+        except Exception as e:
+            logger.error(f"Refinement of window {index} failed: {e}")
+            refined = text
+        try:
+            summary = await self.summarizer.summarize(refined)
+        except Exception as e:
+            logger.warning(f"Summarization of window {index} failed: {e}")
+            summary = None
+        return refined, summary
+
+    async def finish(self) -> tuple[str, Optional[list[str]]]:
+        """
+        Close the last window and wait for every window.
+        Returns (refined transcript, window summaries); summaries is None if
+        any window failed, so the summarize stage falls back to the full text.
+        """
+        if self._window:
+            self._close_window()
+        results = await asyncio.gather(*self._tasks)
+        refined = "\n".join(r for r, _ in results)
+        summaries = [s for _, s in results]
+        if not summaries or any(s is None for s in summaries):
+            return refined, None
+        return refined, summaries
+
+    def cancel(self):
+        for task in self._tasks:
+            task.cancel()
@@ -0,0 +1,70 @@
+"""
+In-memory PCM representation carried through the pipeline state.
+
+Audio is kept as float32, 16kHz mono samples in [-1, 1] — the format both
+WhisperX and faster-whisper consume directly — so transcription never has
+to re-decode a WAV from disk.
+"""
+import io
+import os
+import wave
+import logging
+import numpy as np
+
+from app.core.audio.frontend import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# How audio flows between the audio nodes and transcription:
+# - "memory": NumPy array held in PipelineState (no intermediate WAVs)
+# - "shared": .npy file memory-mapped read-only, for out-of-process consumers
+# - "file":   legacy behaviour, WAV paths only
+BUFFER_MODE = os.getenv("AUDIO_BUFFER_MODE", "memory").lower()
+
+
+def uses_buffers() -> bool:
+    return BUFFER_MODE in ("memory", "shared")
+
+
+def from_pcm_bytes(data: bytes) -> np.ndarray:
+    """Wrap raw f32le bytes produced by ffmpeg as a float32 array."""
+    return np.frombuffer(data, dtype=np.float32)
+
+
+def keep_pcm(pcm: np.ndarray, base_path: str) -> np.ndarray:
+    """
+    Return the buffer in the configured representation. In "shared" mode the
+    samples are written once to `<base_path>.npy` and re-opened as a read-only
+    memmap that other processes can map by filename without copying.
+    """
+    if BUFFER_MODE != "shared":
+        return pcm
+    npy_path = f"{base_path}.npy"
+    np.save(npy_path, np.asarray(pcm, dtype=np.float32))
+    logger.debug(f"Shared PCM buffer written to {npy_path}")
+    return np.load(npy_path, mmap_mode="r")
+
+
+def load_pcm(path: str) -> np.ndarray:
+    """Read a 16-bit PCM WAV (as written by the audio front-end) without ffmpeg."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1 or wav.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"Expected 16kHz mono 16-bit WAV: {path}")
+        frames = wav.readframes(wav.getnframes())
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def to_wav_bytes(pcm: np.ndarray) -> bytes:
+    """Encode a float32 buffer as an in-memory 16-bit WAV (for HTTP uploads)."""
+    samples = (np.clip(pcm, -1.0, 1.0) * 32767).astype(np.int16)
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+    return out.getvalue()
+
+
+def duration(pcm: np.ndarray) -> float:
+    return len(pcm) / SAMPLE_RATE
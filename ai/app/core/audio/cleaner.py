@@ -1,7 +1,36 @@
 import os
 import ffmpeg
 
+from app.core.audio.ffmpeg_async import run_ffmpeg
+
+# Cut-off for the rumble-removal high-pass filter
+HIGHPASS_HZ = 200
+
 class AudioCleaner:
+    @staticmethod
+    def _wav_spec(input_path: str, output_path: str):
+        return (
+            ffmpeg
+            .input(input_path)
+            .filter('highpass', f=HIGHPASS_HZ)
+            .output(output_path)
+            .overwrite_output()
+        )
+
+    @staticmethod
+    def _pcm_spec():
+        return (
+            ffmpeg
+            .input('pipe:0', format='f32le', ac=1, ar='16k')
+            .filter('highpass', f=HIGHPASS_HZ)
+            .output('pipe:1', format='f32le', acodec='pcm_f32le', ac=1, ar='16k')
+        )
+
+    @staticmethod
+    def _default_output(input_path: str) -> str:
+        base, ext = os.path.splitext(input_path)
+        return f"{base}_clean{ext}"
+
     @staticmethod
     def clean(input_path: str, output_path: str = None) -> str:
         """
@@ -13,20 +42,41 @@ class AudioCleaner:
             raise FileNotFoundError(f"Input file not found: {input_path}")
             
         if output_path is None:
-            base, ext = os.path.splitext(input_path)
-            output_path = f"{base}_clean{ext}"
+            output_path = AudioCleaner._default_output(input_path)
 
         # Simple pass-through or normalization could go here.
         # Implementation: Simple High-pass filter to remove rumble
         try:
-            (
-                ffmpeg
-                .input(input_path)
-                .filter('highpass', f='200')
-                .output(output_path)
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
+            AudioCleaner._wav_spec(input_path, output_path).run(capture_stdout=True, capture_stderr=True)
             return output_path
         except ffmpeg.Error as e:
             raise RuntimeError(f"ffmpeg cleanup error: {e.stderr.decode('utf8')}")
+
+    @staticmethod
+    def clean_pcm(pcm: bytes) -> bytes:
+        """
+        Applies the same high-pass filter to raw float32 16kHz mono PCM,
+        piping it through ffmpeg in memory.
+        """
+        try:
+            stdout, _ = AudioCleaner._pcm_spec().run(input=pcm, capture_stdout=True, capture_stderr=True)
+            return stdout
+        except ffmpeg.Error as e:
+            raise RuntimeError(f"ffmpeg cleanup error: {e.stderr.decode('utf8')}")
+
+    @staticmethod
+    async def aclean(input_path: str, output_path: str = None) -> str:
+        """Async variant of clean(): ffmpeg runs as an asyncio subprocess."""
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+
+        if output_path is None:
+            output_path = AudioCleaner._default_output(input_path)
+
+        await run_ffmpeg(AudioCleaner._wav_spec(input_path, output_path), error_label="ffmpeg cleanup error")
+        return output_path
+
+    @staticmethod
+    async def aclean_pcm(pcm: bytes) -> bytes:
+        """Async variant of clean_pcm()."""
+        return await run_ffmpeg(AudioCleaner._pcm_spec(), input_bytes=pcm, error_label="ffmpeg cleanup error")
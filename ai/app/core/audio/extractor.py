@@ -1,7 +1,29 @@
 import os
 import ffmpeg
 
+from app.core.audio.ffmpeg_async import run_ffmpeg
+
 class AudioExtractor:
+    @staticmethod
+    def _input(input_path: str, start: float = 0.0):
+        # `start` skips audio that was already transcribed live
+        return ffmpeg.input(input_path, ss=start) if start else ffmpeg.input(input_path)
+
+    @staticmethod
+    def _wav_spec(input_path: str, output_path: str, start: float = 0.0):
+        return (
+            AudioExtractor._input(input_path, start)
+            .output(output_path, acodec='pcm_s16le', ac=1, ar='16k')
+            .overwrite_output()
+        )
+
+    @staticmethod
+    def _pcm_spec(input_path: str, start: float = 0.0):
+        return (
+            AudioExtractor._input(input_path, start)
+            .output('pipe:1', format='f32le', acodec='pcm_f32le', ac=1, ar='16k')
+        )
+
     @staticmethod
     def extract(input_path: str, output_path: str = None) -> str:
         """
@@ -16,13 +38,42 @@ class AudioExtractor:
             output_path = f"{base}.wav"
 
         try:
-            (
-                ffmpeg
-                .input(input_path)
-                .output(output_path, acodec='pcm_s16le', ac=1, ar='16k')
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
+            AudioExtractor._wav_spec(input_path, output_path).run(capture_stdout=True, capture_stderr=True)
             return output_path
         except ffmpeg.Error as e:
             raise RuntimeError(f"ffmpeg error: {e.stderr.decode('utf8')}")
+
+    @staticmethod
+    def extract_pcm(input_path: str) -> bytes:
+        """
+        Extracts audio as raw float32 16kHz mono PCM on ffmpeg's stdout,
+        without writing an intermediate WAV.
+        """
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+
+        try:
+            stdout, _ = AudioExtractor._pcm_spec(input_path).run(capture_stdout=True, capture_stderr=True)
+            return stdout
+        except ffmpeg.Error as e:
+            raise RuntimeError(f"ffmpeg error: {e.stderr.decode('utf8')}")
+
+    @staticmethod
+    async def aextract(input_path: str, output_path: str = None, start: float = 0.0) -> str:
+        """Async variant of extract(): ffmpeg runs as an asyncio subprocess."""
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+
+        if output_path is None:
+            base, _ = os.path.splitext(input_path)
+            output_path = f"{base}.wav"
+
+        await run_ffmpeg(AudioExtractor._wav_spec(input_path, output_path, start))
+        return output_path
+
+    @staticmethod
+    async def aextract_pcm(input_path: str, start: float = 0.0) -> bytes:
+        """Async variant of extract_pcm()."""
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        return await run_ffmpeg(AudioExtractor._pcm_spec(input_path, start))
@@ -0,0 +1,53 @@
+"""
+Runs ffmpeg-python stream specs as asyncio subprocesses, so decoding never
+blocks the event loop or occupies an executor thread while ffmpeg works.
+"""
+import asyncio
+
+from app.core.executors import run_io
+
+STREAM_CHUNK_SIZE = 1024 * 1024  # bytes fed to ffmpeg's stdin per write
+
+
+async def run_ffmpeg(stream_spec, stream=None, input_bytes: bytes = None, error_label: str = "ffmpeg error") -> bytes:
+    """
+    Execute a compiled ffmpeg-python spec and return its stdout.
+    `stream` (a blocking readable, e.g. an S3 StreamingBody) or `input_bytes`
+    is fed to ffmpeg's stdin. Raises RuntimeError with ffmpeg's stderr on failure.
+    """
+    feeds_stdin = stream is not None or input_bytes is not None
+    process = await asyncio.create_subprocess_exec(
+        *stream_spec.compile(),
+        stdin=asyncio.subprocess.PIPE if feeds_stdin else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def feed():
+        try:
+            if input_bytes is not None:
+                process.stdin.write(input_bytes)
+                await process.stdin.drain()
+            else:
+                while True:
+                    # Blocking network reads go to the I/O pool
+                    chunk = await run_io(stream.read, STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    process.stdin.write(chunk)
+                    await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg exited early; its stderr explains why
+            pass
+        finally:
+            process.stdin.close()
+
+    feeder = asyncio.create_task(feed()) if feeds_stdin else None
+    stdout, stderr = await asyncio.gather(process.stdout.read(), process.stderr.read())
+    if feeder:
+        await feeder
+    returncode = await process.wait()
+
+    if returncode != 0:
+        raise RuntimeError(f"{error_label}: {stderr.decode('utf8', errors='replace')}")
+    return stdout
@@ -0,0 +1,180 @@
+import os
+import threading
+import ffmpeg
+
+from app.core.audio.cleaner import HIGHPASS_HZ
+from app.core.audio.ffmpeg_async import run_ffmpeg, STREAM_CHUNK_SIZE
+
+SAMPLE_RATE = 16000
+
+
+def _run_with_stream(process, stream, chunk_size: int = STREAM_CHUNK_SIZE) -> tuple[int, bytes, bytes]:
+    """
+    Feed a readable byte stream into a running ffmpeg process while draining
+    its stdout/stderr, so no pipe ever fills up and blocks ffmpeg.
+    Returns (returncode, stdout, stderr).
+    """
+    outputs = {}
+
+    def drain(name, pipe):
+        outputs[name] = pipe.read() if pipe else b""
+
+    readers = [
+        threading.Thread(target=drain, args=("stdout", process.stdout), daemon=True),
+        threading.Thread(target=drain, args=("stderr", process.stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            process.stdin.write(chunk)
+    except BrokenPipeError:
+        # ffmpeg exited early; its stderr explains why
+        pass
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    returncode = process.wait()
+    for reader in readers:
+        reader.join()
+    return returncode, outputs["stdout"], outputs["stderr"]
+
+
+class AudioFrontend:
+    """
+    Single-pass audio front-end.
+    Demuxes, resamples to 16kHz mono and applies the cleaning filter chain
+    in one ffmpeg invocation, replacing AudioExtractor + AudioCleaner.
+    """
+
+    @staticmethod
+    def _filtered_audio(stream):
+        return (
+            stream.audio
+            .filter('aresample', SAMPLE_RATE)
+            .filter('highpass', f=HIGHPASS_HZ)
+        )
+
+    @staticmethod
+    def _wav_output(stream, output_path: str):
+        return stream.output(output_path, acodec='pcm_s16le', ac=1, ar=SAMPLE_RATE)
+
+    @staticmethod
+    def _pcm_output(stream):
+        return stream.output('pipe:1', format='f32le', acodec='pcm_f32le', ac=1, ar=SAMPLE_RATE)
+
+    @staticmethod
+    def _input(source: str, start: float = 0.0):
+        # `start` skips audio that was already transcribed live
+        return ffmpeg.input(source, ss=start) if start else ffmpeg.input(source)
+
+    @staticmethod
+    def _wav_spec(source: str, output_path: str, start: float = 0.0):
+        return AudioFrontend._wav_output(
+            AudioFrontend._filtered_audio(AudioFrontend._input(source, start)), output_path
+        ).overwrite_output()
+
+    @staticmethod
+    def _pcm_spec(source: str, start: float = 0.0):
+        return AudioFrontend._pcm_output(AudioFrontend._filtered_audio(AudioFrontend._input(source, start)))
+
+    @staticmethod
+    def _default_output(input_path: str) -> str:
+        base, _ = os.path.splitext(input_path)
+        return f"{base}_clean.wav"
+
+    @staticmethod
+    def prepare(input_path: str, output_path: str = None) -> str:
+        """
+        Decodes a video/audio file straight into a cleaned 16kHz mono WAV.
+        Returns the path to the cleaned audio file.
+        """
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+
+        if output_path is None:
+            output_path = AudioFrontend._default_output(input_path)
+
+        try:
+            AudioFrontend._wav_spec(input_path, output_path).run(capture_stdout=True, capture_stderr=True)
+            return output_path
+        except ffmpeg.Error as e:
+            raise RuntimeError(f"ffmpeg front-end error: {e.stderr.decode('utf8')}")
+
+    @staticmethod
+    def prepare_stream(stream, output_path: str) -> str:
+        """
+        Same as prepare(), but decodes from a readable byte stream (e.g. an
+        S3 StreamingBody) piped into ffmpeg's stdin, so decoding overlaps
+        the download and the source never touches the disk.
+        Requires a streamable container (the recorder writes +faststart MP4s).
+        """
+        process = AudioFrontend._wav_spec('pipe:0', output_path).run_async(pipe_stdin=True, pipe_stderr=True)
+        returncode, _, stderr = _run_with_stream(process, stream)
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg stream front-end error: {stderr.decode('utf8', errors='replace')}")
+        return output_path
+
+    @staticmethod
+    def decode(input_path: str) -> bytes:
+        """
+        Decodes a video/audio file into cleaned float32 16kHz mono PCM
+        returned on ffmpeg's stdout; nothing is written to disk.
+        """
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+
+        try:
+            stdout, _ = AudioFrontend._pcm_spec(input_path).run(capture_stdout=True, capture_stderr=True)
+            return stdout
+        except ffmpeg.Error as e:
+            raise RuntimeError(f"ffmpeg front-end error: {e.stderr.decode('utf8')}")
+
+    @staticmethod
+    def decode_stream(stream) -> bytes:
+        """Streaming variant of decode(): byte stream in, float32 PCM out."""
+        process = AudioFrontend._pcm_spec('pipe:0').run_async(pipe_stdin=True, pipe_stdout=True, pipe_stderr=True)
+        returncode, stdout, stderr = _run_with_stream(process, stream)
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg stream front-end error: {stderr.decode('utf8', errors='replace')}")
+        return stdout
+
+    # ------------------------------------------------------------------
+    # Async variants: ffmpeg runs as an asyncio subprocess
+    # ------------------------------------------------------------------
+    @staticmethod
+    async def aprepare(input_path: str, output_path: str = None, start: float = 0.0) -> str:
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        if output_path is None:
+            output_path = AudioFrontend._default_output(input_path)
+        await run_ffmpeg(AudioFrontend._wav_spec(input_path, output_path, start), error_label="ffmpeg front-end error")
+        return output_path
+
+    @staticmethod
+    async def aprepare_stream(stream, output_path: str, start: float = 0.0) -> str:
+        await run_ffmpeg(
+            AudioFrontend._wav_spec('pipe:0', output_path, start), stream=stream,
+            error_label="ffmpeg stream front-end error",
+        )
+        return output_path
+
+    @staticmethod
+    async def adecode(input_path: str, start: float = 0.0) -> bytes:
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        return await run_ffmpeg(AudioFrontend._pcm_spec(input_path, start), error_label="ffmpeg front-end error")
+
+    @staticmethod
+    async def adecode_stream(stream, start: float = 0.0) -> bytes:
+        return await run_ffmpeg(
+            AudioFrontend._pcm_spec('pipe:0', start), stream=stream,
+            error_label="ffmpeg stream front-end error",
+        )
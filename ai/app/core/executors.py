@@ -0,0 +1,55 @@
+"""
+Dedicated executors for blocking pipeline work.
+
+The FastAPI app, the aio-pika consumer and the pipelines share one event
+loop. Blocking work is pushed onto separately sized pools instead of the
+loop's default executor, so `/status` polling and RabbitMQ heartbeats stay
+responsive while a meeting is being transcribed:
+
+- io:        blocking network/disk calls (S3 reads, MCP distribution, uploads)
+- inference: model inference; kept small because each call already uses
+             every core it is given
+- llm:       blocking LLM SDK calls, for providers without a usable async
+             client; bounded so a burst of meetings queues here instead of
+             taking every thread
+"""
+import os
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+IO_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", "8"))
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_EXECUTOR_WORKERS", "1"))
+LLM_WORKERS = int(os.getenv("LLM_EXECUTOR_WORKERS", "4"))
+
+io_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io")
+inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+llm_executor = ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix="llm")
+
+
+async def run_io(func, *args, **kwargs):
+    """Run a blocking I/O call on the I/O pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_inference(func, *args, **kwargs):
+    """Run model inference on the bounded inference pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_llm(func, *args, **kwargs):
+    """Run a blocking LLM SDK call on the bounded LLM pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(llm_executor, functools.partial(func, *args, **kwargs))
+
+
+def shutdown():
+    io_executor.shutdown(wait=False, cancel_futures=True)
+    inference_executor.shutdown(wait=False, cancel_futures=True)
+    llm_executor.shutdown(wait=False, cancel_futures=True)
+    logger.info("Pipeline executors shut down")
@@ -1,5 +1,17 @@
+import json
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
+
+def parse_json_response(text: str) -> Any:
+    """Parse a model's JSON answer, tolerating markdown fences and surrounding prose."""
+    clean = text.replace("```json", "").replace("```", "").strip()
+    try:
+        return json.loads(clean)
+    except json.JSONDecodeError:
+        start, end = clean.find("{"), clean.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        return json.loads(clean[start:end + 1])
 
 class BaseLLM(ABC):
     """
@@ -19,3 +31,29 @@ class BaseLLM(ABC):
         Asynchronous generation of text from a prompt.
         """
         pass
+
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Asynchronous generation that yields text deltas as they are produced.
+        Providers without streaming yield the whole response once.
+        """
+        yield await self.agenerate(prompt, **kwargs)
+
+    async def agenerate_json(self, prompt: str, schema: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """
+        Asynchronous generation of a JSON object matching `schema` (JSON Schema).
+        Providers with structured output constrain decoding to the schema;
+        the default asks for it in the prompt and parses the answer.
+        """
+        instruction = (
+            "\n\nRespond ONLY with a JSON object that matches this JSON Schema:\n"
+            f"{json.dumps(schema)}"
+        )
+        return parse_json_response(await self.agenerate(prompt + instruction, **kwargs))
+
+    async def aclose(self):
+        """
+        Release pooled connections. Providers are shared by LLMFactory, so
+        this is only called on shutdown (LLMFactory.aclose_all).
+        """
+        pass
@@ -0,0 +1,207 @@
+"""
+Persistent prompt/response cache for LLM providers.
+
+Reprocessing a meeting, a redelivered message or a second pipeline profile
+sends byte-identical prompts for refinement, summaries and event extraction.
+`CachedLLM` wraps any `BaseLLM` and serves those from a local SQLite store,
+keyed on provider, model, prompt and generation kwargs. Entries expire after
+LLM_CACHE_TTL_HOURS and the store is bounded by size, evicting the least
+recently used entries first. Pass `cache=False` to a call to bypass it.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from app.core.llm.base import BaseLLM
+from app.core.executors import run_io
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join("cache", "llm.sqlite3"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))  # 0 = never expire
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "256"))
+
+
+def prompt_key(provider: str, model: str, prompt: str, kwargs: dict) -> str:
+    """Hash of everything that determines a response."""
+    material = json.dumps(
+        {"provider": provider, "model": model, "prompt": prompt, "kwargs": kwargs},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=32).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite store with TTL expiry, size-bounded LRU eviction and hit/miss counters."""
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_seconds: float = LLM_CACHE_TTL_HOURS * 3600,
+        max_bytes: int = int(LLM_CACHE_MAX_MB * 1024 * 1024),
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            # Mark as recently used
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        if self.ttl_seconds > 0:
+            self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} LLM cache entries")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "entries": entries,
+                "size_bytes": size,
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CachedLLM(BaseLLM):
+    """
+    Serves repeated prompts from an `LLMResponseCache`; everything else goes
+    to the wrapped provider. `generate(..., cache=False)` skips the cache.
+    """
+
+    def __init__(self, llm: BaseLLM, store: LLMResponseCache, provider: str = None):
+        self.llm = llm
+        self.store = store
+        self.provider = provider or type(llm).__name__
+        self.model = getattr(llm, "model", None)
+
+    def __getattr__(self, name):
+        # Provider-specific attributes (clients, base_url, ...) stay reachable
+        return getattr(self.llm, name)
+
+    def _key(self, prompt: str, kwargs: dict) -> str:
+        return prompt_key(self.provider, self.model, prompt, kwargs)
+
+    def generate(self, prompt: str, cache: bool = True, **kwargs) -> str:
+        if not cache:
+            self.store.bypassed += 1
+            return self.llm.generate(prompt, **kwargs)
+        key = self._key(prompt, kwargs)
+        response = self.store.get(key)
+        if response is None:
+            response = self.llm.generate(prompt, **kwargs)
+            if isinstance(response, str):
+                self.store.put(key, response)
+        return response
+
+    async def agenerate(self, prompt: str, cache: bool = True, **kwargs) -> str:
+        if not cache:
+            self.store.bypassed += 1
+            return await self.llm.agenerate(prompt, **kwargs)
+        key = self._key(prompt, kwargs)
+        response = await run_io(self.store.get, key)
+        if response is None:
+            response = await self.llm.agenerate(prompt, **kwargs)
+            if isinstance(response, str):
+                await run_io(self.store.put, key, response)
+        return response
+
+    async def agenerate_json(self, prompt: str, schema: dict, cache: bool = True, **kwargs) -> dict:
+        if not cache:
+            self.store.bypassed += 1
+            return await self.llm.agenerate_json(prompt, schema, **kwargs)
+        key = self._key(prompt, {**kwargs, "json_schema": schema})
+        response = await run_io(self.store.get, key)
+        if response is not None:
+            return json.loads(response)
+        result = await self.llm.agenerate_json(prompt, schema, **kwargs)
+        await run_io(self.store.put, key, json.dumps(result, ensure_ascii=False))
+        return result
+
+    async def astream(self, prompt: str, cache: bool = True, **kwargs):
+        if not cache:
+            self.store.bypassed += 1
+            async for delta in self.llm.astream(prompt, **kwargs):
+                yield delta
+            return
+        key = self._key(prompt, kwargs)
+        response = await run_io(self.store.get, key)
+        if response is not None:
+            yield response
+            return
+        parts = []
+        async for delta in self.llm.astream(prompt, **kwargs):
+            parts.append(delta)
+            yield delta
+        # Only complete responses are stored
+        await run_io(self.store.put, key, "".join(parts))
+
+    async def aclose(self):
+        await self.llm.aclose()
@@ -1,20 +1,37 @@
 import os
+import logging
+import threading
 from enum import Enum
 from app.core.llm.base import BaseLLM
+from app.core.llm.cache import CachedLLM, LLMResponseCache, LLM_CACHE_ENABLED
+from app.core.llm.limiter import LimitedLLM, limiter_for, LLM_LIMIT_ENABLED
 from app.core.llm.providers.openai_llm import OpenAILLM
 from app.core.llm.providers.ollama_llm import OllamaLLM
 from app.core.llm.providers.google_llm import GoogleLLM
 
+logger = logging.getLogger(__name__)
+
 class LLMProvider(str, Enum):
     OPENAI = "openai"
     OLLAMA = "ollama"
     GOOGLE = "google"
 
 class LLMFactory:
+    """
+    Hands out one shared provider instance per (provider, options), so the
+    SDK clients and their connection pools live for the whole process
+    instead of being rebuilt on every node call. With LLM_LIMIT_ENABLED the
+    instances run under their provider's adaptive concurrency limit
+    (LimitedLLM), and with LLM_CACHE_ENABLED they are wrapped in CachedLLM
+    over one shared response store, in front of the limit so cache hits
+    never wait for a slot.
+    """
+    _instances: dict = {}
+    _cache: LLMResponseCache = None
+    _lock = threading.Lock()
+
     @staticmethod
-    def get_llm(provider: str = None, **kwargs) -> BaseLLM:
-        provider = provider or os.getenv("LLM_PROVIDER", "ollama")
-        
+    def _create(provider: str, **kwargs) -> BaseLLM:
         if provider == LLMProvider.OPENAI:
             return OpenAILLM(**kwargs)
         elif provider == LLMProvider.OLLAMA:
@@ -23,3 +40,53 @@ class LLMFactory:
             return GoogleLLM(**kwargs)
         else:
             raise ValueError(f"Unknown LLM provider: {provider}")
+
+    @staticmethod
+    def pipeline_providers() -> list:
+        """
+        Providers the pipeline's LLM stages (refinement, summarization and
+        analysis) try, in order of preference (PIPELINE_LLM_PROVIDERS).
+        """
+        providers = os.getenv("PIPELINE_LLM_PROVIDERS", "ollama")
+        return [p.strip() for p in providers.split(",") if p.strip()]
+
+    @staticmethod
+    def get_llm(provider: str = None, **kwargs) -> BaseLLM:
+        provider = provider or os.getenv("LLM_PROVIDER", "ollama")
+        key = (provider, tuple(sorted(kwargs.items())))
+
+        with LLMFactory._lock:
+            llm = LLMFactory._instances.get(key)
+            if llm is None:
+                llm = LLMFactory._create(provider, **kwargs)
+                if LLM_LIMIT_ENABLED:
+                    llm = LimitedLLM(llm, limiter_for(str(provider)), provider=str(provider))
+                if LLM_CACHE_ENABLED:
+                    if LLMFactory._cache is None:
+                        LLMFactory._cache = LLMResponseCache()
+                    llm = CachedLLM(llm, LLMFactory._cache, provider=str(provider))
+                LLMFactory._instances[key] = llm
+                logger.info(f"Created shared {provider} LLM client")
+            return llm
+
+    @staticmethod
+    def cache_stats() -> dict:
+        """Hit/miss counters and size of the shared response cache."""
+        if LLMFactory._cache is None:
+            return {"enabled": LLM_CACHE_ENABLED}
+        return {"enabled": True, **LLMFactory._cache.stats()}
+
+    @staticmethod
+    async def aclose_all():
+        """Close every shared provider's connection pools (application shutdown)."""
+        with LLMFactory._lock:
+            instances = list(LLMFactory._instances.values())
+            LLMFactory._instances.clear()
+            cache, LLMFactory._cache = LLMFactory._cache, None
+        for llm in instances:
+            try:
+                await llm.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing {type(llm).__name__}: {e}")
+        if cache:
+            cache.close()
@@ -0,0 +1,47 @@
+"""
+Shared HTTP connection pools for LLM provider clients.
+
+Providers are long-lived (see LLMFactory), so each one keeps a persistent
+keep-alive pool instead of paying a TCP/TLS handshake per prompt. HTTP/2 is
+used when the optional `h2` package is installed, so concurrent requests to
+the same endpoint are multiplexed over one connection.
+"""
+import os
+import logging
+import importlib.util
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() == "true"
+
+_H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+if LLM_HTTP2 and not _H2_AVAILABLE:
+    logger.info("LLM_HTTP2 is enabled but the 'h2' package is missing — using HTTP/1.1 keep-alive")
+
+
+def _client_options(timeout: float) -> dict:
+    return {
+        "limits": httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "timeout": httpx.Timeout(timeout, connect=10.0),
+        "http2": LLM_HTTP2 and _H2_AVAILABLE,
+    }
+
+
+def sync_client(timeout: float = LLM_TIMEOUT_SECONDS, **kwargs) -> httpx.Client:
+    """Pooled blocking client."""
+    return httpx.Client(**_client_options(timeout), **kwargs)
+
+
+def async_client(timeout: float = LLM_TIMEOUT_SECONDS, **kwargs) -> httpx.AsyncClient:
+    """Pooled asyncio client."""
+    return httpx.AsyncClient(**_client_options(timeout), **kwargs)
@@ -0,0 +1,424 @@
+"""
+Adaptive concurrency limits for outbound LLM calls.
+
+Concurrent pipelines and chunked map-reduce can send more requests than a
+provider serves well: the single Ollama box slows down for everyone, and
+OpenAI/Gemini start answering 429. Every provider instance handed out by
+LLMFactory is wrapped in `LimitedLLM`, which takes a slot from its
+provider's shared `AdaptiveLimiter` for each call.
+
+The limit adapts AIMD-style: each fast, successful call raises it by about
+one per limit's worth of calls (so roughly +1 per round trip), while a
+429/5xx, a timeout or a call much slower than usual cuts it multiplicatively,
+once per window of requests in flight. "Usual" is a running latency baseline
+per provider (and per signal: full calls vs. a stream's first token), so
+long generations that are always slow, like Ollama summaries, don't count as
+congestion; only calls LLM_LATENCY_TOLERANCE times slower than it do. Retry-After pauses
+the provider's queue, and 429/503 are retried up to LLM_RATE_LIMIT_RETRIES
+times. Waiting calls are served by priority class (see `llm_priority`), so
+interactive work overtakes batch reprocessing. Sync calls from worker
+threads share the same slots, queue and retries as async ones.
+"""
+import os
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+import threading
+from contextvars import ContextVar
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+from app.core.llm.base import BaseLLM
+
+logger = logging.getLogger(__name__)
+
+LLM_LIMIT_ENABLED = os.getenv("LLM_LIMIT_ENABLED", "true").lower() == "true"
+# Upper bound of concurrent calls per provider; the limit starts at half of it
+MAX_CONCURRENCY = {
+    "openai": int(os.getenv("OPENAI_MAX_CONCURRENCY", "32")),
+    "google": int(os.getenv("GOOGLE_MAX_CONCURRENCY", "32")),
+    "ollama": int(os.getenv("OLLAMA_MAX_CONCURRENCY", "4")),
+}
+# Calls this many times slower than the provider's running latency baseline count as congestion
+LLM_LATENCY_TOLERANCE = float(os.getenv("LLM_LATENCY_TOLERANCE", "3"))
+# Optional fixed latency target in seconds, used instead of the baseline
+LLM_LATENCY_TARGET_SECONDS = float(os.getenv("LLM_LATENCY_TARGET_SECONDS") or 0) or None
+# Weight of each new call in the baseline, and calls seen before it is trusted
+LLM_BASELINE_WEIGHT = 0.1
+LLM_BASELINE_SAMPLES = 5
+# Multiplicative decrease on congestion (rate limits and server errors cut twice as hard)
+LLM_LIMIT_BACKOFF = float(os.getenv("LLM_LIMIT_BACKOFF", "0.5"))
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "2"))
+# Pause after a 429/503 without Retry-After, doubled on every retry
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "1"))
+
+PRIORITY_CLASSES = ("interactive", "normal", "batch")
+_priority: ContextVar = ContextVar("llm_priority", default="normal")
+
+
+@contextmanager
+def llm_priority(name: str):
+    """
+    Priority class of the LLM calls made inside the block, including calls
+    from tasks it starts (e.g. a pipeline run): "interactive", "normal" or "batch".
+    """
+    if name not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown LLM priority class: {name}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def overload_signal(exc: BaseException) -> tuple[int | None, float | None]:
+    """
+    (HTTP status, Retry-After seconds) of a failed call, looking through the
+    exception chain, since providers wrap the HTTP client's errors.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        response = getattr(exc, "response", None)
+        status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+        if not isinstance(status, int):
+            status = getattr(exc, "code", None) if isinstance(getattr(exc, "code", None), int) else None
+        if status is not None:
+            headers = getattr(response, "headers", None) or {}
+            return status, _retry_after(headers.get("retry-after"))
+        if isinstance(exc, (asyncio.TimeoutError, TimeoutError)) or "Timeout" in type(exc).__name__:
+            return 504, None
+        exc = exc.__cause__ or exc.__context__
+    return None, None
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Retry-After as seconds (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _overloaded(status: int | None) -> bool:
+    return status is not None and (status == 429 or status >= 500)
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class _ThreadWaiter:
+    """A thread blocked in `acquire_sync`; queued next to the asyncio futures."""
+
+    def __init__(self):
+        self._granted = threading.Event()
+
+    def done(self) -> bool:
+        return self._granted.is_set()
+
+    def set_result(self, _):
+        self._granted.set()
+
+    def wait(self):
+        self._granted.wait()
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit with a priority queue for one provider. State is
+    guarded by a lock, so slots can be taken from the event loop (`acquire`)
+    and from worker threads (`acquire_sync`) alike.
+    """
+
+    def __init__(self, name: str, max_limit: int, min_limit: int = 1, latency_target: float = None):
+        self.name = name
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(max(self.min_limit, self.max_limit // 2))
+        self.latency_target = latency_target if latency_target is not None else LLM_LATENCY_TARGET_SECONDS
+        self._baselines = {}   # latency signal -> (running latency, calls seen)
+        self.in_flight = 0
+        self.throttled = 0
+        self.queue_wait_seconds = 0.0
+        self._waiters = []   # heap of (priority, seq, class name, future)
+        self._seq = itertools.count()
+        self._blocked_until = 0.0
+        self._resume_handle = None
+        self._last_decrease = 0.0
+        self._lock = threading.RLock()
+
+    def _capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def _take_or_queue(self, requested: float, priority: str, waiter) -> bool:
+        """Takes a free slot (True), or queues `waiter` for one. Call with the lock held."""
+        if requested >= self._blocked_until and not self._waiters and self.in_flight < self._capacity():
+            self.in_flight += 1
+            return True
+        heapq.heappush(self._waiters, (PRIORITY_CLASSES.index(priority), next(self._seq), priority, waiter))
+        self._dispatch()
+        return False
+
+    async def acquire(self, priority: str = "normal") -> float:
+        """Waits for a slot; returns when the call may start (monotonic time)."""
+        requested = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            if self._take_or_queue(requested, priority, future):
+                return requested
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future.done() and not future.cancelled():
+                    # The slot was handed over just as the caller went away
+                    self.in_flight -= 1
+                    self._dispatch()
+            raise
+        started = time.monotonic()
+        with self._lock:
+            self.queue_wait_seconds += started - requested
+        return started
+
+    def acquire_sync(self, priority: str = "normal") -> float:
+        """
+        Blocking `acquire` for worker threads. Not for the event loop's own
+        thread: it would stall the async calls it may be waiting on.
+        """
+        if _running_loop() is not None:
+            raise RuntimeError("acquire_sync() called on an event loop; use acquire()")
+        requested = time.monotonic()
+        waiter = _ThreadWaiter()
+        with self._lock:
+            if self._take_or_queue(requested, priority, waiter):
+                return requested
+        waiter.wait()
+        started = time.monotonic()
+        with self._lock:
+            self.queue_wait_seconds += started - requested
+        return started
+
+    def release(self, started: float, latency: float = None, status: int = None, retry_after: float = None,
+                signal: str = "call"):
+        """
+        Returns a slot and adapts the limit: `latency` of a successful call,
+        or the HTTP `status` (and Retry-After pause) of a failed one.
+        Failures that aren't congestion leave the limit as it is. `signal`
+        names what `latency` measures ("call", or "first_token" for
+        streams); each has its own baseline.
+        """
+        with self._lock:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            if _overloaded(status):
+                self.throttled += 1
+                self._decrease(started, now, LLM_LIMIT_BACKOFF, f"HTTP {status}")
+            elif latency is not None and self._slow(latency, signal):
+                self._decrease(started, now, (1 + LLM_LIMIT_BACKOFF) / 2, f"{latency:.1f}s latency")
+            elif latency is not None:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._dispatch()
+
+    def _slow(self, latency: float, signal: str) -> bool:
+        """Whether a successful call's latency means congestion; folds it into the baseline."""
+        if self.latency_target is not None:
+            return latency > self.latency_target
+        baseline, samples = self._baselines.get(signal, (latency, 0))
+        slow = samples >= LLM_BASELINE_SAMPLES and latency > baseline * LLM_LATENCY_TOLERANCE
+        self._baselines[signal] = (baseline + LLM_BASELINE_WEIGHT * (latency - baseline), samples + 1)
+        return slow
+
+    def _decrease(self, started: float, now: float, factor: float, reason: str):
+        # Calls that started before the last cut saw the old limit; don't cut again for them
+        if started < self._last_decrease or self.limit <= self.min_limit:
+            return
+        self.limit = max(self.min_limit, self.limit * factor)
+        self._last_decrease = now
+        logger.warning(f"{self.name} LLM concurrency limit lowered to {self.limit:.1f} ({reason})")
+
+    def _dispatch(self):
+        """
+        Hands free slots to the highest-priority waiters, unless a Retry-After
+        pause is on. Call with the lock held.
+        """
+        delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            if self._resume_handle is None:
+                loop = _running_loop()
+                if loop is not None:
+                    self._resume_handle = loop.call_later(delay, self._resume)
+                else:
+                    self._resume_handle = threading.Timer(delay, self._resume)
+                    self._resume_handle.daemon = True
+                    self._resume_handle.start()
+            return
+        while self._waiters and self.in_flight < self._capacity():
+            waiter = heapq.heappop(self._waiters)[-1]
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            if isinstance(waiter, asyncio.Future) and waiter.get_loop() is not _running_loop():
+                # Released from another thread; the future belongs to its loop
+                waiter.get_loop().call_soon_threadsafe(self._hand_over, waiter)
+            else:
+                waiter.set_result(None)
+
+    def _hand_over(self, future: asyncio.Future):
+        with self._lock:
+            if future.done():
+                # Cancelled while the slot was on its way
+                self.in_flight -= 1
+                self._dispatch()
+            else:
+                future.set_result(None)
+
+    def _resume(self):
+        with self._lock:
+            self._resume_handle = None
+            self._dispatch()
+
+    def snapshot(self) -> dict:
+        queued = dict.fromkeys(PRIORITY_CLASSES, 0)
+        with self._lock:
+            for _, _, priority, waiter in self._waiters:
+                if not waiter.done():
+                    queued[priority] += 1
+        return {
+            "limit": round(self.limit, 2),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queued": queued,
+            "queue_depth": sum(queued.values()),
+            "throttled": self.throttled,
+            "paused_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 3),
+            "queue_wait_seconds": round(self.queue_wait_seconds, 3),
+            "latency_baseline_seconds": {
+                signal: round(baseline, 3) for signal, (baseline, _) in list(self._baselines.items())
+            },
+        }
+
+
+_limiters: dict = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(provider: str) -> AdaptiveLimiter:
+    """The limiter shared by every instance of `provider`."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = AdaptiveLimiter(provider, MAX_CONCURRENCY.get(provider, 4))
+        return _limiters[provider]
+
+
+def snapshot() -> dict:
+    return {name: limiter.snapshot() for name, limiter in list(_limiters.items())}
+
+
+class LimitedLLM(BaseLLM):
+    """
+    Runs every call of the wrapped provider under its provider's
+    `AdaptiveLimiter`, retrying rate-limited calls after their Retry-After.
+    """
+
+    def __init__(self, llm: BaseLLM, limiter: AdaptiveLimiter, provider: str = None):
+        self.llm = llm
+        self.limiter = limiter
+        self.provider = provider or type(llm).__name__
+        self.model = getattr(llm, "model", None)
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def generate(self, prompt: str, **kwargs) -> str:
+        # Blocking twin of _call, for worker threads
+        for attempt in itertools.count():
+            started = self.limiter.acquire_sync(_priority.get())
+            try:
+                result = self.llm.generate(prompt, **kwargs)
+            except Exception as e:
+                status, retry_after = overload_signal(e)
+                pause = self._retry_pause(status, retry_after, attempt)
+                self.limiter.release(started, status=status, retry_after=pause if pause is not None else retry_after)
+                if pause is None:
+                    raise
+                logger.warning(f"{self.provider} answered HTTP {status}; retrying in {pause:.1f}s")
+                continue
+            except BaseException:
+                self.limiter.release(started)
+                raise
+            self.limiter.release(started, latency=time.monotonic() - started)
+            return result
+
+    def _retry_pause(self, status: int | None, retry_after: float | None, attempt: int) -> float | None:
+        """Seconds to pause before retrying, or None if the call shouldn't be retried."""
+        if status not in (429, 503) or attempt >= LLM_RATE_LIMIT_RETRIES:
+            return None
+        return retry_after if retry_after is not None else LLM_RETRY_BACKOFF_SECONDS * 2 ** attempt
+
+    async def _call(self, func):
+        for attempt in itertools.count():
+            started = await self.limiter.acquire(_priority.get())
+            try:
+                result = await func()
+            except asyncio.CancelledError:
+                self.limiter.release(started)
+                raise
+            except Exception as e:
+                status, retry_after = overload_signal(e)
+                pause = self._retry_pause(status, retry_after, attempt)
+                self.limiter.release(started, status=status, retry_after=pause if pause is not None else retry_after)
+                if pause is None:
+                    raise
+                logger.warning(f"{self.provider} answered HTTP {status}; retrying in {pause:.1f}s")
+                continue
+            self.limiter.release(started, latency=time.monotonic() - started)
+            return result
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        return await self._call(lambda: self.llm.agenerate(prompt, **kwargs))
+
+    async def agenerate_json(self, prompt: str, schema: dict, **kwargs) -> dict:
+        return await self._call(lambda: self.llm.agenerate_json(prompt, schema, **kwargs))
+
+    async def astream(self, prompt: str, **kwargs):
+        # The slot is held for the whole stream; time to first token is the latency signal
+        for attempt in itertools.count():
+            started = await self.limiter.acquire(_priority.get())
+            first_token = None
+            try:
+                async for delta in self.llm.astream(prompt, **kwargs):
+                    if first_token is None:
+                        first_token = time.monotonic() - started
+                    yield delta
+            except Exception as e:
+                status, retry_after = overload_signal(e)
+                # Only retried before anything was yielded
+                pause = self._retry_pause(status, retry_after, attempt) if first_token is None else None
+                self.limiter.release(started, status=status, retry_after=pause if pause is not None else retry_after)
+                if pause is None:
+                    raise
+                logger.warning(f"{self.provider} answered HTTP {status}; retrying in {pause:.1f}s")
+                continue
+            except BaseException:
+                # Cancelled, or the consumer stopped iterating
+                self.limiter.release(started)
+                raise
+            self.limiter.release(started, latency=first_token, signal="first_token")
+            return
+
+    async def aclose(self):
+        await self.llm.aclose()
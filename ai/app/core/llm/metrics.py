@@ -0,0 +1,95 @@
+"""
+In-flight request metrics for LLM providers.
+
+Each provider records its calls in a named `RequestStats`: requests in
+flight (and the peak), completed and failed calls, and their total
+latency. Calls that go through a thread pool also report how many are
+waiting for a worker and how long they waited, so queueing shows up
+separately from the provider's own latency.
+"""
+import time
+import threading
+from contextlib import asynccontextmanager
+
+
+class RequestStats:
+    """Counters for one provider's requests; safe to update from pool threads."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+        self.queued = 0
+        self.queue_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @asynccontextmanager
+    async def track(self):
+        """Counts the enclosed request as in flight and records its outcome and latency."""
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.in_flight -= 1
+                self.total_seconds += elapsed
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+
+    def queued_call(self, func):
+        """Wraps `func` for submission to a pool, counting it as queued until a worker picks it up."""
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+
+        def call(*args, **kwargs):
+            with self._lock:
+                self.queued -= 1
+                self.queue_wait_seconds += time.perf_counter() - submitted
+            return func(*args, **kwargs)
+
+        return call
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "queued": self.queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_seconds": round(self.total_seconds / finished, 3) if finished else None,
+                "queue_wait_seconds": round(self.queue_wait_seconds, 3),
+            }
+
+
+_stats: dict = {}
+_lock = threading.Lock()
+
+
+def request_stats(name: str) -> RequestStats:
+    """The shared stats for `name`, created on first use."""
+    with _lock:
+        if name not in _stats:
+            _stats[name] = RequestStats(name)
+        return _stats[name]
+
+
+def snapshot() -> dict:
+    with _lock:
+        stats = list(_stats.values())
+    return {s.name: s.snapshot() for s in stats}
@@ -1,12 +1,26 @@
 import os
+import json
 import asyncio
 from google import genai
+from google.genai import types
 from app.core.llm.base import BaseLLM
+from app.core.llm import http
+from app.core.llm.metrics import request_stats
+from app.core.executors import run_llm
+
+# Use the SDK's async client (client.aio); false runs the sync client on the bounded LLM pool
+GOOGLE_NATIVE_ASYNC = os.getenv("GOOGLE_NATIVE_ASYNC", "true").lower() == "true"
 
 class GoogleLLM(BaseLLM):
     """
     Google Gemini access via the official google-genai SDK.
     Docs: https://ai.google.dev/gemini-api/docs/text-generation
+
+    Async calls use the SDK's native async client over the pooled httpx
+    client, so concurrent requests don't hold threads. With
+    GOOGLE_NATIVE_ASYNC=false they fall back to the sync client on the
+    bounded LLM executor. Either way they are counted in the "google"
+    request stats (see app.core.llm.metrics).
     """
     def __init__(self, model: str = "gemini-2.0-flash", api_key: str = None):
         self.model = model
@@ -15,7 +29,17 @@ class GoogleLLM(BaseLLM):
         if not self.api_key:
             raise ValueError("GOOGLE_STADIO_AI (or GOOGLE_API_KEY) is not set")
         
-        self.client = genai.Client(api_key=self.api_key)
+        self.native_async = GOOGLE_NATIVE_ASYNC
+        self.stats = request_stats("google")
+        self._http_client = http.sync_client()
+        self._async_http_client = http.async_client()
+        self.client = genai.Client(
+            api_key=self.api_key,
+            http_options=types.HttpOptions(
+                httpx_client=self._http_client,
+                httpx_async_client=self._async_http_client,
+            ),
+        )
 
     def generate(self, prompt: str, **kwargs) -> str:
         response = self.client.models.generate_content(
@@ -25,7 +49,46 @@ class GoogleLLM(BaseLLM):
         )
         return response.text
 
+    async def _generate_content(self, prompt: str, **kwargs):
+        async with self.stats.track():
+            if self.native_async:
+                return await self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    **kwargs
+                )
+            call = self.stats.queued_call(self.client.models.generate_content)
+            return await run_llm(call, model=self.model, contents=prompt, **kwargs)
+
     async def agenerate(self, prompt: str, **kwargs) -> str:
-        # google-genai doesn't have native async, so we use run_in_executor
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, lambda: self.generate(prompt, **kwargs))
+        response = await self._generate_content(prompt, **kwargs)
+        return response.text
+
+    async def agenerate_json(self, prompt: str, schema: dict, **kwargs) -> dict:
+        response = await self._generate_content(
+            prompt,
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_json_schema=schema,
+            ),
+            **kwargs
+        )
+        return json.loads(response.text)
+
+    async def astream(self, prompt: str, **kwargs):
+        if not self.native_async:
+            yield await self.agenerate(prompt, **kwargs)
+            return
+        async with self.stats.track():
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model,
+                contents=prompt,
+                **kwargs
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+
+    async def aclose(self):
+        await self._async_http_client.aclose()
+        self._http_client.close()
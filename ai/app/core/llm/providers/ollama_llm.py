@@ -1,47 +1,84 @@
 import os
-import requests
-import httpx
+import json
 from app.core.llm.base import BaseLLM
+from app.core.llm import http
 
 class OllamaLLM(BaseLLM):
     def __init__(self, model: str = "gemma2:9b", base_url: str = None):
         self.model = model
         self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "https://pixilated-heterogenetically-sherly.ngrok-free.dev")
-
-    def generate(self, prompt: str, **kwargs) -> str:
-        url = f"{self.base_url}/chat"
         headers = {
             "Content-Type": "application/json",
             "ngrok-skip-browser-warning": "true"  # Required for ngrok free tier
         }
+        # Keep-alive pools shared by every prompt sent through this instance
+        self.client = http.sync_client(base_url=self.base_url, headers=headers)
+        self.aclient = http.async_client(base_url=self.base_url, headers=headers)
+
+    @staticmethod
+    def _payload(prompt: str) -> dict:
         # FastAPI wrapper expects {"message": "...", "history": [...]}
-        payload = {
+        return {
             "message": prompt,
             "history": []
         }
+
+    def generate(self, prompt: str, **kwargs) -> str:
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=120)
+            response = self.client.post("/chat", json=self._payload(prompt))
             response.raise_for_status()
             return response.json()["reply"]
         except Exception as e:
             raise RuntimeError(f"Ollama generation failed: {e}")
 
     async def agenerate(self, prompt: str, **kwargs) -> str:
-        url = f"{self.base_url}/chat"
-        headers = {
-            "Content-Type": "application/json",
-            "ngrok-skip-browser-warning": "true"  # Required for ngrok free tier
-        }
-        # FastAPI wrapper expects {"message": "...", "history": [...]}
-        payload = {
-            "message": prompt,
-            "history": []
-        }
-        async with httpx.AsyncClient(timeout=120) as client:
-            try:
-                response = await client.post(url, json=payload, headers=headers)
+        try:
+            response = await self.aclient.post("/chat", json=self._payload(prompt))
+            response.raise_for_status()
+            data = response.json()
+            return data["reply"]
+        except Exception as e:
+            raise RuntimeError(f"Ollama async generation failed: {e}")
+
+    @staticmethod
+    def _stream_delta(line: str) -> str:
+        """Text of one streamed line: NDJSON or SSE `data:` objects, or raw text."""
+        if line.startswith("data:"):
+            line = line[5:].strip()
+            if line == "[DONE]":
+                return ""
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            return line
+        if not isinstance(data, dict):
+            return str(data)
+        message = data.get("message")
+        if isinstance(message, dict):
+            return message.get("content", "")
+        for key in ("token", "delta", "response", "reply"):
+            if isinstance(data.get(key), str):
+                return data[key]
+        return ""
+
+    async def astream(self, prompt: str, **kwargs):
+        # Wrappers that can stream answer with NDJSON / SSE; others return the usual JSON reply
+        payload = {**self._payload(prompt), "stream": True}
+        try:
+            async with self.aclient.stream("POST", "/chat", json=payload) as response:
                 response.raise_for_status()
-                data = response.json()
-                return data["reply"]
-            except Exception as e:
-                raise RuntimeError(f"Ollama async generation failed: {e}")
+                content_type = response.headers.get("content-type", "")
+                if "ndjson" not in content_type and "event-stream" not in content_type:
+                    data = json.loads(await response.aread())
+                    yield data["reply"]
+                    return
+                async for line in response.aiter_lines():
+                    delta = self._stream_delta(line.strip()) if line.strip() else ""
+                    if delta:
+                        yield delta
+        except Exception as e:
+            raise RuntimeError(f"Ollama streaming generation failed: {e}")
+
+    async def aclose(self):
+        await self.aclient.aclose()
+        self.client.close()
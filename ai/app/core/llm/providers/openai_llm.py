@@ -1,6 +1,8 @@
 import os
+import json
 from openai import OpenAI, AsyncOpenAI
 from app.core.llm.base import BaseLLM
+from app.core.llm import http
 
 class OpenAILLM(BaseLLM):
     def __init__(self, model: str = "gpt-4o-mini", api_key: str = None):
@@ -9,8 +11,9 @@ class OpenAILLM(BaseLLM):
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY is not set")
         
-        self.client = OpenAI(api_key=self.api_key)
-        self.aclient = AsyncOpenAI(api_key=self.api_key)
+        # Request timeouts stay with the SDK; the pools only set connection reuse
+        self.client = OpenAI(api_key=self.api_key, http_client=http.sync_client())
+        self.aclient = AsyncOpenAI(api_key=self.api_key, http_client=http.async_client())
 
     def generate(self, prompt: str, **kwargs) -> str:
         response = self.client.chat.completions.create(
@@ -20,6 +23,33 @@ class OpenAILLM(BaseLLM):
         )
         return response.choices[0].message.content
 
+    async def agenerate_json(self, prompt: str, schema: dict, **kwargs) -> dict:
+        response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": schema.get("title", "response"), "schema": schema, "strict": True},
+            },
+            **kwargs
+        )
+        return json.loads(response.choices[0].message.content)
+
+    async def astream(self, prompt: str, **kwargs):
+        stream = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            **kwargs
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def aclose(self):
+        await self.aclient.close()
+        self.client.close()
+
     async def agenerate(self, prompt: str, **kwargs) -> str:
         response = await self.aclient.chat.completions.create(
             model=self.model,
@@ -1,6 +1,7 @@
 """
 RabbitMQ consumer that listens for recording.completed events
-and triggers the AI pipeline.
+and triggers the AI pipeline. With live transcription enabled it also
+consumes recording.chunk events published while a meeting is running.
 """
 import os
 import json
@@ -12,25 +13,60 @@ from app.core.messaging.rabbitmq import get_channel
 from app.core.storage.minio_client import download_recording
 from app.core.pipelines.graph import create_pipeline
 from app.core.pipelines.state import PipelineState
+from app.core.executors import run_io
+from app.core.storage.workspace import Workspace, prune_old_files
+from app.core.transcription.live import SegmentLog, transcribe_chunk
+from app.core.transcription.tracks import parse_tracks
+from app.core.progress import progress_hub
+from app.core.llm.limiter import llm_priority
 
 logger = logging.getLogger(__name__)
 
 EXCHANGE_NAME = "meetings"
 QUEUE_NAME = "recording.completed"
 ROUTING_KEY = "recording.completed"
-INPUT_DIR = "input"
+CHUNK_QUEUE_NAME = "recording.chunk"
+CHUNK_ROUTING_KEY = "recording.chunk"
 OUTPUT_DIR = "output"
+# Pipe recordings from MinIO into ffmpeg instead of downloading them first
+STREAMING_INGEST = os.getenv("STREAMING_INGEST", "true").lower() == "true"
+# Transcribe recording.chunk events during the meeting
+LIVE_TRANSCRIPTION = os.getenv("LIVE_TRANSCRIPTION", "true").lower() == "true"
+
+
+async def process_chunk_event(message: aio_pika.abc.AbstractIncomingMessage):
+    """
+    Process a single recording.chunk event published during a meeting:
+    {"meetingId", "seq", "startSeconds", "audioBucket", "audioKey"}.
+    The chunk is transcribed and appended to the meeting's segment log.
+    """
+    async with message.process():
+        try:
+            body = json.loads(message.body.decode())
+            meeting_id = body["meetingId"]
+            await transcribe_chunk(
+                meeting_id=meeting_id,
+                seq=int(body["seq"]),
+                start=float(body.get("startSeconds", 0.0)),
+                bucket=body.get("audioBucket", "recordings"),
+                key=body["audioKey"],
+            )
+        except Exception as e:
+            logger.error(f"Error processing recording chunk: {e}", exc_info=True)
+            # Message will be nacked and requeued by aio_pika on exception
+            raise
 
 
 async def process_recording_event(message: aio_pika.abc.AbstractIncomingMessage):
     """
     Process a single recording.completed event:
     1. Parse the event payload
-    2. Download the video from MinIO
+    2. Stream (or download) the video from MinIO
     3. Run the unified AI pipeline (with participants for distribution)
     4. Acknowledge the message
     """
     async with message.process():
+        workspace = None
         try:
             body = json.loads(message.body.decode())
 
@@ -39,36 +75,71 @@ async def process_recording_event(message: aio_pika.abc.AbstractIncomingMessage)
             video_bucket = body.get("videoBucket", "recordings")
             video_key = body.get("videoKey", "")
             participants = body.get("participants", [])
+            # Optional per-participant audio, transcribed instead of the mixed track
+            participant_tracks = parse_tracks(body.get("audioTracks"))
+            # A redelivered or re-run meeting starts a fresh progress stream
+            progress_hub.start(meeting_id)
 
             logger.info(f"Received recording.completed event", extra={
                 "meetingId": meeting_id,
                 "roomId": room_id,
                 "videoKey": video_key,
                 "participantCount": len(participants),
+                "trackCount": len(participant_tracks),
             })
 
-            # 1. Download the recording from MinIO
-            os.makedirs(INPUT_DIR, exist_ok=True)
+            # 1. Fetch the recording from MinIO. With streaming ingest the
+            # object is piped straight into the decoder by the pipeline;
+            # local_path is only used as a fallback download target.
+            # Creating the workspace waits while the disk quota is exhausted,
+            # leaving further messages unacked on the broker.
             task_id = str(uuid.uuid4())
-            local_path = os.path.join(INPUT_DIR, f"{task_id}.mp4")
-
-            download_recording(
-                bucket=video_bucket,
-                key=video_key,
-                local_path=local_path,
-            )
+            workspace = await Workspace.create(task_id)
+            local_path = workspace.path("recording.mp4")
+            input_uri = None
+
+            if STREAMING_INGEST:
+                input_uri = f"s3://{video_bucket}/{video_key}"
+            else:
+                await run_io(
+                    download_recording,
+                    bucket=video_bucket,
+                    key=video_key,
+                    local_path=local_path,
+                )
+
+            # 2. Run the unified pipeline. Audio already transcribed live is
+            # reused; only the tail after it is decoded and transcribed.
+            segment_log = SegmentLog(meeting_id) if LIVE_TRANSCRIPTION else None
+            prior_segments, audio_start = [], 0.0
+            if segment_log and not participant_tracks:
+                prior_segments, audio_start = segment_log.coverage()
+            if audio_start:
+                logger.info(
+                    f"Resuming meeting {meeting_id} from live transcript: "
+                    f"{len(prior_segments)} segments, {audio_start:.1f}s covered"
+                )
 
-            # 2. Run the unified pipeline
             pipeline = create_pipeline()
 
             initial_state: PipelineState = {
                 "input_path": local_path,
+                "input_uri": input_uri,
+                "workspace": workspace,
                 "audio_path": None,
                 "clean_audio_path": None,
+                "audio_buffer": None,
+                "speech_regions": None,
+                "prior_segments": prior_segments or None,
+                "audio_start": audio_start or None,
+                "participant_tracks": participant_tracks or None,
                 "transcript_segments": None,
                 "transcript_text": None,
+                "transcript_refined": None,
+                "chunk_summaries": None,
                 "summary": None,
                 "events": None,
+                "action_items": None,
                 "error": None,
                 "meeting_id": meeting_id,
                 "participants": participants,
@@ -76,7 +147,12 @@ async def process_recording_event(message: aio_pika.abc.AbstractIncomingMessage)
             }
 
             logger.info(f"Starting pipeline for meeting {meeting_id} (task {task_id})")
-            final_state = await pipeline.ainvoke(initial_state)
+            # Redelivered messages are reprocessing; they yield LLM slots to fresh meetings
+            with llm_priority("batch" if message.redelivered else "normal"):
+                final_state = await pipeline.ainvoke(initial_state)
+            progress_hub.complete(
+                meeting_id, "pipeline", final_state.get("summary") or "", error=final_state.get("error")
+            )
 
             # 3. Save results
             os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -87,6 +163,7 @@ async def process_recording_event(message: aio_pika.abc.AbstractIncomingMessage)
                 "room_id": room_id,
                 "summary": final_state.get("summary"),
                 "events": final_state.get("events"),
+                "action_items": final_state.get("action_items"),
                 "text": final_state.get("transcript_text"),
                 "distribution_results": final_state.get("distribution_results"),
                 "error": final_state.get("error"),
@@ -94,6 +171,10 @@ async def process_recording_event(message: aio_pika.abc.AbstractIncomingMessage)
 
             with open(output_file, "w", encoding="utf-8") as f:
                 json.dump(result_data, f, ensure_ascii=False, indent=2)
+            prune_old_files(OUTPUT_DIR)
+
+            if segment_log and not final_state.get("error"):
+                segment_log.remove()
 
             logger.info(f"Pipeline completed for meeting {meeting_id}", extra={
                 "taskId": task_id,
@@ -104,6 +185,9 @@ async def process_recording_event(message: aio_pika.abc.AbstractIncomingMessage)
             logger.error(f"Error processing recording event: {e}", exc_info=True)
             # Message will be nacked and requeued by aio_pika on exception
             raise
+        finally:
+            if workspace:
+                workspace.cleanup()
 
 
 async def start_consumer():
@@ -125,3 +209,9 @@ async def start_consumer():
     await queue.consume(process_recording_event)
 
     logger.info(f"RabbitMQ consumer started — listening on queue '{QUEUE_NAME}'")
+
+    if LIVE_TRANSCRIPTION:
+        chunk_queue = await channel.declare_queue(CHUNK_QUEUE_NAME, durable=True)
+        await chunk_queue.bind(exchange, CHUNK_ROUTING_KEY)
+        await chunk_queue.consume(process_chunk_event)
+        logger.info(f"RabbitMQ consumer started — listening on queue '{CHUNK_QUEUE_NAME}'")
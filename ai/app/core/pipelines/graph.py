@@ -1,11 +1,16 @@
+import os
 from langgraph.graph import StateGraph, END
 from app.core.pipelines.state import PipelineState
 from app.core.pipelines.nodes.extract_audio import extract_audio_node
 from app.core.pipelines.nodes.clean_audio import clean_audio_node
+from app.core.pipelines.nodes.prepare_audio import prepare_audio_node
+from app.core.pipelines.nodes.detect_speech import detect_speech_node
 from app.core.pipelines.nodes.transcribe import transcribe_node
+from app.core.pipelines.nodes.transcribe_tracks import transcribe_tracks_node
 from app.core.pipelines.nodes.refine_transcript import refine_transcript_node
 from app.core.pipelines.nodes.summarize import summarize_node
 from app.core.pipelines.nodes.extract_events import extract_events_node
+from app.core.pipelines.nodes.analyze import analyze_node
 from app.core.pipelines.nodes.distribute import distribute_node
 from app.core.ai.event_heuristics import EventHeuristics
 
@@ -22,37 +27,139 @@ def should_extract_events(state: PipelineState) -> str:
         return "extract_events"
     return "distribute"
 
-def create_pipeline():
+def has_speech(state: PipelineState) -> str:
+    """
+    Conditional edge after VAD: recordings without any speech skip
+    transcription and every LLM stage. If only the tail after a live
+    transcript is silent, the live transcript goes straight to refinement.
+    """
+    if state.get("speech_regions") == []:
+        return "refine_transcript" if state.get("transcript_segments") else "distribute"
+    return "transcribe"
+
+def has_tracks(state: PipelineState) -> str:
+    """
+    Conditional entry: with per-participant audio tracks, transcribe those
+    instead of the mixed composite recording.
+    """
+    return "transcribe_tracks" if state.get("participant_tracks") else "composite"
+
+def after_tracks(state: PipelineState) -> str:
+    """
+    After track transcription: continue to refinement, skip the LLM stages
+    when nobody spoke, or fall back to the composite when the tracks failed.
+    """
+    if state.get("error"):
+        return "distribute"
+    segments = state.get("transcript_segments")
+    if segments is None:
+        return "composite"
+    return "refine_transcript" if segments else "distribute"
+
+def create_pipeline(audio_frontend: str = None, vad: bool = None, analysis: str = None):
+    """
+    Build the meeting pipeline.
+    `audio_frontend` selects how audio is prepared (AUDIO_FRONTEND env var):
+    - "fused" (default): one ffmpeg pass decodes, resamples and filters.
+    - "split": separate extract_audio and clean_audio stages.
+    `vad` inserts the detect_speech stage before transcription (VAD_ENABLED env var).
+    `analysis` selects how the transcript is analyzed (PIPELINE_ANALYSIS env var):
+    - "separate" (default): summarize, then extract_events when heuristics find scheduling talk.
+    - "fused": one analyze stage returns summary, action items and events in a single structured call.
+    - "parallel": summarize and extract_events fan out after refinement, run
+      concurrently and are joined before distribute.
+    Events with per-participant audio tracks enter at transcribe_tracks instead
+    and only prepare the composite if the tracks can't be transcribed.
+    """
+    audio_frontend = audio_frontend or os.getenv("AUDIO_FRONTEND", "fused")
+    analysis = analysis or os.getenv("PIPELINE_ANALYSIS", "separate")
+    if vad is None:
+        vad = os.getenv("VAD_ENABLED", "true").lower() == "true"
     workflow = StateGraph(PipelineState)
 
     # Add Nodes
-    workflow.add_node("extract_audio", extract_audio_node)
-    workflow.add_node("clean_audio", clean_audio_node)
+    if audio_frontend == "split":
+        workflow.add_node("extract_audio", extract_audio_node)
+        workflow.add_node("clean_audio", clean_audio_node)
+    else:
+        workflow.add_node("prepare_audio", prepare_audio_node)
+    if vad:
+        workflow.add_node("detect_speech", detect_speech_node)
     workflow.add_node("transcribe", transcribe_node)
+    workflow.add_node("transcribe_tracks", transcribe_tracks_node)
     workflow.add_node("refine_transcript", refine_transcript_node)
-    workflow.add_node("summarize", summarize_node)
-    workflow.add_node("extract_events", extract_events_node)
+    if analysis == "fused":
+        workflow.add_node("analyze", analyze_node)
+    else:
+        workflow.add_node("summarize", summarize_node)
+        workflow.add_node("extract_events", extract_events_node)
     workflow.add_node("distribute", distribute_node)
 
     # Define Edges
-    workflow.set_entry_point("extract_audio")
-    workflow.add_edge("extract_audio", "clean_audio")
-    workflow.add_edge("clean_audio", "transcribe")
-    workflow.add_edge("transcribe", "refine_transcript")
-    workflow.add_edge("refine_transcript", "summarize")
-    
-    # Conditional Edge from Summarize -> Extract Events (or Distribute)
+    if audio_frontend == "split":
+        composite_entry = "extract_audio"
+        workflow.add_edge("extract_audio", "clean_audio")
+        audio_ready = "clean_audio"
+    else:
+        composite_entry = "prepare_audio"
+        audio_ready = "prepare_audio"
+
+    workflow.set_conditional_entry_point(
+        has_tracks,
+        {
+            "transcribe_tracks": "transcribe_tracks",
+            "composite": composite_entry
+        }
+    )
     workflow.add_conditional_edges(
-        "summarize",
-        should_extract_events,
+        "transcribe_tracks",
+        after_tracks,
         {
-            "extract_events": "extract_events",
+            "composite": composite_entry,
+            "refine_transcript": "refine_transcript",
             "distribute": "distribute"
         }
     )
-    
-    # After extract_events, always go to distribute
-    workflow.add_edge("extract_events", "distribute")
+
+    if vad:
+        workflow.add_edge(audio_ready, "detect_speech")
+        workflow.add_conditional_edges(
+            "detect_speech",
+            has_speech,
+            {
+                "transcribe": "transcribe",
+                "refine_transcript": "refine_transcript",
+                "distribute": "distribute"
+            }
+        )
+    else:
+        workflow.add_edge(audio_ready, "transcribe")
+    workflow.add_edge("transcribe", "refine_transcript")
+    if analysis == "fused":
+        workflow.add_edge("refine_transcript", "analyze")
+        workflow.add_edge("analyze", "distribute")
+    elif analysis == "parallel":
+        # Both branches return only their own keys, so their updates merge without conflicts.
+        # extract_events applies the event heuristics itself and skips the LLM when they fail.
+        workflow.add_edge("refine_transcript", "summarize")
+        workflow.add_edge("refine_transcript", "extract_events")
+        # distribute waits for both branches
+        workflow.add_edge(["summarize", "extract_events"], "distribute")
+    else:
+        workflow.add_edge("refine_transcript", "summarize")
+
+        # Conditional Edge from Summarize -> Extract Events (or Distribute)
+        workflow.add_conditional_edges(
+            "summarize",
+            should_extract_events,
+            {
+                "extract_events": "extract_events",
+                "distribute": "distribute"
+            }
+        )
+
+        # After extract_events, always go to distribute
+        workflow.add_edge("extract_events", "distribute")
     
     # Distribute is the final node
     workflow.add_edge("distribute", END)
@@ -0,0 +1,46 @@
+from app.core.pipelines.state import PipelineState
+from app.core.pipelines.nodes.summarize import summarize_node
+from app.core.pipelines.nodes.extract_events import extract_events_node
+from app.core.ai.analyzer import MeetingAnalyzer
+from app.core.llm.factory import LLMFactory
+from app.core.progress import progress_hub
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def analyze_node(state: PipelineState) -> PipelineState:
+    """Fused alternative to summarize + extract_events: one structured LLM call per chunk."""
+    logger.info("--- [Node] Analyze ---")
+    if state.get("error"):
+        return state
+
+    text = state.get("transcript_text")
+    if not text:
+        return {**state, "summary": "No text to summarize.", "action_items": [], "events": []}
+
+    meeting_id = state.get("meeting_id")
+    # Unrefined transcripts are chunked along Whisper segment boundaries
+    segments = None if state.get("transcript_refined") else state.get("transcript_segments")
+
+    # Same providers, in the same order, as the summarize node
+    for provider in LLMFactory.pipeline_providers():
+        try:
+            logger.info(f"Attempting meeting analysis with {provider}...")
+            analyzer = MeetingAnalyzer(LLMFactory.get_llm(provider=provider))
+            analysis = await analyzer.analyze(text, segments=segments)
+            logger.info(
+                f"Analysis with {provider} produced {len(analysis['action_items'])} action items "
+                f"and {len(analysis['events'])} events."
+            )
+            if meeting_id:
+                progress_hub.complete(meeting_id, "summary", analysis["summary"])
+            return {**state, **analysis}
+        except Exception as e:
+            logger.warning(f"Meeting analysis with {provider} failed: {e}")
+            continue
+
+    # Structured output can fail where plain prompts still work; don't drop the summary and events
+    logger.error("Fused analysis failed with every provider; falling back to separate summarize + extract_events.")
+    summary, events = await asyncio.gather(summarize_node(state), extract_events_node(state))
+    return {**state, **summary, **events, "action_items": []}
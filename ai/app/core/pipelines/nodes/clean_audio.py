@@ -1,18 +1,31 @@
 from app.core.pipelines.state import PipelineState
 from app.core.audio.cleaner import AudioCleaner
+from app.core.audio import buffer
+from app.core.storage.workspace import scratch_path, release
+import os
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-def clean_audio_node(state: PipelineState) -> PipelineState:
+async def clean_audio_node(state: PipelineState) -> PipelineState:
     logger.info("--- [Node] Clean Audio ---")
     if state.get("error"):
         return state
 
     try:
+        if state.get("audio_buffer") is not None:
+            cleaned = await AudioCleaner.aclean_pcm(state["audio_buffer"].tobytes())
+            base, _ = os.path.splitext(state["input_path"])
+            pcm = buffer.keep_pcm(
+                buffer.from_pcm_bytes(cleaned), scratch_path(state, "audio_clean", f"{base}_clean")
+            )
+            return {**state, "audio_buffer": pcm}
+
         audio_path = state["audio_path"]
-        clean_path = AudioCleaner.clean(audio_path)
+        clean_path = await AudioCleaner.aclean(audio_path, scratch_path(state, "audio_clean.wav", None))
+        # The raw extraction is only consumed by this node
+        release(state, audio_path)
         return {**state, "clean_audio_path": clean_path}
     except Exception as e:
         return {**state, "error": f"Audio Cleaning Failed: {str(e)}"}
@@ -0,0 +1,48 @@
+from app.core.pipelines.state import PipelineState
+from app.core.audio import buffer, vad
+import logging
+
+logger = logging.getLogger(__name__)
+
+def get_pcm(state: PipelineState):
+    """The prepared PCM: the in-memory buffer, or the cleaned WAV read back."""
+    pcm = state.get("audio_buffer")
+    if pcm is None:
+        pcm = buffer.load_pcm(state.get("clean_audio_path") or state["audio_path"])
+    return pcm
+
+def detect_speech_node(state: PipelineState) -> PipelineState:
+    """
+    Voice activity detection between audio preparation and transcription.
+    Records the speech regions so transcription only sees speech; a
+    recording without any speech gets an empty transcript right away.
+    """
+    logger.info("--- [Node] Detect Speech (VAD) ---")
+    if state.get("error"):
+        return state
+
+    try:
+        pcm = get_pcm(state)
+        regions = vad.detect_speech(pcm)
+        total = buffer.duration(pcm)
+        speech = sum(end - start for start, end in regions)
+        logger.info(f"VAD: {len(regions)} speech regions, {speech:.1f}s of {total:.1f}s audio")
+
+        if not regions:
+            # Live-transcribed segments (if any) become the whole transcript
+            prior = state.get("prior_segments") or []
+            if prior:
+                logger.info("No speech in the tail — using the live transcript as is")
+            else:
+                logger.warning("No speech detected — skipping transcription and LLM stages")
+            return {
+                **state,
+                "speech_regions": [],
+                "transcript_segments": prior,
+                "transcript_text": " ".join(seg.get("text", "") for seg in prior),
+            }
+        return {**state, "speech_regions": [list(r) for r in regions]}
+    except Exception as e:
+        # VAD is an optimisation: on failure transcribe the full recording
+        logger.warning(f"VAD failed, transcribing full audio: {e}")
+        return {**state, "speech_regions": None}
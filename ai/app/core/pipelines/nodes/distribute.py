@@ -1,12 +1,13 @@
 import logging
 from app.core.pipelines.state import PipelineState
+from app.core.executors import run_io
 from mcp.processor import MCPProcessor
 from mcp.models import MeetingData, Participant, Integrations, NotionIntegration, GoogleCalendarIntegration, Event
 
 logger = logging.getLogger(__name__)
 
 
-def distribute_node(state: PipelineState) -> dict:
+async def distribute_node(state: PipelineState) -> dict:
     """
     Pipeline node that distributes results to participants' connected services.
     Only processes participants who have AI features enabled (i.e., have integrations).
@@ -78,7 +79,8 @@ def distribute_node(state: PipelineState) -> dict:
     logger.info(f"[Distribute] Distributing to {len(participants)} AI-enabled participants")
 
     processor = MCPProcessor()
-    results = processor.process(meeting_data)
+    # MCP tools make blocking HTTP calls; keep them off the event loop
+    results = await run_io(processor.process, meeting_data)
 
     logger.info(f"[Distribute] Distribution complete: {results}")
 
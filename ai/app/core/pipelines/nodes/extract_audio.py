@@ -1,17 +1,34 @@
 from app.core.pipelines.state import PipelineState
 from app.core.audio.extractor import AudioExtractor
+from app.core.audio import buffer
+from app.core.storage.minio_client import parse_s3_uri, download_recording
+from app.core.executors import run_io
+from app.core.storage.workspace import scratch_path, release
+import os
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-def extract_audio_node(state: PipelineState) -> PipelineState:
+async def extract_audio_node(state: PipelineState) -> PipelineState:
     logger.info("--- [Node] Extract Audio ---")
     try:
         input_path = state["input_path"]
+        # The split front-end needs a seekable local file; streaming ingest
+        # is only available through the fused prepare_audio node.
+        if state.get("input_uri") and not os.path.exists(input_path):
+            bucket, key = parse_s3_uri(state["input_uri"])
+            await run_io(download_recording, bucket=bucket, key=key, local_path=input_path)
+        # Only the tail after the live-transcribed part is extracted
+        start = state.get("audio_start") or 0.0
+        if buffer.uses_buffers():
+            pcm = buffer.from_pcm_bytes(await AudioExtractor.aextract_pcm(input_path, start))
+            release(state, input_path)
+            return {**state, "audio_buffer": pcm}
         # If input is already audio (wav/mp3), extractor might just copy or return it
         # Assuming Extractor handles validation
-        audio_path = AudioExtractor.extract(input_path)
+        audio_path = await AudioExtractor.aextract(input_path, scratch_path(state, "audio.wav", None), start)
+        release(state, input_path)
         return {**state, "audio_path": audio_path}
     except Exception as e:
         return {**state, "error": f"Audio Extraction Failed: {str(e)}"}
@@ -5,10 +5,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-async def extract_events_node(state: PipelineState) -> PipelineState:
+async def extract_events_node(state: PipelineState) -> dict:
+    """Returns only the keys it sets, so it can run next to summarize in the parallel graph."""
     logger.info("--- [Node] Extract Events ---")
     if state.get("error"):
-        return state
+        return {}
 
     try:
         text = state["transcript_text"]
@@ -21,10 +22,10 @@ async def extract_events_node(state: PipelineState) -> PipelineState:
         result = await extractor.extract(text)
         events = result.get("events", [])
         
-        return {**state, "events": events}
+        return {"events": events}
     
     except Exception as e:
         # We don't fail the whole pipeline if event extraction fails, just log/store error?
         # Or maybe we do want to store it in state
         logger.warning(f"Event extraction warning: {e}")
-        return {**state, "events": []}
+        return {"events": []}
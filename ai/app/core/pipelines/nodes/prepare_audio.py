@@ -0,0 +1,67 @@
+from app.core.pipelines.state import PipelineState
+from app.core.audio.frontend import AudioFrontend
+from app.core.audio import buffer
+from app.core.storage.minio_client import parse_s3_uri, open_recording_stream, download_recording
+from app.core.executors import run_io
+from app.core.storage.workspace import scratch_path, release
+import os
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def _prepare_from_uri(input_uri: str, input_path: str, as_pcm: bool, clean_path: str, start: float):
+    """
+    Stream the remote recording into ffmpeg. If the container turns out not
+    to be streamable, fall back to downloading it to `input_path` first.
+    """
+    bucket, key = parse_s3_uri(input_uri)
+    body = await run_io(open_recording_stream, bucket, key)
+    try:
+        if as_pcm:
+            return await AudioFrontend.adecode_stream(body, start)
+        return await AudioFrontend.aprepare_stream(body, clean_path, start)
+    except RuntimeError as e:
+        logger.warning(f"Streaming decode failed, falling back to download: {e}")
+    finally:
+        body.close()
+
+    await run_io(download_recording, bucket=bucket, key=key, local_path=input_path)
+    if as_pcm:
+        return await AudioFrontend.adecode(input_path, start)
+    return await AudioFrontend.aprepare(input_path, clean_path, start)
+
+async def prepare_audio_node(state: PipelineState) -> PipelineState:
+    """
+    Fused replacement for extract_audio + clean_audio: one ffmpeg pass
+    produces the cleaned 16kHz mono audio consumed by transcription, either
+    as an in-memory PCM buffer or as a WAV (AUDIO_BUFFER_MODE=file).
+    """
+    logger.info("--- [Node] Prepare Audio (fused) ---")
+    try:
+        input_path = state["input_path"]
+        input_uri = state.get("input_uri")
+        as_pcm = buffer.uses_buffers()
+        base, _ = os.path.splitext(input_path)
+        clean_path = scratch_path(state, "audio_clean.wav", f"{base}_clean.wav")
+        # Only the tail after the live-transcribed part is decoded
+        start = state.get("audio_start") or 0.0
+
+        if input_uri:
+            prepared = await _prepare_from_uri(input_uri, input_path, as_pcm, clean_path, start)
+        elif as_pcm:
+            prepared = await AudioFrontend.adecode(input_path, start)
+        else:
+            prepared = await AudioFrontend.aprepare(input_path, clean_path, start)
+
+        # The recording is fully decoded; drop the local copy right away
+        release(state, input_path)
+
+        if as_pcm:
+            pcm = buffer.keep_pcm(
+                buffer.from_pcm_bytes(prepared), scratch_path(state, "audio_clean", f"{base}_clean")
+            )
+            return {**state, "audio_buffer": pcm}
+        return {**state, "audio_path": prepared, "clean_audio_path": prepared}
+    except Exception as e:
+        return {**state, "error": f"Audio Preparation Failed: {str(e)}"}
@@ -1,23 +1,34 @@
 from app.core.pipelines.state import PipelineState
 from app.core.ai.summarizer import Summarizer
 from app.core.llm.factory import LLMFactory
+from app.core.progress import progress_hub
+import os
 import asyncio
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-async def summarize_node(state: PipelineState) -> PipelineState:
+# Stream the final summary and publish it as it is generated
+STREAM_SUMMARY = os.getenv("STREAM_SUMMARY", "true").lower() == "true"
+
+async def summarize_node(state: PipelineState) -> dict:
+    """Returns only the keys it sets, so it can run next to extract_events in the parallel graph."""
     logger.info("--- [Node] Summarize ---")
     if state.get("error"):
-        return state
+        return {}
 
     text = state.get("transcript_text")
     if not text:
-        return {**state, "summary": "No text to summarize."}
+        return {"summary": "No text to summarize."}
+
+    meeting_id = state.get("meeting_id")
+    on_partial = None
+    if STREAM_SUMMARY and meeting_id:
+        on_partial = lambda partial: progress_hub.publish_partial(meeting_id, "summary", partial)
 
-    # Try primary LLM (OpenAI/Google), fallback to Ollama
-    providers_to_try = ["ollama"]
+    # Configured providers in order of preference (PIPELINE_LLM_PROVIDERS)
+    providers_to_try = LLMFactory.pipeline_providers()
     
     for provider in providers_to_try:
         try:
@@ -25,13 +36,24 @@ async def summarize_node(state: PipelineState) -> PipelineState:
             llm = LLMFactory.get_llm(provider=provider)
             summarizer = Summarizer(llm)
             
-            summary = await summarizer.summarize(text)
+            if state.get("chunk_summaries"):
+                # Windows were summarized while Whisper was decoding; only merge them
+                summary = await summarizer.reduce(state["chunk_summaries"], on_partial=on_partial)
+            else:
+                # Unrefined transcripts are chunked along Whisper segment boundaries
+                segments = None if state.get("transcript_refined") else state.get("transcript_segments")
+                summary = await summarizer.summarize(text, segments=segments, on_partial=on_partial)
             logger.info(f"Summarization succeeded with {provider}.")
-            return {**state, "summary": summary}
+            if meeting_id:
+                progress_hub.complete(meeting_id, "summary", summary, ttft=summarizer.last_ttft)
+            return {"summary": summary}
         except Exception as e:
             logger.warning(f"Summarization with {provider} failed: {e}")
             continue
     
     # If all providers fail, log error but don't block pipeline
     logger.error("All summarization providers failed.")
-    return {**state, "summary": "Summarization failed - all providers unavailable."}
+    summary = "Summarization failed - all providers unavailable."
+    if meeting_id:
+        progress_hub.complete(meeting_id, "summary", summary, error=True)
+    return {"summary": summary}
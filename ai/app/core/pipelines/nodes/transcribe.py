@@ -1,32 +1,159 @@
 from app.core.pipelines.state import PipelineState
 from app.core.transcription.whisper_service import WhisperService
+from app.core.pipelines.nodes.detect_speech import get_pcm
+from app.core.executors import run_inference, run_io
+from app.core.storage.workspace import release
+from app.core.transcription.live import shift_segments
+from app.core.ai.windowed import WindowedTranscriptProcessor
+from app.core.ai.refiner import TranscriptRefiner
+from app.core.ai.summarizer import Summarizer
+from app.core.llm.factory import LLMFactory
+import os
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Refine and summarize the transcript window by window while Whisper is still decoding:
+# "auto" only for backends that yield segments during decoding (faster-whisper), "true" always
+STREAMING_TRANSCRIPTION = os.getenv("STREAMING_TRANSCRIPTION", "auto").lower()
+STREAM_WINDOW_SECONDS = float(os.getenv("STREAM_WINDOW_SECONDS", "300"))
+
 # Instantiate service globally or pass via config
 # For simplicity, we instantiate here (re-loading model potentially, but WhisperService has lazy load check)
 whisper_service = WhisperService()
 
-def transcribe_node(state: PipelineState) -> PipelineState:
+_END_OF_STREAM = object()
+
+async def run_transcription(func, *args):
+    """
+    Run a blocking transcription call. Remote backends only wait on the
+    network, so concurrent meetings can share the server's batches instead
+    of queueing on the inference pool.
+    """
+    runner = run_io if whisper_service.backend.remote else run_inference
+    return await runner(func, *args)
+
+def _audio(state: PipelineState):
+    # Prefer the in-memory PCM buffer; fall back to the WAV on disk
+    audio = state.get("audio_buffer")
+    if audio is None:
+        audio = state["clean_audio_path"] or state["audio_path"]
+    return audio
+
+def _transcribe(state: PipelineState) -> dict:
+    """Blocking transcription of the prepared audio; runs on the inference pool."""
+    regions = state.get("speech_regions")
+    if regions:
+        # Only hand the VAD speech regions to Whisper
+        return whisper_service.transcribe_regions(get_pcm(state), regions)
+    return whisper_service.transcribe(_audio(state))
+
+def _stream(state: PipelineState):
+    """Blocking segment iterator over the prepared audio."""
+    regions = state.get("speech_regions")
+    if regions:
+        return whisper_service.stream_regions(get_pcm(state), regions)
+    return whisper_service.stream(_audio(state))
+
+async def _stream_segments(state: PipelineState):
+    """Segments decoded on the transcription pool, handed to the event loop one by one."""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+
+    def produce():
+        try:
+            for seg in _stream(state):
+                loop.call_soon_threadsafe(queue.put_nowait, seg)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _END_OF_STREAM)
+
+    producer = asyncio.ensure_future(run_transcription(produce))
+    while True:
+        seg = await queue.get()
+        if seg is _END_OF_STREAM:
+            break
+        yield seg
+    # Surfaces decoding errors
+    await producer
+
+def _streaming_enabled() -> bool:
+    # Backends that only yield at the end would overlap nothing and just add LLM calls
+    if STREAMING_TRANSCRIPTION == "auto":
+        return whisper_service.backend.incremental
+    return STREAMING_TRANSCRIPTION == "true"
+
+def _window_processor():
+    # First available provider of the refine/summarize stages (PIPELINE_LLM_PROVIDERS)
+    for provider in LLMFactory.pipeline_providers():
+        try:
+            llm = LLMFactory.get_llm(provider=provider)
+        except Exception as e:
+            logger.warning(f"{provider} unavailable for streaming LLM stages: {e}")
+            continue
+        return WindowedTranscriptProcessor(TranscriptRefiner(llm), Summarizer(llm), STREAM_WINDOW_SECONDS)
+    logger.warning("Streaming LLM stages unavailable, transcribing in one pass")
+    return None
+
+async def _transcribe_streaming(state: PipelineState, processor: WindowedTranscriptProcessor) -> dict:
+    # Live-transcribed segments are ready now: their windows start right away
+    segments = list(state.get("prior_segments") or [])
+    for seg in segments:
+        processor.add(seg)
+
+    offset = state.get("audio_start") or 0.0
+    try:
+        async for seg in _stream_segments(state):
+            seg = shift_segments([seg], offset)[0]
+            segments.append(seg)
+            processor.add(seg)
+    except Exception:
+        processor.cancel()
+        raise
+
+    refined, summaries = await processor.finish()
+    return {
+        "transcript_segments": segments,
+        "transcript_refined": refined,
+        "chunk_summaries": summaries,
+    }
+
+async def _transcribe_at_once(state: PipelineState) -> dict:
+    result = await run_transcription(_transcribe, state)
+    logger.debug(f"FULL RESULT: {result}")
+    # The decoded audio started at audio_start, after the segments already transcribed live
+    segments = (state.get("prior_segments") or []) + shift_segments(
+        result.get("segments", []), state.get("audio_start") or 0.0
+    )
+    return {"transcript_segments": segments}
+
+async def transcribe_node(state: PipelineState) -> PipelineState:
     logger.info("--- [Node] Transcribe ---")
     if state.get("error"):
         return state
 
     try:
-        audio_path = state["clean_audio_path"] or state["audio_path"]
-        result = whisper_service.transcribe(audio_path)
-        logger.debug(f"FULL RESULT: {result}")
-        logger.info(f"SEGMENTS: {result.get('segments')}")
-        logger.info(f"TEXT LENGTH: {len(result.get('text', ''))}")
+        processor = _window_processor() if _streaming_enabled() else None
+        if processor:
+            update = await _transcribe_streaming(state, processor)
+        else:
+            update = await _transcribe_at_once(state)
+        # Decoded audio is not needed past transcription
+        release(
+            state,
+            state.get("clean_audio_path"),
+            state.get("audio_path"),
+            getattr(state.get("audio_buffer"), "filename", None),
+        )
         
         # Combine segments into full text
-        segments = result.get("segments", [])
+        segments = update["transcript_segments"]
         full_text = " ".join([seg.get("text", "") for seg in segments])
+        logger.info(f"TEXT LENGTH: {len(full_text)}")
         
         return {
             **state, 
-            "transcript_segments": segments, 
+            **update,
             "transcript_text": full_text
         }
     except Exception as e:
@@ -0,0 +1,38 @@
+from app.core.pipelines.state import PipelineState
+from app.core.storage.workspace import Workspace
+from app.core.transcription.tracks import transcribe_tracks, format_transcript
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def transcribe_tracks_node(state: PipelineState) -> PipelineState:
+    """
+    Transcribes the per-participant audio tracks in parallel and merges them
+    into one speaker-attributed transcript. If any track fails, the tracks
+    are dropped and the pipeline falls back to the composite recording.
+    """
+    logger.info("--- [Node] Transcribe Participant Tracks ---")
+    if state.get("error"):
+        return state
+
+    tracks = state["participant_tracks"]
+    workspace = state.get("workspace")
+    own_workspace = workspace is None
+    try:
+        if own_workspace:
+            workspace = await Workspace.create()
+        segments = await transcribe_tracks(tracks, workspace)
+    except Exception as e:
+        logger.warning(f"Participant track transcription failed, using the composite recording: {e}")
+        return {**state, "participant_tracks": None}
+    finally:
+        if own_workspace and workspace:
+            workspace.cleanup()
+
+    speakers = {seg["speaker"] for seg in segments}
+    logger.info(f"Merged {len(segments)} segments from {len(tracks)} tracks ({len(speakers)} speakers)")
+    return {
+        **state,
+        "transcript_segments": segments,
+        "transcript_text": format_transcript(segments),
+    }
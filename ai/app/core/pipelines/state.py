@@ -1,14 +1,39 @@
-from typing import TypedDict, Optional, List, Any
+from typing import TypedDict, Optional, List, Any, Annotated
+
+
+def join_errors(current: Optional[str], update: Optional[str]) -> Optional[str]:
+    """
+    Reducer for `error`: nodes that run in the same step (the parallel
+    graph's summarize and extract_events) can both report one without either
+    being lost. Nodes that pass the state through unchanged repeat the
+    current value, which is kept as is.
+    """
+    if not current:
+        return update
+    if not update or update == current:
+        return current
+    return f"{current}; {update}"
+
 
 class PipelineState(TypedDict):
     input_path: str
+    input_uri: Optional[str]           # s3://bucket/key streamed straight into the decoder
+    workspace: Optional[Any]           # Per-task scratch Workspace (app.core.storage.workspace)
     audio_path: Optional[str]
     clean_audio_path: Optional[str]
+    audio_buffer: Optional[Any]        # float32 16kHz mono PCM (np.ndarray / read-only np.memmap)
+    speech_regions: Optional[List[List[float]]]  # VAD [start, end] seconds; [] = no speech
+    prior_segments: Optional[List[dict]]  # Segments transcribed live, before audio_start
+    audio_start: Optional[float]       # Seconds already covered by prior_segments; only the tail is decoded
+    participant_tracks: Optional[List[dict]]  # Per-participant audio {"speaker", "bucket", "key", "start"}
     transcript_segments: Optional[Any] # Raw whisper segments
     transcript_text: Optional[str]     # Full text
+    transcript_refined: Optional[str]  # Refined text produced window by window during streaming ASR
+    chunk_summaries: Optional[List[str]]  # Per-window summaries produced during streaming ASR
     summary: Optional[str]
     events: Optional[List[dict]]
-    error: Optional[str]
+    action_items: Optional[List[dict]]  # {"task", "owner", "due"}; only set by the fused analyze node
+    error: Annotated[Optional[str], join_errors]
     # AI feature opt-in fields
     meeting_id: Optional[str]
     participants: Optional[List[dict]]           # AI-enabled participants with integrations
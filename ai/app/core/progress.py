@@ -0,0 +1,89 @@
+"""
+In-process hub for live pipeline progress.
+
+Pipeline nodes publish events per meeting (e.g. a summary while it is being
+generated); API clients subscribe to a meeting and receive them as they
+happen. Late subscribers first get the most recent event, so a client that
+connects mid-generation sees the text produced so far. `start` clears a
+meeting's events when it is processed again, so the previous run's final
+event isn't replayed to the new run's subscribers.
+"""
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# Partial updates closer together than this are coalesced
+PROGRESS_MIN_INTERVAL_S = float(os.getenv("PROGRESS_MIN_INTERVAL_MS", "250")) / 1000
+# Meetings whose latest event is kept for late subscribers
+PROGRESS_HISTORY = 256
+_QUEUE_SIZE = 64
+
+
+class ProgressHub:
+    def __init__(self, min_interval_s: float = PROGRESS_MIN_INTERVAL_S):
+        self.min_interval_s = min_interval_s
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._latest: OrderedDict[str, dict] = OrderedDict()
+        self._last_partial: dict[tuple, float] = {}
+
+    def start(self, key: str):
+        """Marks the start of a new run for `key`, forgetting the previous run's events."""
+        self._latest.pop(key, None)
+        for stage_key in [k for k in self._last_partial if k[0] == key]:
+            del self._last_partial[stage_key]
+
+    def publish(self, key: str, event: dict):
+        """Deliver `event` to every subscriber of `key` (slow subscribers lose old events)."""
+        self._latest[key] = event
+        self._latest.move_to_end(key)
+        while len(self._latest) > PROGRESS_HISTORY:
+            self._latest.popitem(last=False)
+        for queue in self._subscribers.get(key, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def publish_partial(self, key: str, stage: str, text: str, **extra):
+        """Throttled publish of an in-progress result; final results use `publish`."""
+        now = time.monotonic()
+        if now - self._last_partial.get((key, stage), 0.0) < self.min_interval_s:
+            return
+        self._last_partial[(key, stage)] = now
+        self.publish(key, {"stage": stage, "text": text, "done": False, **extra})
+
+    def complete(self, key: str, stage: str, text: str, **extra):
+        self._last_partial.pop((key, stage), None)
+        self.publish(key, {"stage": stage, "text": text, "done": True, **extra})
+
+    def latest(self, key: str) -> dict | None:
+        return self._latest.get(key)
+
+    async def subscribe(self, key: str) -> AsyncIterator[dict]:
+        """Events for `key`, starting with the latest one, until a `done` event."""
+        queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        self._subscribers.setdefault(key, set()).add(queue)
+        try:
+            event = self._latest.get(key)
+            if event:
+                yield event
+                if event.get("done"):
+                    return
+            while True:
+                event = await queue.get()
+                yield event
+                if event.get("done"):
+                    return
+        finally:
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[key]
+
+
+progress_hub = ProgressHub()
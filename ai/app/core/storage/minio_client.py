@@ -41,3 +41,26 @@ def download_recording(bucket: str, key: str, local_path: str) -> str:
     logger.info(f"Download complete: {local_path}")
 
     return local_path
+
+
+def parse_s3_uri(uri: str) -> tuple[str, str]:
+    """Split an s3://bucket/key URI into (bucket, key)."""
+    if not uri.startswith("s3://"):
+        raise ValueError(f"Not an S3 URI: {uri}")
+    bucket, _, key = uri[len("s3://"):].partition("/")
+    if not bucket or not key:
+        raise ValueError(f"Invalid S3 URI: {uri}")
+    return bucket, key
+
+
+def open_recording_stream(bucket: str, key: str):
+    """
+    Open a recording in MinIO/S3 as a streaming body.
+    The caller reads it incrementally (e.g. into ffmpeg's stdin) so the
+    object never has to land on local disk. Caller must close() it.
+    """
+    client = get_s3_client()
+
+    logger.info(f"Streaming s3://{bucket}/{key}")
+    response = client.get_object(Bucket=bucket, Key=key)
+    return response["Body"]
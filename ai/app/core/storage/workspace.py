@@ -0,0 +1,182 @@
+"""
+Per-task scratch workspaces for pipeline intermediates.
+
+Every task (an uploaded file or a recording.completed event) gets its own
+directory for the input recording and the intermediate audio. Hot files
+such as WAV/PCM buffers can live on a separate, faster root (e.g. a tmpfs
+like /dev/shm). Intermediates are removed as soon as the node consuming
+them finishes, and the whole workspace is removed when the task ends.
+
+A global disk quota applies backpressure: new workspaces wait until the
+space used by all workspaces drops below WORKSPACE_QUOTA_MB, instead of
+letting the volume fill up. Usage is the size of the files handed out by
+live workspaces (a few stat calls, no directory walk); waiting tasks are
+woken when a file is released or a workspace removed, and re-check every
+WORKSPACE_QUOTA_POLL_SECONDS for files that are still growing.
+"""
+import os
+import time
+import uuid
+import shutil
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+WORKSPACE_DIR = os.getenv("WORKSPACE_DIR", "workspace")
+# Root for hot intermediates (decoded audio); defaults to WORKSPACE_DIR
+HOT_WORKSPACE_DIR = os.getenv("HOT_WORKSPACE_DIR") or WORKSPACE_DIR
+WORKSPACE_QUOTA_MB = float(os.getenv("WORKSPACE_QUOTA_MB", "0"))  # 0 = unlimited
+# Fallback re-check while waiting; releases wake waiters immediately
+QUOTA_POLL_SECONDS = float(os.getenv("WORKSPACE_QUOTA_POLL_SECONDS", "15"))
+OUTPUT_RETENTION_HOURS = float(os.getenv("OUTPUT_RETENTION_HOURS", "72"))
+
+
+_live_workspaces: set = set()
+_live_lock = threading.Lock()
+# Set whenever space may have been freed; created on the loop that waits on it
+_space_freed: asyncio.Event = None
+_space_loop: asyncio.AbstractEventLoop = None
+
+
+def _notify_space_freed():
+    if _space_freed is None:
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is _space_loop:
+        _space_freed.set()
+    elif not _space_loop.is_closed():
+        # Released from a worker thread
+        _space_loop.call_soon_threadsafe(_space_freed.set)
+
+
+def workspace_usage() -> int:
+    """Bytes currently used by the files of all live workspaces."""
+    with _live_lock:
+        workspaces = list(_live_workspaces)
+    return sum(workspace.usage() for workspace in workspaces)
+
+
+async def wait_for_quota(quota_bytes: int = int(WORKSPACE_QUOTA_MB * 1024 * 1024)):
+    """Block (asynchronously) until workspace usage is under the quota."""
+    global _space_freed, _space_loop
+    if quota_bytes <= 0:
+        return
+    loop = asyncio.get_running_loop()
+    if _space_loop is not loop:
+        _space_freed, _space_loop = asyncio.Event(), loop
+    warned = False
+    while True:
+        _space_freed.clear()
+        used = workspace_usage()
+        if used < quota_bytes:
+            return
+        if not warned:
+            logger.warning(
+                f"Workspace quota reached ({used / 1e6:.0f}MB / {quota_bytes / 1e6:.0f}MB) — "
+                f"waiting for running tasks to free space"
+            )
+            warned = True
+        try:
+            await asyncio.wait_for(_space_freed.wait(), QUOTA_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+class Workspace:
+    """Scratch directories owned by a single pipeline task."""
+
+    def __init__(self, task_id: str = None):
+        self.task_id = task_id or str(uuid.uuid4())
+        self.cold_dir = os.path.join(WORKSPACE_DIR, self.task_id)
+        self.hot_dir = os.path.join(HOT_WORKSPACE_DIR, self.task_id)
+        os.makedirs(self.cold_dir, exist_ok=True)
+        os.makedirs(self.hot_dir, exist_ok=True)
+        self._files: set = set()
+        with _live_lock:
+            _live_workspaces.add(self)
+
+    @classmethod
+    async def create(cls, task_id: str = None) -> "Workspace":
+        """Create a workspace once the global disk quota allows it."""
+        await wait_for_quota()
+        return cls(task_id)
+
+    def path(self, name: str, hot: bool = False) -> str:
+        """Path for a file in this workspace; hot files go to the fast root."""
+        path = os.path.join(self.hot_dir if hot else self.cold_dir, name)
+        # Counted against the quota until released
+        self._files.add(path)
+        return path
+
+    def usage(self) -> int:
+        """Bytes used by the files handed out by `path` and not yet released."""
+        total = 0
+        for path in list(self._files):
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def owns(self, path: str) -> bool:
+        path = os.path.abspath(path)
+        return any(
+            os.path.commonpath([path, os.path.abspath(d)]) == os.path.abspath(d)
+            for d in (self.cold_dir, self.hot_dir)
+        )
+
+    def release(self, *paths: str):
+        """Delete intermediates that are no longer needed (only files we own)."""
+        released = False
+        for path in paths:
+            if path and self.owns(path):
+                self._files.discard(path)
+                released = True
+                try:
+                    os.remove(path)
+                    logger.debug(f"Released {path}")
+                except FileNotFoundError:
+                    pass
+        if released:
+            _notify_space_freed()
+
+    def cleanup(self):
+        for d in {self.cold_dir, self.hot_dir}:
+            shutil.rmtree(d, ignore_errors=True)
+        self._files.clear()
+        with _live_lock:
+            _live_workspaces.discard(self)
+        _notify_space_freed()
+        logger.debug(f"Workspace {self.task_id} removed")
+
+
+def scratch_path(state: dict, name: str, default: str, hot: bool = True) -> str:
+    """Workspace path for an intermediate, or `default` when the task has no workspace."""
+    workspace = state.get("workspace")
+    return workspace.path(name, hot=hot) if workspace else default
+
+
+def release(state: dict, *paths: str):
+    """Release consumed intermediates if the task runs in a workspace."""
+    workspace = state.get("workspace")
+    if workspace:
+        workspace.release(*paths)
+
+
+def prune_old_files(directory: str, max_age_hours: float = OUTPUT_RETENTION_HOURS):
+    """Delete files in `directory` older than the retention window (0 = keep forever)."""
+    if max_age_hours <= 0 or not os.path.isdir(directory):
+        return
+    cutoff = time.time() - max_age_hours * 3600
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
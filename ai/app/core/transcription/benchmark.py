@@ -0,0 +1,266 @@
+"""
+Transcription benchmark harness and auto-tuner.
+
+Runs transcription backends over a directory of local reference clips
+(`name.wav` / `.mp3` / ... next to `name.txt` holding the reference text) and
+reports, per configuration:
+
+- load_s:    model load + one warm-up inference
+- rtf:       real-time factor (processing time / audio duration; < 1 is faster than real time)
+- peak_rss:  peak resident memory of the process running the configuration
+- wer:       corpus word error rate against the reference texts
+
+Every configuration runs in a fresh spawned process configured only through
+the same environment variables the service reads, so load time and memory are
+measured cleanly and a recommended configuration can be copied into `.env`
+as is. `--tune` picks the fastest configuration within `--max-wer` on this
+machine's cores and can write it into an env file.
+
+    python -m app.core.transcription.benchmark --clips bench/ \\
+        --backends whisperx,faster-whisper --models base,small \\
+        --compute-types int8,float32 --batch-sizes 8,16 --beam-sizes 1,5 \\
+        --tune --max-wer 0.2 --write .env
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import itertools
+import logging
+import unicodedata
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# TRANSCRIPTION_BACKEND values (see create_backend)
+BACKENDS = ("whisperx", "faster-whisper", "colab", "server")
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".webm", ".mp4"}
+
+# Arabic diacritics (tashkeel) and tatweel are dropped before scoring
+_ARABIC_MARKS = re.compile(r"[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_ALEF_FORMS = str.maketrans({"\u0623": "\u0627", "\u0625": "\u0627", "\u0622": "\u0627", "\u0649": "\u064a", "\u0629": "\u0647"})
+
+
+def normalize_text(text: str) -> list[str]:
+    """Lower-cased words without punctuation, with Arabic spelling variants unified."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _ARABIC_MARKS.sub("", text).translate(_ALEF_FORMS)
+    text = "".join(ch if ch.isalnum() or ch.isspace() else " " for ch in text)
+    return text.split()
+
+
+def word_errors(reference: list[str], hypothesis: list[str]) -> int:
+    """Word-level Levenshtein distance (substitutions + insertions + deletions)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, start=1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def load_clips(directory: str) -> list[tuple[str, str]]:
+    """(audio path, reference text) for every clip that has a .txt reference."""
+    clips = []
+    for name in sorted(os.listdir(directory)):
+        base, ext = os.path.splitext(name)
+        reference = os.path.join(directory, f"{base}.txt")
+        if ext.lower() in AUDIO_EXTENSIONS and os.path.exists(reference):
+            with open(reference, "r", encoding="utf-8") as f:
+                clips.append((os.path.join(directory, name), f.read()))
+    return clips
+
+
+def config_env(config: dict) -> dict:
+    """Environment variables that select `config` in the service."""
+    env = {
+        "TRANSCRIPTION_BACKEND": config["backend"],
+        "WHISPER_COMPUTE_TYPE": config["compute_type"],
+        "WHISPER_BATCH_SIZE": str(config["batch_size"]),
+        "WHISPER_BEAM_SIZE": str(config["beam_size"]),
+        "WHISPER_CPU_THREADS": str(config["cpu_threads"]),
+    }
+    if config.get("model"):
+        model_var = "EGYPTIAN_ARABIC_MODEL" if config["backend"] == "faster-whisper" else "WHISPER_MODEL"
+        env[model_var] = config["model"]
+    return env
+
+
+def _run_config(config: dict, clips: list[tuple[str, str]]) -> dict:
+    """Runs in a fresh process: load the backend, transcribe every clip, score."""
+    import resource
+
+    os.environ.update(config_env(config))
+    from app.core.audio import buffer
+    from app.core.audio.extractor import AudioExtractor
+    from app.core.transcription.whisper_service import create_backend, synthetic_clip
+
+    backend = create_backend()
+    started = time.perf_counter()
+    backend.load_model()
+    backend.transcribe(synthetic_clip(), batch_size=1)
+    load_s = time.perf_counter() - started
+
+    audio_s = processing_s = 0.0
+    errors = reference_words = 0
+    for path, reference in clips:
+        pcm = buffer.from_pcm_bytes(AudioExtractor.extract_pcm(path))
+        started = time.perf_counter()
+        result = backend.transcribe(pcm, batch_size=config["batch_size"])
+        processing_s += time.perf_counter() - started
+        audio_s += buffer.duration(pcm)
+
+        hypothesis = " ".join(seg.get("text", "") for seg in result.get("segments", []))
+        ref_words = normalize_text(reference)
+        errors += word_errors(ref_words, normalize_text(hypothesis))
+        reference_words += len(ref_words)
+
+    return {
+        **config,
+        "load_s": round(load_s, 2),
+        "rtf": round(processing_s / audio_s, 4) if audio_s else None,
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "wer": round(errors / reference_words, 4) if reference_words else None,
+    }
+
+
+def run_benchmark(configs: list[dict], clips: list[tuple[str, str]]) -> list[dict]:
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for config in configs:
+        logger.info(f"Benchmarking {config}")
+        # One process per configuration: memory and load time are not shared
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            try:
+                results.append(pool.submit(_run_config, config, clips).result())
+            except Exception as e:
+                logger.error(f"Configuration {config} failed: {e}")
+                results.append({**config, "error": str(e)})
+    return results
+
+
+def build_configs(args) -> list[dict]:
+    configs = []
+    for backend, model, compute_type, batch_size, beam_size, threads in itertools.product(
+        args.backends, args.models, args.compute_types, args.batch_sizes, args.beam_sizes, args.threads
+    ):
+        # Only WhisperX decodes in batches; don't repeat the others per batch size
+        if backend != "whisperx" and batch_size != args.batch_sizes[0]:
+            continue
+        configs.append({
+            "backend": backend,
+            "model": model or None,
+            "compute_type": compute_type,
+            "batch_size": batch_size,
+            "beam_size": beam_size,
+            "cpu_threads": threads,
+        })
+    return configs
+
+
+def recommend(results: list[dict], max_wer: float) -> dict | None:
+    """Fastest configuration whose WER is within `max_wer`."""
+    eligible = [
+        r for r in results
+        if not r.get("error") and r.get("rtf") is not None
+        and r.get("wer") is not None and r["wer"] <= max_wer
+    ]
+    return min(eligible, key=lambda r: r["rtf"]) if eligible else None
+
+
+def write_env(path: str, values: dict):
+    """Set `values` in an env file, keeping every other line as it is."""
+    lines = []
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    remaining = dict(values)
+    for i, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if key in remaining:
+            lines[i] = f"{key}={remaining.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in remaining.items())
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def print_table(results: list[dict]):
+    columns = ["backend", "model", "compute_type", "batch_size", "beam_size", "cpu_threads",
+               "load_s", "rtf", "peak_rss_mb", "wer"]
+    rows = [["-" if r.get(c) is None else str(r[c]) for c in columns] for r in results]
+    widths = [max([len(c)] + [len(row[i]) for row in rows]) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row, result in zip(rows, results):
+        line = "  ".join(v.ljust(w) for v, w in zip(row, widths))
+        print(f"{line}  {result['error']}" if result.get("error") else line)
+
+
+def _csv(cast=str):
+    return lambda value: [cast(v.strip()) for v in value.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark and tune transcription backends.")
+    parser.add_argument("--clips", required=True, help="Directory of audio clips with .txt references")
+    parser.add_argument("--backends", type=_csv(), default=["whisperx"],
+                        help=f"Comma-separated: {', '.join(BACKENDS)}")
+    parser.add_argument("--models", type=_csv(), default=[""],
+                        help="Model sizes / ids (default: the backend's configured model)")
+    parser.add_argument("--compute-types", type=_csv(), default=["int8"])
+    parser.add_argument("--batch-sizes", type=_csv(int), default=[16])
+    parser.add_argument("--beam-sizes", type=_csv(int), default=[5])
+    parser.add_argument("--threads", type=_csv(int), default=[os.cpu_count() or 1],
+                        help="CPU threads per model (default: all cores)")
+    parser.add_argument("--json", help="Write raw results to this file")
+    parser.add_argument("--tune", action="store_true", help="Recommend the fastest accurate configuration")
+    parser.add_argument("--max-wer", type=float, default=0.25, help="Accuracy threshold for --tune")
+    parser.add_argument("--write", metavar="ENV_FILE", help="With --tune, write the recommendation here")
+    args = parser.parse_args(argv)
+
+    unknown = [b for b in args.backends if b not in BACKENDS]
+    if unknown:
+        parser.error(f"Unknown backend(s): {', '.join(unknown)}")
+
+    clips = load_clips(args.clips)
+    if not clips:
+        parser.error(f"No clips with .txt references found in {args.clips}")
+    configs = build_configs(args)
+    print(f"{len(clips)} clips, {len(configs)} configurations, {os.cpu_count()} cores")
+
+    results = run_benchmark(configs, clips)
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.tune:
+        best = recommend(results, args.max_wer)
+        if best is None:
+            print(f"No configuration reached WER <= {args.max_wer}")
+            return 1
+        env = config_env(best)
+        print(f"\nRecommended (rtf={best['rtf']}, wer={best['wer']}):")
+        for key, value in env.items():
+            print(f"{key}={value}")
+        if args.write:
+            write_env(args.write, env)
+            print(f"Written to {args.write}")
+    return 0
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from app.core.logging_config import setup_logging
+
+    setup_logging()
+    load_dotenv()
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Content-addressed transcript cache.
+
+Transcripts are stored on disk under a hash of the decoded audio plus the
+backend identity (backend, model, language, compute type), so a redelivered
+`recording.completed` message or a re-submitted file returns the stored
+segments instead of re-running Whisper. The store is bounded by total size
+and evicts least-recently-used entries (recency = file mtime, bumped on hit).
+"""
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "true").lower() == "true"
+CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", os.path.join("cache", "transcripts"))
+CACHE_MAX_MB = float(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "512"))
+
+_HASH_BLOCK = 8 * 1024 * 1024
+
+
+def audio_key(audio, identity: str) -> str:
+    """
+    Hash of the audio samples (or file bytes for path input) + backend identity.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(identity.encode("utf-8"))
+    if isinstance(audio, str):
+        with open(audio, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                digest.update(block)
+    else:
+        digest.update(memoryview(np.ascontiguousarray(audio, dtype=np.float32)).cast("B"))
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """Disk-backed JSON store with size-based LRU eviction."""
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = int(CACHE_MAX_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable transcript cache entry {key}: {e}")
+            self._remove(path)
+            return None
+        # Mark as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: dict):
+        # Write to a temp file and rename so readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, default=float)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                logger.debug(f"Evicted transcript cache entry {os.path.basename(path)}")
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
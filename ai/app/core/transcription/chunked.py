@@ -0,0 +1,201 @@
+"""
+Parallel chunked transcription.
+
+Long recordings are split at low-energy (silence) points into chunks that
+are transcribed concurrently in a process pool. Every worker process loads
+its own copy of the configured local backend (WhisperX / Faster-Whisper)
+once and keeps it for the lifetime of the pool. Chunk results are shifted
+back onto the recording timeline and stitched, dropping the duplicates
+produced by the small overlap between neighbouring chunks.
+"""
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.core.audio.frontend import SAMPLE_RATE
+from app.core.audio.vad import frame_energy_db, FRAME_MS
+
+logger = logging.getLogger(__name__)
+
+# Number of worker processes; 0 disables chunked transcription
+WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "0"))
+CHUNK_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_SECONDS", "300"))
+# Boundaries are moved to the quietest frame within this window of the target
+BOUNDARY_SEARCH_S = 15.0
+# Audio shared by neighbouring chunks so no word is cut at a boundary
+OVERLAP_S = 1.0
+
+
+def plan_chunks(pcm: np.ndarray, chunk_seconds: float = CHUNK_SECONDS,
+                search_s: float = BOUNDARY_SEARCH_S) -> list[float]:
+    """
+    Returns chunk boundaries in seconds, [0, b1, ..., duration], with every
+    inner boundary placed on the lowest-energy frame near its target.
+    """
+    duration = len(pcm) / SAMPLE_RATE
+    if duration <= chunk_seconds * 1.5:
+        return [0.0, duration]
+
+    energy = frame_energy_db(pcm)
+    frame_s = FRAME_MS / 1000
+    # Search at most a quarter chunk either side, so every boundary moves forward
+    search_s = min(search_s, chunk_seconds / 4)
+    boundaries = [0.0]
+    target = chunk_seconds
+    while target < duration - chunk_seconds / 2:
+        lo = max(int((target - search_s) / frame_s), 0)
+        hi = min(int((target + search_s) / frame_s), len(energy))
+        quietest = lo + int(np.argmin(energy[lo:hi])) if hi > lo else int(target / frame_s)
+        boundary = quietest * frame_s
+        boundaries.append(boundary)
+        target = boundary + chunk_seconds
+    boundaries.append(duration)
+    return boundaries
+
+
+def stitch(chunk_segments: list[list[dict]], boundaries: list[float]) -> list[dict]:
+    """
+    Merges per-chunk segments (already on the recording timeline). A segment
+    is kept only by the chunk that owns its midpoint, which removes the
+    duplicates transcribed twice inside the overlap.
+    """
+    merged = []
+    for i, segments in enumerate(chunk_segments):
+        own_start, own_end = boundaries[i], boundaries[i + 1]
+        last = i == len(chunk_segments) - 1
+        for seg in segments:
+            mid = (seg["start"] + seg["end"]) / 2
+            if mid < own_start or (mid >= own_end and not last):
+                continue
+            if merged and seg.get("text") == merged[-1].get("text") and seg["start"] < merged[-1]["end"]:
+                continue
+            merged.append(seg)
+    return merged
+
+
+# ----------------------------------------------------------------------------
+# Worker process side
+# ----------------------------------------------------------------------------
+_worker_backend = None
+
+
+def _init_worker(cpu_threads: int):
+    """Runs once per worker: load the configured backend and keep it."""
+    global _worker_backend
+    os.environ["WHISPER_CPU_THREADS"] = str(cpu_threads)
+    from app.core.transcription.whisper_service import WhisperService
+
+    _worker_backend = WhisperService().backend
+    _worker_backend.load_model()
+
+
+def _transcribe_chunk(source, start: float, end: float, batch_size: int) -> list[dict]:
+    """
+    Transcribes [start, end) of the source and returns segments on the
+    recording timeline. `source` is either a PCM slice, or the filename of a
+    shared .npy buffer that is memory-mapped here instead of being pickled.
+    """
+    if isinstance(source, str):
+        pcm = np.load(source, mmap_mode="r")[int(start * SAMPLE_RATE): int(end * SAMPLE_RATE)]
+        pcm = np.ascontiguousarray(pcm, dtype=np.float32)
+    else:
+        pcm = source
+
+    result = _worker_backend.transcribe(pcm, batch_size=batch_size)
+    return [
+        {**seg, "start": seg["start"] + start, "end": seg["end"] + start}
+        for seg in result.get("segments", [])
+    ]
+
+
+# ----------------------------------------------------------------------------
+# Parent process side
+# ----------------------------------------------------------------------------
+def _shared_filename(pcm: np.ndarray):
+    """The .npy file backing `pcm` if workers can map it by name, else None."""
+    filename = getattr(pcm, "filename", None)
+    if filename is None or not str(filename).endswith(".npy"):
+        return None
+    # Only the whole buffer maps 1:1 onto the file (slices keep the filename)
+    if np.load(filename, mmap_mode="r").shape != pcm.shape:
+        return None
+    return str(filename)
+
+
+class ChunkedTranscriber:
+    """Owns the worker pool; models stay loaded between recordings."""
+
+    def __init__(self, workers: int = WORKERS, chunk_seconds: float = CHUNK_SECONDS):
+        self.workers = workers
+        self.chunk_seconds = chunk_seconds
+        self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            cpu_threads = max(1, (os.cpu_count() or self.workers) // self.workers)
+            logger.info(f"Starting transcription pool: {self.workers} workers x {cpu_threads} threads")
+            # spawn: forking a process that already holds torch/CTranslate2 state is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(cpu_threads,),
+            )
+        return self._pool
+
+    def should_chunk(self, pcm: np.ndarray) -> bool:
+        return self.workers > 0 and len(pcm) / SAMPLE_RATE > self.chunk_seconds * 1.5
+
+    def transcribe(self, pcm: np.ndarray, batch_size: int = 16) -> dict:
+        boundaries = plan_chunks(pcm, self.chunk_seconds)
+        duration = boundaries[-1]
+        shared_file = _shared_filename(pcm)
+
+        pool = self._get_pool()
+        futures = []
+        for start, end in zip(boundaries[:-1], boundaries[1:]):
+            start = max(0.0, start - OVERLAP_S)
+            end = min(duration, end + OVERLAP_S)
+            source = shared_file or pcm[int(start * SAMPLE_RATE): int(end * SAMPLE_RATE)]
+            futures.append(pool.submit(_transcribe_chunk, source, start, end, batch_size))
+
+        logger.info(f"🔥 Chunked transcription: {len(futures)} chunks over {self.workers} workers")
+        chunk_segments = [f.result() for f in futures]
+        segments = stitch(chunk_segments, boundaries)
+        logger.info("✅ Chunked Transcription Completed.")
+        return {
+            "segments": segments,
+            "text": " ".join(seg.get("text", "").strip() for seg in segments),
+        }
+
+    def transcribe_whole(self, pcm: np.ndarray, batch_size: int = 16) -> dict:
+        """
+        Transcribes `pcm` as one chunk on a single worker, so several short
+        recordings (e.g. participant tracks) can run side by side.
+        """
+        duration = len(pcm) / SAMPLE_RATE
+        segments = self._get_pool().submit(_transcribe_chunk, pcm, 0.0, duration, batch_size).result()
+        return {
+            "segments": segments,
+            "text": " ".join(seg.get("text", "").strip() for seg in segments),
+        }
+
+    def warmup(self):
+        """Start every worker and run a short clip through each loaded model."""
+        from app.core.transcription.whisper_service import synthetic_clip
+
+        pool = self._get_pool()
+        clip = synthetic_clip()
+        duration = len(clip) / SAMPLE_RATE
+        # Submitted together, the tasks spawn every worker (each loading its model)
+        futures = [pool.submit(_transcribe_chunk, clip, 0.0, duration, 1) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
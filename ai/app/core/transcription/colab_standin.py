@@ -0,0 +1,52 @@
+"""
+Local stand-in for the Colab transcription endpoint.
+
+Lets ColabWhisperBackend be developed and checked without a GPU notebook:
+
+    uvicorn app.core.transcription.colab_standin:app --port 8010
+    COLAB_TRANSCRIBE_URL=http://localhost:8010/transcribe
+
+Uploaded chunks (FLAC / Opus / WAV) are decoded with ffmpeg, and one
+segment is returned per VAD speech region with its real timestamps, in the
+same reply format as the notebook. STANDIN_FAILURE_RATE makes that
+fraction of requests fail with 503 to exercise the client's retries.
+"""
+import os
+import random
+import logging
+
+import ffmpeg
+from fastapi import FastAPI, File, HTTPException, UploadFile
+
+from app.core.audio import buffer, vad
+from app.core.audio.ffmpeg_async import run_ffmpeg
+from app.core.audio.frontend import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+FAILURE_RATE = float(os.getenv("STANDIN_FAILURE_RATE", "0"))
+
+app = FastAPI(title="Colab Transcription Stand-in")
+
+
+@app.post("/transcribe")
+async def transcribe(file: UploadFile = File(...)):
+    if random.random() < FAILURE_RATE:
+        raise HTTPException(status_code=503, detail="Simulated stand-in failure")
+
+    data = await file.read()
+    spec = ffmpeg.input('pipe:0').output('pipe:1', format='f32le', acodec='pcm_f32le', ac=1, ar=SAMPLE_RATE)
+    try:
+        pcm = buffer.from_pcm_bytes(await run_ffmpeg(spec, input_bytes=data))
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    segments = [
+        {"start": round(start, 2), "end": round(end, 2), "text": f"[speech {start:.1f}-{end:.1f}]"}
+        for start, end in vad.detect_speech(pcm)
+    ]
+    logger.info(
+        f"Stand-in transcribed {file.filename} ({file.content_type}, {len(data)} bytes, "
+        f"{buffer.duration(pcm):.1f}s) into {len(segments)} segments"
+    )
+    return {"text": " ".join(seg["text"] for seg in segments), "segments": segments}
@@ -0,0 +1,113 @@
+"""
+Live (incremental) transcription of meetings that are still running.
+
+While a meeting is recorded, the backend can publish short audio chunks
+(`recording.chunk` events). Each chunk is decoded, trimmed with VAD and
+transcribed as soon as it arrives, and its segments are appended to a
+per-meeting JSONL segment log on the recording timeline. When
+`recording.completed` arrives, the pipeline starts from the contiguous part
+of the log and only decodes and transcribes the remaining tail, so the LLM
+stages can start almost immediately after the call ends.
+"""
+import os
+import re
+import json
+import logging
+
+from app.core.audio import buffer, vad
+from app.core.audio.frontend import AudioFrontend
+from app.core.executors import run_io
+from app.core.storage.minio_client import download_recording
+from app.core.storage.workspace import Workspace
+
+logger = logging.getLogger(__name__)
+
+LIVE_SEGMENT_DIR = os.getenv("LIVE_SEGMENT_DIR", "live_segments")
+# Chunks closer than this are treated as contiguous
+CONTIGUITY_TOLERANCE_S = 0.5
+
+
+class SegmentLog:
+    """Append-only JSONL log of the chunks transcribed for one meeting."""
+
+    def __init__(self, meeting_id: str, directory: str = LIVE_SEGMENT_DIR):
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", meeting_id)
+        self.path = os.path.join(directory, f"{safe_id}.jsonl")
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, seq: int, start: float, end: float, segments: list):
+        entry = {"seq": seq, "start": start, "end": end, "segments": segments}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=float) + "\n")
+
+    def entries(self) -> list[dict]:
+        """Logged chunks ordered by start time; redelivered chunks appear once."""
+        if not os.path.exists(self.path):
+            return []
+        by_seq = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-write
+                    continue
+                by_seq[entry["seq"]] = entry
+        return sorted(by_seq.values(), key=lambda e: e["start"])
+
+    def coverage(self) -> tuple[list, float]:
+        """
+        Segments of the contiguous run of chunks starting at 0, and the time
+        it reaches. Chunks after a gap (lost or still in flight) are ignored
+        and get transcribed again as part of the tail.
+        """
+        segments, covered = [], 0.0
+        for entry in self.entries():
+            if entry["start"] > covered + CONTIGUITY_TOLERANCE_S:
+                break
+            segments.extend(entry["segments"])
+            covered = max(covered, entry["end"])
+        return segments, covered
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def shift_segments(segments: list, offset: float) -> list:
+    """Move segment (and word) timestamps `offset` seconds later."""
+    if not offset:
+        return segments
+    return vad.restore_timestamps(segments, [(0.0, offset)])
+
+
+async def transcribe_chunk(meeting_id: str, seq: int, start: float, bucket: str, key: str) -> int:
+    """
+    Transcribe one live audio chunk and append it to the meeting's segment
+    log. `start` is the chunk's offset on the recording timeline.
+    Returns the number of segments logged.
+    """
+    from app.core.pipelines.nodes.transcribe import whisper_service, run_transcription
+
+    workspace = await Workspace.create()
+    try:
+        local_path = workspace.path(os.path.basename(key) or "chunk")
+        await run_io(download_recording, bucket=bucket, key=key, local_path=local_path)
+        pcm = buffer.from_pcm_bytes(await AudioFrontend.adecode(local_path))
+    finally:
+        workspace.cleanup()
+
+    regions = vad.detect_speech(pcm)
+    segments = []
+    if regions:
+        result = await run_transcription(whisper_service.transcribe_regions, pcm, regions)
+        segments = shift_segments(result.get("segments", []), start)
+
+    SegmentLog(meeting_id).append(seq, start, start + buffer.duration(pcm), segments)
+    logger.info(
+        f"Live chunk {seq} of meeting {meeting_id}: {len(segments)} segments "
+        f"({start:.1f}s - {start + buffer.duration(pcm):.1f}s)"
+    )
+    return len(segments)
@@ -0,0 +1,290 @@
+"""
+Standalone transcription server with cross-meeting dynamic batching.
+
+One long-lived process per host holds the model; pipelines talk to it
+through `ServerTranscriptionBackend` (TRANSCRIPTION_BACKEND=server) over an
+authenticated local socket. Every request is cut into <=30s speech windows,
+and a single batcher thread packs windows from all pending requests —
+round-robin, so a long meeting can't starve a short one — into one batched
+WhisperX inference call. Meetings that finish at the same time therefore
+share batches instead of each running its own small-batch inference, and
+the model is loaded once per host instead of once per worker.
+
+Run with:
+    python -m app.core.transcription.server
+"""
+import os
+import time
+import logging
+import importlib.metadata
+import threading
+from collections import deque
+from multiprocessing.connection import Listener, AuthenticationError
+
+import numpy as np
+
+from app.core.audio.frontend import SAMPLE_RATE
+from app.core.audio import vad
+
+logger = logging.getLogger(__name__)
+
+SERVER_HOST = os.getenv("TRANSCRIPTION_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("TRANSCRIPTION_SERVER_PORT", "8765"))
+# Backend loaded by the server process itself
+SERVER_BACKEND = os.getenv("TRANSCRIPTION_SERVER_BACKEND", "WhisperXBackend")
+MAX_BATCH = int(os.getenv("TRANSCRIPTION_SERVER_BATCH_SIZE", "16"))
+# How long a partially filled batch waits for windows from other requests
+MAX_WAIT_S = float(os.getenv("TRANSCRIPTION_SERVER_MAX_WAIT_MS", "50")) / 1000
+
+# Whisper's receptive field
+WINDOW_S = 30.0
+
+# WhisperX releases whose FasterWhisperPipeline accepts a list of
+# {"inputs": window} like a Hugging Face pipeline. That call is not part of
+# WhisperX's public API, so other versions use the public `transcribe`.
+BATCHED_WHISPERX_VERSIONS = ("3.7.",)
+
+
+def server_authkey() -> bytes:
+    """Shared secret of server and clients; there is deliberately no default."""
+    key = os.getenv("TRANSCRIPTION_SERVER_AUTHKEY")
+    if not key:
+        raise RuntimeError("TRANSCRIPTION_SERVER_AUTHKEY is not set")
+    return key.encode("utf-8")
+
+
+def supports_cross_request_batching(backend) -> bool:
+    """Whether `backend`'s model can be called with a batch of windows (see BATCHED_WHISPERX_VERSIONS)."""
+    from app.core.transcription.whisper_service import WhisperXBackend
+
+    if not isinstance(backend, WhisperXBackend):
+        return False
+    try:
+        version = importlib.metadata.version("whisperx")
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    if not version.startswith(BATCHED_WHISPERX_VERSIONS):
+        logger.warning(
+            f"WhisperX {version} is not known to support cross-request batching; "
+            f"transcribing one window at a time"
+        )
+        return False
+    return True
+
+
+def plan_windows(pcm: np.ndarray, window_s: float = WINDOW_S) -> list[tuple[float, float]]:
+    """
+    Packs detected speech regions into windows of at most `window_s` seconds;
+    regions longer than a window are split.
+    """
+    windows = []
+    for start, end in vad.detect_speech(pcm):
+        while end - start > window_s:
+            windows.append((start, start + window_s))
+            start += window_s
+        if windows and end - windows[-1][0] <= window_s:
+            windows[-1] = (windows[-1][0], end)
+        else:
+            windows.append((start, end))
+    return windows
+
+
+class _Job:
+    """One transcription request and the windows still waiting for inference."""
+
+    def __init__(self, pcm: np.ndarray, windows: list[tuple[float, float]]):
+        self.pcm = pcm
+        self.windows = windows
+        self.next = 0
+        self.segments = [[] for _ in windows]
+        self.remaining = len(windows)
+        self.error = None
+        self.done = threading.Event()
+        if not windows:
+            self.done.set()
+
+    def window_audio(self, index: int) -> np.ndarray:
+        start, end = self.windows[index]
+        return self.pcm[int(start * SAMPLE_RATE): int(end * SAMPLE_RATE)]
+
+
+class TranscriptionServer:
+    """Owns the model and the batcher thread; `handle` serves one connection."""
+
+    def __init__(self, max_batch: int = MAX_BATCH, max_wait_s: float = MAX_WAIT_S):
+        from app.core.transcription.whisper_service import create_backend
+
+        self.backend = create_backend(SERVER_BACKEND)
+        # Known WhisperX versions batch windows of all requests; anything else runs one window at a time
+        self.batched = supports_cross_request_batching(self.backend)
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_s
+        self._jobs = deque()
+        self._cond = threading.Condition()
+
+    def start(self):
+        self.backend.warmup()
+        threading.Thread(target=self._batch_loop, name="batcher", daemon=True).start()
+        logger.info(f"Transcription server ready (batched={self.batched}, max_batch={self.max_batch})")
+
+    # ------------------------------------------------------------------
+    # Request side
+    # ------------------------------------------------------------------
+    def transcribe(self, pcm: np.ndarray) -> dict:
+        pcm = np.ascontiguousarray(pcm, dtype=np.float32)
+        if self.batched:
+            windows = plan_windows(pcm)
+        else:
+            windows = [(0.0, len(pcm) / SAMPLE_RATE)] if len(pcm) else []
+
+        job = _Job(pcm, windows)
+        if windows:
+            with self._cond:
+                self._jobs.append(job)
+                self._cond.notify()
+        job.done.wait()
+        if job.error:
+            raise RuntimeError(job.error)
+
+        segments = [seg for window in job.segments for seg in window if seg.get("text")]
+        return {
+            "segments": segments,
+            "text": " ".join(seg["text"] for seg in segments),
+            "language": getattr(self.backend, "language", None),
+        }
+
+    def handle(self, conn):
+        with conn:
+            try:
+                op, payload = conn.recv()
+                if op == "ping":
+                    conn.send(("ok", {"ready": True}))
+                elif op == "transcribe":
+                    conn.send(("ok", self.transcribe(payload["audio"])))
+                else:
+                    conn.send(("error", f"Unknown operation: {op}"))
+            except EOFError:
+                pass
+            except Exception as e:
+                logger.error(f"Transcription request failed: {e}", exc_info=True)
+                try:
+                    conn.send(("error", str(e)))
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------
+    # Batcher side
+    # ------------------------------------------------------------------
+    def _queued(self) -> int:
+        return sum(len(job.windows) - job.next for job in self._jobs)
+
+    def _next_batch(self) -> list[tuple[_Job, int]]:
+        with self._cond:
+            while not self._jobs:
+                self._cond.wait()
+            # Give concurrent requests a moment to fill the batch
+            deadline = time.monotonic() + self.max_wait_s
+            while self._queued() < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = []
+            while self._jobs and len(batch) < self.max_batch:
+                job = self._jobs.popleft()
+                batch.append((job, job.next))
+                job.next += 1
+                if job.next < len(job.windows):
+                    self._jobs.append(job)
+            return batch
+
+    def _infer(self, windows: list[np.ndarray]) -> list[list[dict]]:
+        """Segments for each window, with timestamps relative to the window."""
+        if self.batched:
+            try:
+                return self._infer_batched(windows)
+            except (KeyError, TypeError, ValueError) as e:
+                # The pipeline's call signature or output changed under us
+                logger.error(f"Batched WhisperX call failed ({e}); falling back to one window at a time")
+                self.batched = False
+        return [
+            self.backend.transcribe(w, batch_size=self.max_batch).get("segments", [])
+            for w in windows
+        ]
+
+    def _infer_batched(self, windows: list[np.ndarray]) -> list[list[dict]]:
+        """
+        One inference over windows of several requests. Uses the Hugging Face
+        pipeline call of WhisperX's FasterWhisperPipeline (only enabled for
+        BATCHED_WHISPERX_VERSIONS); each window is <=30s, so it yields one text.
+        """
+        outputs = list(self.backend.model(
+            [{"inputs": w} for w in windows], batch_size=len(windows), num_workers=0
+        ))
+        if len(outputs) != len(windows):
+            raise ValueError(f"expected {len(windows)} outputs, got {len(outputs)}")
+        results = []
+        for w, out in zip(windows, outputs):
+            text = out["text"]
+            if isinstance(text, list):
+                text = text[0]
+            results.append([{"start": 0.0, "end": len(w) / SAMPLE_RATE, "text": text.strip()}])
+        return results
+
+    def _batch_loop(self):
+        while True:
+            batch = self._next_batch()
+            jobs = {id(job): job for job, _ in batch}
+            started = time.perf_counter()
+            try:
+                results = self._infer([job.window_audio(i) for job, i in batch])
+            except Exception as e:
+                logger.error(f"Batched inference failed: {e}", exc_info=True)
+                with self._cond:
+                    for job in jobs.values():
+                        if job in self._jobs:
+                            self._jobs.remove(job)
+                for job in jobs.values():
+                    job.error = f"Transcription server inference failed: {e}"
+                    job.done.set()
+                continue
+
+            logger.debug(
+                f"Batch of {len(batch)} windows from {len(jobs)} requests "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+            for (job, i), segments in zip(batch, results):
+                offset = job.windows[i][0]
+                job.segments[i] = [
+                    {**seg, "start": seg["start"] + offset, "end": seg["end"] + offset}
+                    for seg in segments
+                ]
+                job.remaining -= 1
+                if job.remaining == 0:
+                    job.done.set()
+
+
+def serve(host: str = SERVER_HOST, port: int = SERVER_PORT):
+    # Fail before loading the model if there is no shared secret
+    authkey = server_authkey()
+    server = TranscriptionServer()
+    server.start()
+    with Listener((host, port), authkey=authkey) as listener:
+        logger.info(f"Transcription server listening on {host}:{port}")
+        while True:
+            try:
+                conn = listener.accept()
+            except AuthenticationError:
+                logger.warning("Rejected transcription client with a wrong authkey")
+                continue
+            threading.Thread(target=server.handle, args=(conn,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from app.core.logging_config import setup_logging
+
+    setup_logging()
+    load_dotenv()
+    serve()
@@ -0,0 +1,122 @@
+"""
+Speaker-attributed transcription from per-participant audio tracks.
+
+When the recording.completed event carries one audio track per participant
+next to the composite recording, every track is decoded, trimmed to its
+speech regions with VAD and transcribed on its own. Tracks are mostly
+silence, so each one costs little, and they are processed concurrently.
+Download, decoding and VAD always overlap; how many tracks run inference at
+once depends on the backend. With the chunked pool (TRANSCRIBE_WORKERS > 0)
+every track gets its own worker, and remote backends (server, Colab) serve
+concurrent requests. Otherwise the tracks share the inference pool
+(INFERENCE_EXECUTOR_WORKERS, 1 by default) and are transcribed one at a time.
+The segments are tagged with the participant as `speaker` and merged onto
+the recording timeline, so overlapping speech stays separated and the
+transcript gets speaker attribution without a diarization model.
+"""
+import os
+import asyncio
+import logging
+
+from app.core.audio import buffer, vad
+from app.core.audio.frontend import AudioFrontend
+from app.core.executors import run_io
+from app.core.storage.minio_client import download_recording
+from app.core.transcription.live import shift_segments
+
+logger = logging.getLogger(__name__)
+
+# Tracks decoded and transcribed at the same time (bounds decoded PCM in memory);
+# inference itself is also bounded by the backend's pool, see above
+TRACK_CONCURRENCY = int(os.getenv("PARTICIPANT_TRACK_CONCURRENCY", "4"))
+
+
+def parse_tracks(raw_tracks: list) -> list[dict]:
+    """
+    Normalizes the event's `audioTracks` entries
+    ({"userId", "name", "audioBucket", "audioKey", "startSeconds"}) into
+    {"speaker", "bucket", "key", "start"}. `startSeconds` is where the track
+    begins on the composite recording's timeline.
+    """
+    tracks = []
+    for i, track in enumerate(raw_tracks or []):
+        tracks.append({
+            "speaker": track.get("name") or track.get("userId") or f"Speaker {i + 1}",
+            "bucket": track.get("audioBucket", "recordings"),
+            "key": track["audioKey"],
+            "start": float(track.get("startSeconds", 0.0)),
+        })
+    return tracks
+
+
+def merge_segments(per_track: list[list[dict]]) -> list[dict]:
+    """One timeline of all speakers' segments, ordered by start time."""
+    segments = [seg for track_segments in per_track for seg in track_segments]
+    return sorted(segments, key=lambda seg: (seg.get("start", 0.0), seg.get("end", 0.0)))
+
+
+def format_transcript(segments: list[dict]) -> str:
+    """Transcript text with one `Speaker: text` line per change of speaker."""
+    lines = []
+    for seg in segments:
+        text = seg.get("text", "").strip()
+        if not text:
+            continue
+        speaker = seg.get("speaker")
+        if lines and lines[-1][0] == speaker:
+            lines[-1][1].append(text)
+        else:
+            lines.append((speaker, [text]))
+    return "\n".join(
+        f"{speaker}: {' '.join(texts)}" if speaker else " ".join(texts)
+        for speaker, texts in lines
+    )
+
+
+async def transcribe_track(index: int, track: dict, workspace) -> list[dict]:
+    """
+    Speaker-tagged segments of one participant track on the recording
+    timeline. `index` keeps the track's file apart from the others in the
+    shared workspace, since their keys may share a basename.
+    """
+    from app.core.pipelines.nodes.transcribe import whisper_service, run_transcription
+
+    local_path = workspace.path(f"track_{index}_{os.path.basename(track['key']) or 'audio'}")
+    await run_io(download_recording, bucket=track["bucket"], key=track["key"], local_path=local_path)
+    try:
+        pcm = buffer.from_pcm_bytes(await AudioFrontend.adecode(local_path))
+    finally:
+        workspace.release(local_path)
+
+    regions = vad.detect_speech(pcm)
+    speech = sum(end - start for start, end in regions)
+    logger.info(
+        f"Track of {track['speaker']}: {len(regions)} speech regions, "
+        f"{speech:.1f}s of {buffer.duration(pcm):.1f}s audio"
+    )
+    if not regions:
+        return []
+
+    if whisper_service.chunked:
+        # A worker of the chunked pool transcribes the track; this thread only waits for it
+        result = await run_io(whisper_service.transcribe_regions, pcm, regions, pooled=True)
+    else:
+        result = await run_transcription(whisper_service.transcribe_regions, pcm, regions)
+    segments = shift_segments(result.get("segments", []), track["start"])
+    return [{**seg, "speaker": track["speaker"]} for seg in segments]
+
+
+async def transcribe_tracks(tracks: list[dict], workspace, concurrency: int = TRACK_CONCURRENCY) -> list[dict]:
+    """
+    Transcribes all tracks concurrently and merges them into one
+    speaker-attributed timeline. Raises if any track fails, so callers can
+    fall back to the composite recording instead of silently dropping a speaker.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(index, track):
+        async with semaphore:
+            return await transcribe_track(index, track, workspace)
+
+    per_track = await asyncio.gather(*(bounded(i, track) for i, track in enumerate(tracks)))
+    return merge_segments(per_track)
@@ -1,8 +1,19 @@
 import os
+import time
 import logging
+import threading
 import torch
 import warnings
+import numpy as np
 from abc import ABC, abstractmethod
+from typing import Union, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.transcription.chunked import ChunkedTranscriber, plan_chunks, WORKERS as CHUNK_WORKERS
+from app.core.transcription.cache import TranscriptCache, audio_key, CACHE_ENABLED
+from app.core.transcription.server import SERVER_HOST, SERVER_PORT, server_authkey
+from app.core.audio.encoder import AudioEncoder
+from app.core.audio.frontend import SAMPLE_RATE
 
 logger = logging.getLogger(__name__)
 
@@ -55,18 +66,89 @@ except Exception as e:
     logger.warning(f"⚠️ Safe globals registration failed: {e}")
 
 
+# Inference threads per model instance (0 = library default). Chunked
+# transcription lowers this per worker so the pool doesn't oversubscribe cores.
+CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+
+# Models are downloaded once into this directory and loaded from it afterwards,
+# so restarts (and every chunked worker) read weights from local disk
+MODEL_DIR = os.getenv("WHISPER_MODEL_DIR", os.path.join("models", "whisper"))
+
+WARMUP_SECONDS = 1.0
+
+# Decoding settings (see `python -m app.core.transcription.benchmark --tune`)
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "16"))
+BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", "5"))
+
+# Colab client: audio is uploaded as compressed, silence-aligned chunks in parallel
+COLAB_CHUNK_SECONDS = float(os.getenv("COLAB_CHUNK_SECONDS", "120"))
+COLAB_AUDIO_FORMAT = os.getenv("COLAB_AUDIO_FORMAT", "flac").lower()  # flac | opus | wav
+COLAB_PARALLEL_UPLOADS = int(os.getenv("COLAB_PARALLEL_UPLOADS", "4"))
+COLAB_MAX_RETRIES = int(os.getenv("COLAB_MAX_RETRIES", "3"))
+# Wait before re-uploading failed chunks: doubles per attempt, capped
+COLAB_RETRY_BACKOFF_SECONDS = float(os.getenv("COLAB_RETRY_BACKOFF_SECONDS", "1"))
+COLAB_RETRY_MAX_DELAY_SECONDS = float(os.getenv("COLAB_RETRY_MAX_DELAY_SECONDS", "10"))
+COLAB_TIMEOUT_SECONDS = float(os.getenv("COLAB_TIMEOUT_SECONDS", "120"))
+
+# Audio input accepted by every backend: a path to an audio file, or a
+# float32 16kHz mono PCM buffer (np.ndarray / np.memmap) from the pipeline.
+AudioInput = Union[str, np.ndarray]
+
+
+def _check_audio(audio: AudioInput):
+    if isinstance(audio, str) and not os.path.exists(audio):
+        raise FileNotFoundError(f"Audio file not found: {audio}")
+
+
+def synthetic_clip(seconds: float = WARMUP_SECONDS) -> np.ndarray:
+    """
+    Short 16kHz clip used to warm up inference: voice-band harmonics with an
+    amplitude envelope and a little noise, so VAD passes it on to the model
+    instead of discarding it as silence.
+    """
+    rate = 16000
+    t = np.arange(int(seconds * rate), dtype=np.float32) / rate
+    voice = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((140, 280, 420, 700, 1100)))
+    envelope = 0.5 * (1 - np.cos(2 * np.pi * 4 * t))
+    noise = np.random.default_rng(0).normal(0, 0.01, len(t))
+    return (0.2 * voice * envelope + noise).astype(np.float32)
+
+
 # ============================================================================
 # ABSTRACT BASE
 # ============================================================================
 class TranscriptionBackend(ABC):
     """Abstract base for transcription backends."""
+
+    # Remote backends do no local inference (no worker pool, I/O-bound calls)
+    remote = False
+    # Whether stream() yields segments while decoding rather than all at the end
+    incremental = False
     
     @abstractmethod
     def load_model(self):
         pass
     
     @abstractmethod
-    def transcribe(self, audio_path: str, batch_size: int = 16) -> dict:
+    def transcribe(self, audio: AudioInput, batch_size: int = 16) -> dict:
+        pass
+
+    def stream(self, audio: AudioInput, batch_size: int = 16) -> Iterator[dict]:
+        """
+        Yield segments as they are decoded. Backends without incremental
+        decoding yield everything once the whole transcription is done.
+        """
+        yield from self.transcribe(audio, batch_size=batch_size).get("segments", [])
+
+    def warmup(self):
+        """Load the model and run one short inference so later calls start hot."""
+        self.load_model()
+        self.transcribe(synthetic_clip(), batch_size=1)
+
+    def close(self):
+        """Release clients and threads held by the backend."""
         pass
 
 
@@ -76,31 +158,37 @@ class TranscriptionBackend(ABC):
 class WhisperXBackend(TranscriptionBackend):
     """WhisperX-based transcription (original implementation)."""
     
-    def __init__(self, device: str = None, compute_type: str = "int8", model_size: str = "base", language: str = "en"):
+    def __init__(self, device: str = None, compute_type: str = COMPUTE_TYPE, model_size: str = WHISPER_MODEL, language: str = "en", cpu_threads: int = None, beam_size: int = BEAM_SIZE):
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self.compute_type = compute_type
         self.model_size = model_size
         self.language = language
+        self.cpu_threads = cpu_threads if cpu_threads is not None else CPU_THREADS
+        self.beam_size = beam_size
         self.model = None
 
     def load_model(self):
         if not self.model:
             import whisperx
             logger.info(f"Loading WhisperX model '{self.model_size}' (Language: {self.language}) on {self.device}...")
+            extra = {"threads": self.cpu_threads} if self.cpu_threads else {}
             self.model = whisperx.load_model(
                 self.model_size, 
                 self.device, 
                 compute_type=self.compute_type,
-                language=self.language
+                language=self.language,
+                asr_options={"beam_size": self.beam_size},
+                download_root=MODEL_DIR,
+                **extra
             )
 
-    def transcribe(self, audio_path: str, batch_size: int = 16) -> dict:
+    def transcribe(self, audio: AudioInput, batch_size: int = 16) -> dict:
         import whisperx
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        _check_audio(audio)
 
         self.load_model()
-        audio = whisperx.load_audio(audio_path)
+        if isinstance(audio, str):
+            audio = whisperx.load_audio(audio)
         logger.info(f"🔥 WhisperX transcribing with language={self.language}")
         result = self.model.transcribe(audio, batch_size=batch_size, language=self.language)
         logger.info("✅ WhisperX Transcription Completed.")
@@ -121,13 +209,18 @@ class FasterWhisperBackend(TranscriptionBackend):
            --output_dir whisper-medium-egy-ct2 --quantization float16
        Then set EGYPTIAN_ARABIC_MODEL=./whisper-medium-egy-ct2
     """
+
+    # Segments come out of the lazy decoder one by one
+    incremental = True
     
-    def __init__(self, device: str = None, compute_type: str = "int8", model_id: str = None, language: str = "ar"):
+    def __init__(self, device: str = None, compute_type: str = COMPUTE_TYPE, model_id: str = None, language: str = "ar", cpu_threads: int = None, beam_size: int = BEAM_SIZE):
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self.compute_type = compute_type
         # Default to 'large-v3' for better Arabic dialect support, or use env var
         self.model_id = model_id or os.getenv("EGYPTIAN_ARABIC_MODEL", "large-v3")
         self.language = language
+        self.cpu_threads = cpu_threads if cpu_threads is not None else CPU_THREADS
+        self.beam_size = beam_size
         self.model = None
 
     def load_model(self):
@@ -137,27 +230,44 @@ class FasterWhisperBackend(TranscriptionBackend):
             self.model = WhisperModel(
                 self.model_id,
                 device=self.device,
-                compute_type=self.compute_type
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+                download_root=MODEL_DIR
             )
 
-    def transcribe(self, audio_path: str, batch_size: int = 16) -> dict:
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    def _decode(self, audio: AudioInput):
+        """Start decoding; faster-whisper returns a lazy segment generator."""
+        _check_audio(audio)
 
         self.load_model()
+        # faster-whisper accepts both file paths and 16kHz float32 arrays
+        return self.model.transcribe(audio, language=self.language, beam_size=self.beam_size)
+
+    @staticmethod
+    def _segment_dict(seg) -> dict:
+        # whisperx-compatible format
+        return {
+            "start": seg.start,
+            "end": seg.end,
+            "text": seg.text.strip()
+        }
+
+    def stream(self, audio: AudioInput, batch_size: int = 16) -> Iterator[dict]:
+        logger.info(f"🔥 Faster-Whisper streaming transcription (Egyptian Arabic model)")
+        segments, _ = self._decode(audio)
+        for seg in segments:
+            yield self._segment_dict(seg)
+        logger.info("✅ Faster-Whisper Transcription Completed.")
+
+    def transcribe(self, audio: AudioInput, batch_size: int = 16) -> dict:
         logger.info(f"🔥 Faster-Whisper transcribing (Egyptian Arabic model)")
-        
-        segments, info = self.model.transcribe(audio_path, language=self.language, beam_size=5)
+        segments, info = self._decode(audio)
         
         # Convert to whisperx-compatible format
         segment_list = []
         full_text_parts = []
         for seg in segments:
-            segment_list.append({
-                "start": seg.start,
-                "end": seg.end,
-                "text": seg.text.strip()
-            })
+            segment_list.append(self._segment_dict(seg))
             full_text_parts.append(seg.text.strip())
         
         result = {
@@ -176,51 +286,244 @@ class ColabWhisperBackend(TranscriptionBackend):
     """
     Colab-hosted Whisper backend that sends audio to a remote endpoint.
     Uses the nabbra/whisper-medium-egyptian-arabic model running on Colab.
+
+    Audio is split at silences into COLAB_CHUNK_SECONDS chunks, compressed
+    (FLAC by default) and uploaded in parallel over one pooled HTTP client.
+    Chunks that fail with a transport error, 429 or 5xx are re-uploaded in
+    rounds, up to COLAB_MAX_RETRIES attempts; the bounded backoff between
+    rounds is waited out by the caller, so no upload slot sits idle during
+    it. Finished chunks are kept in the
+    transcript cache, so a failed or redelivered transcription resumes
+    instead of re-uploading everything. Segments carry real timestamps:
+    the endpoint's own segment times when it returns them, otherwise the
+    chunk's span on the recording timeline.
     """
     
     DEFAULT_URL = "https://premises-attacks-detection-alexander.trycloudflare.com/transcribe"
+    remote = True
     
     def __init__(self):
         self.endpoint_url = os.getenv("COLAB_TRANSCRIBE_URL", self.DEFAULT_URL)
+        self.language = "ar"
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._uploads = ThreadPoolExecutor(max_workers=COLAB_PARALLEL_UPLOADS, thread_name_prefix="colab")
+        self._chunk_cache = TranscriptCache() if CACHE_ENABLED else None
         logger.info(f"ColabWhisperBackend initialized with endpoint: {self.endpoint_url}")
     
     def load_model(self):
         """No-op for remote backend - model is already loaded on Colab."""
         pass
-    
-    def transcribe(self, audio_path: str, batch_size: int = 16) -> dict:
+
+    def warmup(self):
+        """Nothing to warm up locally; the model lives on Colab."""
+        pass
+
+    @property
+    def client(self):
+        """Shared keep-alive client; connections are reused across chunks and calls."""
         import httpx
+
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    timeout=httpx.Timeout(COLAB_TIMEOUT_SECONDS, connect=10.0),
+                    limits=httpx.Limits(
+                        max_connections=COLAB_PARALLEL_UPLOADS,
+                        max_keepalive_connections=COLAB_PARALLEL_UPLOADS,
+                    ),
+                )
+            return self._client
+
+    def close(self):
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+        self._uploads.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _parse_segments(result: dict, duration: float) -> list:
+        """Endpoint reply -> segments relative to the start of the chunk."""
+        if result.get("segments"):
+            return [
+                {
+                    "start": float(seg.get("start") or 0.0),
+                    "end": float(seg.get("end") if seg.get("end") is not None else duration),
+                    "text": seg.get("text", "").strip(),
+                }
+                for seg in result["segments"]
+            ]
+        if result.get("chunks"):
+            # transformers pipeline output with return_timestamps=True
+            segments = []
+            for chunk in result["chunks"]:
+                start, end = chunk.get("timestamp") or (0.0, duration)
+                segments.append({
+                    "start": float(start or 0.0),
+                    "end": float(end if end is not None else duration),
+                    "text": chunk.get("text", "").strip(),
+                })
+            return segments
+        text = result.get("text", "").strip()
+        return [{"start": 0.0, "end": duration, "text": text}] if text else []
+
+    def _post(self, index: int, data: bytes):
+        """One upload attempt; retries are scheduled by transcribe()."""
+        ext, mime = AudioEncoder.file_info(COLAB_AUDIO_FORMAT)
+        response = self.client.post(
+            self.endpoint_url, files={"file": (f"chunk_{index}.{ext}", data, mime)}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        import httpx
+
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return isinstance(error, httpx.TransportError)
+
+    @staticmethod
+    def retry_delay(attempt: int) -> float:
+        """Seconds to wait after failed attempt `attempt` (1-based)."""
+        return min(COLAB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1), COLAB_RETRY_MAX_DELAY_SECONDS)
+
+    def _transcribe_chunk(self, index: int, pcm: np.ndarray, start: float) -> list:
+        """Transcribes one chunk; returns segments on the recording timeline."""
+        duration = len(pcm) / SAMPLE_RATE
+        key, cached = None, None
+        if self._chunk_cache:
+            key = audio_key(pcm, f"{self.endpoint_url}|{COLAB_AUDIO_FORMAT}|chunk")
+            cached = self._chunk_cache.get(key)
+
+        if cached is not None:
+            segments = cached["segments"]
+        else:
+            data = AudioEncoder.encode(pcm, COLAB_AUDIO_FORMAT)
+            segments = self._parse_segments(self._post(index, data), duration)
+            if key:
+                self._chunk_cache.put(key, {"segments": segments})
+        return [{**seg, "start": seg["start"] + start, "end": seg["end"] + start} for seg in segments]
+    
+    def transcribe(self, audio: AudioInput, batch_size: int = 16) -> dict:
+        from app.core.audio import buffer
+        from app.core.audio.extractor import AudioExtractor
         
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
-        
-        logger.info(f"🔥 Sending audio to Colab endpoint: {self.endpoint_url}")
-        
-        with open(audio_path, "rb") as f:
-            files = {"file": (os.path.basename(audio_path), f, "audio/wav")}
-            
-            # Use a longer timeout for large audio files
-            with httpx.Client(timeout=300.0) as client:
-                response = client.post(self.endpoint_url, files=files)
-                response.raise_for_status()
-        
-        result = response.json()
-        text = result.get("text", "")
+        _check_audio(audio)
+        pcm = buffer.from_pcm_bytes(AudioExtractor.extract_pcm(audio)) if isinstance(audio, str) else audio
+
+        boundaries = plan_chunks(pcm, COLAB_CHUNK_SECONDS)
+        spans = [(s, e) for s, e in zip(boundaries[:-1], boundaries[1:]) if e > s]
+        logger.info(
+            f"🔥 Sending {len(spans)} {COLAB_AUDIO_FORMAT} chunks to Colab endpoint: {self.endpoint_url}"
+        )
+        pending = {i: span for i, span in enumerate(spans)}
+        results = {}
+        for attempt in range(1, COLAB_MAX_RETRIES + 1):
+            futures = {
+                i: self._uploads.submit(self._transcribe_chunk, i, pcm[int(s * SAMPLE_RATE): int(e * SAMPLE_RATE)], s)
+                for i, (s, e) in pending.items()
+            }
+            failed = {}
+            for i, future in futures.items():
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    if not self._retryable(e) or attempt == COLAB_MAX_RETRIES:
+                        raise
+                    failed[i] = e
+            if not failed:
+                break
+            delay = self.retry_delay(attempt)
+            logger.warning(
+                f"{len(failed)} Colab chunks failed on attempt {attempt} "
+                f"({next(iter(failed.values()))}); retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            pending = {i: pending[i] for i in failed}
+        segments = [seg for i in sorted(results) for seg in results[i] if seg["text"]]
         
-        # Convert to whisperx-compatible format
+        # whisperx-compatible format
         output = {
-            "segments": [{"start": 0, "end": 0, "text": text}],
-            "text": text,
-            "language": "ar"
+            "segments": segments,
+            "text": " ".join(seg["text"] for seg in segments),
+            "language": self.language
         }
         
         logger.info("✅ Colab Transcription Completed.")
         return output
 
 
+# ============================================================================
+# TRANSCRIPTION SERVER BACKEND (Local shared model)
+# ============================================================================
+class ServerTranscriptionBackend(TranscriptionBackend):
+    """
+    Client for the host-local transcription server (app.core.transcription.server),
+    which holds the model once and batches windows across meetings.
+    """
+
+    remote = True
+
+    def __init__(self, host: str = SERVER_HOST, port: int = SERVER_PORT):
+        self.address = (host, port)
+        self.endpoint_url = f"{host}:{port}"
+        logger.info(f"ServerTranscriptionBackend initialized with server: {self.endpoint_url}")
+
+    def _request(self, op: str, payload: dict = None):
+        from multiprocessing.connection import Client
+
+        with Client(self.address, authkey=server_authkey()) as conn:
+            conn.send((op, payload))
+            status, result = conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"Transcription server error: {result}")
+        return result
+
+    def load_model(self):
+        """No-op - the model is loaded by the server process."""
+        pass
+
+    def warmup(self):
+        """The server warms up before it listens; just check it is reachable."""
+        self._request("ping")
+
+    def transcribe(self, audio: AudioInput, batch_size: int = 16) -> dict:
+        from app.core.audio.buffer import load_pcm
+
+        _check_audio(audio)
+        if isinstance(audio, str):
+            audio = load_pcm(audio)
+        logger.info(f"🔥 Sending audio to transcription server: {self.endpoint_url}")
+        # Batch size is decided by the server across all pending requests
+        result = self._request("transcribe", {"audio": np.ascontiguousarray(audio, dtype=np.float32)})
+        logger.info("✅ Server Transcription Completed.")
+        return result
+
+
 # ============================================================================
 # WHISPER SERVICE (FACTORY)
 # ============================================================================
+def create_backend(backend_type: str = None, device: str = None, compute_type: str = COMPUTE_TYPE) -> TranscriptionBackend:
+    """Build the backend named by `backend_type` (default: TRANSCRIPTION_BACKEND)."""
+    backend_type = (backend_type or os.getenv("TRANSCRIPTION_BACKEND", "WhisperXBackend")).lower()
+
+    if backend_type == "colab":
+        logger.info("📌 Using Colab Whisper backend (Egyptian Arabic)")
+        return ColabWhisperBackend()
+    if backend_type == "faster-whisper":
+        logger.info("📌 Using Faster-Whisper backend (Egyptian Arabic)")
+        return FasterWhisperBackend(device=device, compute_type=compute_type)
+    if backend_type == "server":
+        logger.info("📌 Using shared transcription server backend")
+        return ServerTranscriptionBackend()
+    logger.info("📌 Using WhisperX backend")
+    return WhisperXBackend(device=device, compute_type=compute_type)
+
+
 class WhisperService:
     """
     Main transcription service that delegates to the configured backend.
@@ -228,18 +531,30 @@ class WhisperService:
     Default is 'colab' for remote Colab-hosted model.
     """
     
-    def __init__(self, device: str = None, compute_type: str = "int8"):
-        backend_type = os.getenv("TRANSCRIPTION_BACKEND", "WhisperXBackend").lower()
-        
-        if backend_type == "colab":
-            logger.info("📌 Using Colab Whisper backend (Egyptian Arabic)")
-            self.backend = ColabWhisperBackend()
-        elif backend_type == "faster-whisper":
-            logger.info("📌 Using Faster-Whisper backend (Egyptian Arabic)")
-            self.backend = FasterWhisperBackend(device=device, compute_type=compute_type)
-        else:
-            logger.info("📌 Using WhisperX backend")
-            self.backend = WhisperXBackend(device=device, compute_type=compute_type)
+    def __init__(self, device: str = None, compute_type: str = COMPUTE_TYPE):
+        self.backend = create_backend(device=device, compute_type=compute_type)
+
+        # Local backends can fan long recordings out over a process pool
+        self.chunked = None
+        if CHUNK_WORKERS > 0 and not self.backend.remote:
+            self.chunked = ChunkedTranscriber(workers=CHUNK_WORKERS)
+
+        self.cache = TranscriptCache() if CACHE_ENABLED else None
+        # Set once warmup() has completed (see the /ready endpoint)
+        self.ready = False
+
+    def cache_identity(self) -> str:
+        """Everything besides the audio that determines the transcript."""
+        backend = self.backend
+        parts = [
+            type(backend).__name__,
+            getattr(backend, "model_size", None) or getattr(backend, "model_id", None)
+            or getattr(backend, "endpoint_url", ""),
+            getattr(backend, "language", ""),
+            getattr(backend, "compute_type", ""),
+            getattr(backend, "beam_size", ""),
+        ]
+        return "|".join(str(p) for p in parts)
 
     def load_model(self, model_size: str = "base", language: str = "en"):
         """Load model (for compatibility with existing code)."""
@@ -249,6 +564,111 @@ class WhisperService:
             self.backend.language = language
         self.backend.load_model()
 
-    def transcribe(self, audio_path: str, batch_size: int = 16) -> dict:
-        """Transcribe audio using the configured backend."""
-        return self.backend.transcribe(audio_path, batch_size=batch_size)
\ No newline at end of file
+    def warmup(self):
+        """
+        Preload the backend and run a synthetic clip through it (and through
+        every chunked worker), bypassing the transcript cache.
+        """
+        started = time.perf_counter()
+        self.backend.warmup()
+        if self.chunked:
+            self.chunked.warmup()
+        self.ready = True
+        logger.info(f"✅ Transcription warm-up completed in {time.perf_counter() - started:.1f}s")
+
+    def _cache_lookup(self, audio: AudioInput) -> tuple:
+        """Returns (cache key, cached result); both None when caching is off."""
+        if not self.cache:
+            return None, None
+        _check_audio(audio)
+        key = audio_key(audio, self.cache_identity())
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"⚡ Transcript cache hit ({key[:12]})")
+        return key, cached
+
+    def _cache_store(self, key: str, result: dict):
+        if key:
+            try:
+                self.cache.put(key, result)
+            except Exception as e:
+                logger.warning(f"Failed to store transcript in cache: {e}")
+
+    def _use_chunked(self, audio: AudioInput) -> bool:
+        return bool(self.chunked and isinstance(audio, np.ndarray) and self.chunked.should_chunk(audio))
+
+    def transcribe(self, audio: AudioInput, batch_size: int = BATCH_SIZE, pooled: bool = False) -> dict:
+        """
+        Transcribe a file path or in-memory PCM buffer using the configured
+        backend. With `pooled`, audio too short to split still goes to a worker
+        of the chunked pool (when there is one) instead of the in-process model,
+        so concurrent callers don't queue on it.
+        """
+        key, cached = self._cache_lookup(audio)
+        if cached is not None:
+            return cached
+
+        if self._use_chunked(audio):
+            result = self.chunked.transcribe(audio, batch_size=batch_size)
+        elif pooled and self.chunked and isinstance(audio, np.ndarray):
+            result = self.chunked.transcribe_whole(audio, batch_size=batch_size)
+        else:
+            result = self.backend.transcribe(audio, batch_size=batch_size)
+
+        self._cache_store(key, result)
+        return result
+
+    def stream(self, audio: AudioInput, batch_size: int = BATCH_SIZE) -> Iterator[dict]:
+        """
+        Like transcribe(), but yields segments as the backend decodes them so
+        downstream stages can start before transcription has finished.
+        """
+        key, cached = self._cache_lookup(audio)
+        if cached is not None:
+            yield from cached.get("segments", [])
+            return
+
+        if self._use_chunked(audio):
+            # The pool returns whole chunks; stitching needs all of them
+            result = self.chunked.transcribe(audio, batch_size=batch_size)
+            self._cache_store(key, result)
+            yield from result.get("segments", [])
+            return
+
+        segments = []
+        for seg in self.backend.stream(audio, batch_size=batch_size):
+            segments.append(seg)
+            yield seg
+        self._cache_store(key, {
+            "segments": segments,
+            "text": " ".join(seg.get("text", "") for seg in segments),
+            "language": getattr(self.backend, "language", None),
+        })
+
+    def transcribe_regions(self, pcm: np.ndarray, regions: list, batch_size: int = BATCH_SIZE, pooled: bool = False) -> dict:
+        """
+        Transcribe only the given (start, end) speech regions of a PCM buffer.
+        The regions are concatenated into one buffer for the backend and the
+        resulting segment timestamps are mapped back to the original timeline.
+        """
+        from app.core.audio import buffer, vad
+
+        speech, offsets = vad.compact(pcm, regions)
+        logger.info(f"Transcribing {buffer.duration(speech):.1f}s of speech out of {buffer.duration(pcm):.1f}s")
+        result = self.transcribe(speech, batch_size=batch_size, pooled=pooled)
+        result["segments"] = vad.restore_timestamps(result.get("segments", []), offsets)
+        return result
+
+    def stream_regions(self, pcm: np.ndarray, regions: list, batch_size: int = BATCH_SIZE) -> Iterator[dict]:
+        """Streaming variant of transcribe_regions()."""
+        from app.core.audio import vad
+
+        speech, offsets = vad.compact(pcm, regions)
+        for seg in self.stream(speech, batch_size=batch_size):
+            yield vad.restore_timestamps([seg], offsets)[0]
+
+    def shutdown(self):
+        """Stop the chunked transcription worker pool and close backend clients."""
+        if self.chunked:
+            self.chunked.shutdown()
+        self.backend.close()
\ No newline at end of file
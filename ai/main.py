@@ -3,11 +3,15 @@ from app.core.logging_config import setup_logging
 setup_logging()
 
 import early_patch
+import os
+import signal
+import asyncio
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
-from api.routes import process
+from api.routes import process, metrics, progress
 
 from mcp.router import router as mcp_router
 # Load env
@@ -16,11 +20,16 @@ load_dotenv()
 import logging
 logger = logging.getLogger(__name__)
 
+# Preload the transcription model and run a warm-up clip before taking work
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+# Failed warm-ups before the process exits so the pod is restarted; 0 keeps retrying
+WARMUP_ATTEMPTS = int(os.getenv("WARMUP_ATTEMPTS", "0"))
+# Pause after a failed warm-up, doubled after each failure up to the cap
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "10"))
+WARMUP_RETRY_MAX_SECONDS = float(os.getenv("WARMUP_RETRY_MAX_SECONDS", "300"))
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Startup and shutdown events."""
-    # Startup
+
+async def start_consumer():
     try:
         from app.core.messaging.consumer import start_consumer
         await start_consumer()
@@ -28,9 +37,54 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to start RabbitMQ consumer: {e}")
         logger.warning("AI service running without RabbitMQ — only manual /process endpoint available")
+
+
+async def warm_up_and_consume():
+    """
+    Warm up inference, then start pulling recording events. /ready stays 503
+    and no work is consumed until a warm-up succeeds: failures are retried
+    with capped exponential backoff, and after WARMUP_ATTEMPTS failures (if
+    set) the process shuts down so the orchestrator restarts the pod.
+    """
+    from app.core.executors import run_inference
+    from app.core.pipelines.nodes.transcribe import whisper_service
+
+    attempt = 0
+    while not whisper_service.ready:
+        attempt += 1
+        try:
+            logger.info(f"Warming up transcription model (attempt {attempt})...")
+            await run_inference(whisper_service.warmup)
+        except Exception as e:
+            logger.error(f"Transcription warm-up failed: {e}", exc_info=True)
+            if WARMUP_ATTEMPTS and attempt >= WARMUP_ATTEMPTS:
+                logger.critical(f"Transcription warm-up failed {attempt} times; shutting down")
+                os.kill(os.getpid(), signal.SIGTERM)
+                return
+            delay = min(WARMUP_RETRY_SECONDS * 2 ** (attempt - 1), WARMUP_RETRY_MAX_SECONDS)
+            logger.info(f"Retrying transcription warm-up in {delay:.0f}s")
+            await asyncio.sleep(delay)
+    await start_consumer()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup and shutdown events."""
+    # Startup: warm-up runs in the background so /ready can report progress;
+    # the consumer only starts once the model is hot
+    warmup_task = None
+    if WARMUP_ON_STARTUP:
+        warmup_task = asyncio.create_task(warm_up_and_consume())
+    else:
+        from app.core.pipelines.nodes.transcribe import whisper_service
+        whisper_service.ready = True
+        await start_consumer()
     
     yield
     
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+
     # Shutdown
     try:
         from app.core.messaging.rabbitmq import close_connection
@@ -39,15 +93,40 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error closing RabbitMQ connection: {e}")
 
+    try:
+        from app.core.pipelines.nodes.transcribe import whisper_service
+        whisper_service.shutdown()
+    except Exception as e:
+        logger.error(f"Error stopping transcription workers: {e}")
+
+    try:
+        from app.core.llm.factory import LLMFactory
+        await LLMFactory.aclose_all()
+    except Exception as e:
+        logger.error(f"Error closing LLM clients: {e}")
+
+    from app.core import executors
+    executors.shutdown()
+
 
 app = FastAPI(title="AI Meeting Summarizer", lifespan=lifespan)
 
 app.include_router(process.router, prefix="/api/v1")
+app.include_router(metrics.router, prefix="/api/v1")
+app.include_router(progress.router, prefix="/api/v1")
 app.include_router(mcp_router, prefix="/api/v1/mcp")
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to AI Meeting Summarizer API"}
 
+@app.get("/ready")
+def readiness():
+    """Readiness probe: 503 until the transcription model is loaded and warm."""
+    from app.core.pipelines.nodes.transcribe import whisper_service
+    if not whisper_service.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Chunked transcription: chunk boundaries fall in silences and stitched
+segments appear once, in order, on the recording timeline.
+"""
+import numpy as np
+import pytest
+
+from app.core.audio.frontend import SAMPLE_RATE
+from app.core.transcription import chunked
+
+# Tone bursts (start, end) in seconds, separated by silence
+BURSTS = [(1.0, 2.0), (5.0, 6.5), (9.0, 10.0), (13.0, 14.5)]
+DURATION = 16.0
+
+
+def _recording() -> np.ndarray:
+    t = np.arange(int(DURATION * SAMPLE_RATE)) / SAMPLE_RATE
+    pcm = np.random.default_rng(0).normal(0, 1e-4, t.size).astype(np.float32)
+    for start, end in BURSTS:
+        span = (t >= start) & (t < end)
+        pcm[span] += 0.3 * np.sin(2 * np.pi * 220 * t[span]).astype(np.float32)
+    return pcm
+
+
+def _seg(start, end, text, **extra):
+    return {"start": start, "end": end, "text": text, **extra}
+
+
+def test_short_recordings_are_one_chunk():
+    pcm = np.zeros(int(5 * SAMPLE_RATE), dtype=np.float32)
+    assert chunked.plan_chunks(pcm, chunk_seconds=4.0) == [0.0, 5.0]
+
+
+@pytest.mark.parametrize("chunk_seconds", [3.0, 4.0, 6.0])
+def test_chunk_boundaries_move_forward_and_land_in_silence(chunk_seconds):
+    pcm = _recording()
+    boundaries = chunked.plan_chunks(pcm, chunk_seconds=chunk_seconds)
+    assert boundaries[0] == 0.0 and boundaries[-1] == DURATION
+    assert all(b > a for a, b in zip(boundaries, boundaries[1:]))
+    for boundary in boundaries[1:-1]:
+        assert not any(start < boundary < end for start, end in BURSTS)
+
+
+def test_boundaries_advance_when_the_search_window_exceeds_the_chunk():
+    pcm = np.zeros(int(DURATION * SAMPLE_RATE), dtype=np.float32)
+    boundaries = chunked.plan_chunks(pcm, chunk_seconds=4.0, search_s=15.0)
+    assert all(b > a for a, b in zip(boundaries, boundaries[1:]))
+
+
+def test_stitch_keeps_overlap_segments_once_by_midpoint():
+    boundaries = [0.0, 10.0, 20.0]
+    first = [_seg(1.0, 4.0, "opening"), _seg(9.0, 10.6, "across the cut")]
+    # The second chunk starts a second early and hears the same words again
+    second = [_seg(9.1, 10.6, "across the cut"), _seg(12.0, 15.0, "closing")]
+    merged = chunked.stitch([first, second], boundaries)
+    assert [seg["text"] for seg in merged] == ["opening", "across the cut", "closing"]
+    assert merged[1]["start"] == 9.0
+
+
+def test_stitch_drops_segments_owned_by_the_neighbour():
+    boundaries = [0.0, 10.0, 20.0]
+    first = [_seg(2.0, 3.0, "a"), _seg(10.2, 10.8, "heard in the overlap")]
+    second = [_seg(9.2, 9.8, "also in the overlap"), _seg(10.2, 10.8, "b")]
+    merged = chunked.stitch([first, second], boundaries)
+    assert [seg["text"] for seg in merged] == ["a", "b"]
+
+
+def test_last_chunk_keeps_segments_up_to_the_end():
+    merged = chunked.stitch([[_seg(1.0, 2.0, "a")], [_seg(19.5, 20.5, "tail")]], [0.0, 10.0, 20.0])
+    assert [seg["text"] for seg in merged] == ["a", "tail"]
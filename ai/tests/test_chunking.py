@@ -0,0 +1,88 @@
+"""
+ChunkPacker: prompt chunks stay within the token budget and are cut only
+between segments, lines, sentences or words.
+"""
+import pytest
+
+from app.core.ai.chunking import ChunkPacker, segment_pieces
+
+WORDS = "the quarterly budget review moved to thursday after the vendor call".split()
+
+
+def _sentences(count: int) -> list[str]:
+    return [" ".join(WORDS[i % 5:] + [f"item{i}."]) for i in range(count)]
+
+
+@pytest.fixture
+def packer():
+    return ChunkPacker("ollama", budget=60)
+
+
+def test_budget_is_capped_by_the_context():
+    assert ChunkPacker("ollama", context_tokens=2048, output_tokens=1024, budget=10_000).budget < 1024
+    assert ChunkPacker("ollama", budget=60).budget == 60
+
+
+def test_arabic_costs_more_tokens_than_latin_text(packer):
+    latin = "a" * 100
+    arabic = "م" * 100
+    assert packer.estimate(arabic) > packer.estimate(latin)
+
+
+def test_fits_counts_the_overhead(packer):
+    text = " ".join(WORDS)
+    tokens = packer.estimate(text)
+    assert packer.fits(text, overhead=packer.budget - tokens)
+    assert not packer.fits(text, overhead=packer.budget - tokens + 1)
+
+
+@pytest.mark.parametrize("overhead", [0, 10, 40])
+def test_chunks_never_exceed_the_budget(packer, overhead):
+    pieces = _sentences(40)
+    chunks = packer.pack(pieces, overhead)
+    assert len(chunks) > 1
+    assert all(packer.estimate(chunk) + overhead <= packer.budget for chunk in chunks)
+
+
+def test_chunks_never_cut_inside_a_word(packer):
+    pieces = _sentences(40)
+    chunks = packer.pack(pieces)
+    assert " ".join(chunks).split() == " ".join(pieces).split()
+
+
+def test_segments_are_kept_whole_and_in_order(packer):
+    segments = [{"start": i, "end": i + 1, "text": text} for i, text in enumerate(_sentences(30))]
+    pieces = segment_pieces(segments)
+    groups = packer.pack_groups(pieces)
+    assert len(groups) > 1
+    assert [piece for group in groups for piece in group] == pieces
+    assert packer.pack_segments(segments) == [" ".join(group) for group in groups]
+
+
+def test_speakers_prefix_their_segments():
+    segments = [{"text": " hello ", "speaker": "Mona"}, {"text": "hi"}]
+    assert segment_pieces(segments) == ["Mona: hello", "hi"]
+
+
+def test_oversized_piece_is_split_at_sentences_then_words(packer):
+    sentences = _sentences(12)
+    run_on = " ".join(WORDS * 8)
+    piece = " ".join(sentences) + " " + run_on
+    chunks = packer.pack([piece])
+    assert all(packer.estimate(chunk) <= packer.budget for chunk in chunks)
+    assert " ".join(chunks).split() == piece.split()
+    # Sentences that fit stay in one chunk
+    for sentence in sentences:
+        assert any(sentence in chunk for chunk in chunks)
+
+
+def test_free_text_is_cut_at_line_breaks(packer):
+    lines = _sentences(30)
+    chunks = packer.pack_text("\n".join(lines))
+    assert len(chunks) > 1
+    assert [line for chunk in chunks for line in chunk.split("\n")] == lines
+
+
+def test_short_text_is_one_chunk(packer):
+    assert packer.pack_text("a short note") == ["a short note"]
+    assert packer.pack_text("   ") == []
@@ -0,0 +1,125 @@
+"""
+ColabWhisperBackend against the local stand-in endpoint (colab_standin):
+chunked upload, retries of failed chunks and chunk offsets on the timeline.
+"""
+import shutil
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+import uvicorn
+
+from app.core.audio.frontend import SAMPLE_RATE
+from app.core.transcription import colab_standin, whisper_service
+from app.core.transcription.whisper_service import ColabWhisperBackend
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg binary not available")
+
+# Tone bursts (start, end) in seconds, separated by silence
+BURSTS = [(1.0, 2.0), (5.0, 6.5), (9.0, 10.0), (13.0, 14.5)]
+DURATION = 16.0
+
+
+def _recording() -> np.ndarray:
+    t = np.arange(int(DURATION * SAMPLE_RATE)) / SAMPLE_RATE
+    pcm = np.random.default_rng(0).normal(0, 1e-4, t.size).astype(np.float32)
+    for start, end in BURSTS:
+        span = (t >= start) & (t < end)
+        pcm[span] += 0.3 * np.sin(2 * np.pi * 220 * t[span]).astype(np.float32)
+    return pcm
+
+
+class _FailFirst:
+    """Replaces the stand-in's `random`: the first `failures` requests fail with 503."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.requests = 0
+
+    def random(self) -> float:
+        self.requests += 1
+        return 0.0 if self.requests <= self.failures else 1.0
+
+
+@pytest.fixture(scope="module")
+def standin_url():
+    """Serves the stand-in on a free local port, as `uvicorn ...colab_standin:app` would."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(colab_standin.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("stand-in did not start")
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}/transcribe"
+    server.should_exit = True
+    thread.join(timeout=10)
+
+
+@pytest.fixture
+def backend(monkeypatch, standin_url):
+    monkeypatch.setattr(whisper_service, "COLAB_CHUNK_SECONDS", 4.0)
+    monkeypatch.setattr(whisper_service, "COLAB_AUDIO_FORMAT", "wav")
+    monkeypatch.setattr(whisper_service, "COLAB_RETRY_BACKOFF_SECONDS", 0.0)
+    monkeypatch.setattr(colab_standin, "FAILURE_RATE", 0.5)
+    backend = ColabWhisperBackend()
+    backend._chunk_cache = None
+    backend.endpoint_url = standin_url
+    yield backend
+    backend.close()
+
+
+def _assert_on_timeline(segments: list[dict]):
+    assert len(segments) == len(BURSTS)
+    for seg, (start, end) in zip(segments, BURSTS):
+        # VAD pads regions by 0.2s and works in 30ms frames
+        assert seg["start"] == pytest.approx(start, abs=0.3)
+        assert seg["end"] == pytest.approx(end, abs=0.3)
+
+
+def test_chunks_are_uploaded_and_stitched_on_the_recording_timeline(backend, monkeypatch):
+    requests = _FailFirst(0)
+    monkeypatch.setattr(colab_standin, "random", requests)
+
+    result = backend.transcribe(_recording())
+
+    # 16s at 4s per chunk, cut in the silences between bursts
+    assert requests.requests >= 3
+    _assert_on_timeline(result["segments"])
+    assert result["text"] == " ".join(seg["text"] for seg in result["segments"])
+
+
+def test_failed_chunks_are_retried(backend, monkeypatch):
+    requests = _FailFirst(2)
+    monkeypatch.setattr(colab_standin, "random", requests)
+
+    result = backend.transcribe(_recording())
+
+    chunks = len(whisper_service.plan_chunks(_recording(), 4.0)) - 1
+    assert requests.requests == chunks + 2
+    _assert_on_timeline(result["segments"])
+
+
+def test_gives_up_after_max_retries(backend, monkeypatch):
+    import httpx
+
+    requests = _FailFirst(10_000)
+    monkeypatch.setattr(colab_standin, "random", requests)
+    monkeypatch.setattr(whisper_service, "COLAB_MAX_RETRIES", 2)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        backend.transcribe(_recording())
+    chunks = len(whisper_service.plan_chunks(_recording(), 4.0)) - 1
+    assert requests.requests == 2 * chunks
+
+
+def test_retry_delay_is_bounded(monkeypatch):
+    monkeypatch.setattr(whisper_service, "COLAB_RETRY_BACKOFF_SECONDS", 1.0)
+    monkeypatch.setattr(whisper_service, "COLAB_RETRY_MAX_DELAY_SECONDS", 5.0)
+    assert [ColabWhisperBackend.retry_delay(a) for a in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
@@ -0,0 +1,319 @@
+"""
+AdaptiveLimiter / LimitedLLM: additive increase, multiplicative decrease,
+Retry-After pauses, 429 retries, priority ordering and sync calls.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.llm import limiter as limiter_module
+from app.core.llm.base import BaseLLM
+from app.core.llm.limiter import AdaptiveLimiter, LimitedLLM, llm_priority, overload_signal
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, retry_after: str = None):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after} if retry_after else {}})()
+
+
+class _FlakyLLM(BaseLLM):
+    """Fails the first `failures` calls with `status`, then answers."""
+
+    def __init__(self, failures: int = 0, status: int = 429):
+        self.failures = failures
+        self.status = status
+        self.calls = 0
+
+    def generate(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise _HTTPError(self.status)
+        return f"answer to {prompt}"
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        return self.generate(prompt, **kwargs)
+
+
+def test_limit_starts_at_half_the_maximum():
+    assert AdaptiveLimiter("test", 8).limit == 4
+    assert AdaptiveLimiter("test", 1).limit == 1
+
+
+def test_fast_calls_raise_the_limit_about_one_per_round_trip():
+    async def run():
+        limiter = AdaptiveLimiter("test", 16, latency_target=10)
+        for _ in range(4):
+            started = await limiter.acquire()
+            limiter.release(started, latency=0.1)
+        return limiter.limit
+
+    limit = asyncio.run(run())
+    assert 8 + 0.4 < limit < 8 + 0.6
+
+
+def test_limit_never_exceeds_the_maximum():
+    async def run():
+        limiter = AdaptiveLimiter("test", 2, latency_target=10)
+        for _ in range(50):
+            started = await limiter.acquire()
+            limiter.release(started, latency=0.1)
+        return limiter.limit
+
+    assert asyncio.run(run()) == 2
+
+
+def test_overload_halves_the_limit_once_per_window(monkeypatch):
+    monkeypatch.setattr(limiter_module, "LLM_LIMIT_BACKOFF", 0.5)
+
+    async def run():
+        limiter = AdaptiveLimiter("test", 16)
+        slots = [await limiter.acquire() for _ in range(3)]
+        # Three calls in flight when the provider starts answering 429: one cut
+        for started in slots:
+            limiter.release(started, status=429)
+        after_window = limiter.limit
+        started = await limiter.acquire()
+        limiter.release(started, status=503)
+        return after_window, limiter.limit, limiter.throttled
+
+    after_window, after_next, throttled = asyncio.run(run())
+    assert after_window == 4
+    assert after_next == 2
+    assert throttled == 4
+
+
+def test_slow_calls_cut_the_limit_gently(monkeypatch):
+    monkeypatch.setattr(limiter_module, "LLM_LIMIT_BACKOFF", 0.5)
+
+    async def run():
+        limiter = AdaptiveLimiter("test", 16, latency_target=1)
+        started = await limiter.acquire()
+        limiter.release(started, latency=5)
+        return limiter.limit
+
+    assert asyncio.run(run()) == 6
+
+
+def test_long_generations_at_their_usual_latency_are_not_congestion():
+    async def run():
+        limiter = AdaptiveLimiter("test", 4)
+        # Ollama summaries that always take ~90s
+        for latency in [90, 95, 85, 100, 92, 110, 88, 97]:
+            started = await limiter.acquire()
+            limiter.release(started, latency=latency)
+        return limiter.limit
+
+    assert asyncio.run(run()) == 4
+
+
+def test_calls_much_slower_than_the_baseline_cut_the_limit(monkeypatch):
+    monkeypatch.setattr(limiter_module, "LLM_LIMIT_BACKOFF", 0.5)
+    monkeypatch.setattr(limiter_module, "LLM_LATENCY_TOLERANCE", 3)
+
+    async def run():
+        limiter = AdaptiveLimiter("test", 16, latency_target=None)
+        for _ in range(limiter_module.LLM_BASELINE_SAMPLES):
+            started = await limiter.acquire()
+            limiter.release(started, latency=2)
+        before = limiter.limit
+        started = await limiter.acquire()
+        limiter.release(started, latency=10)
+        return before, limiter.limit
+
+    before, after = asyncio.run(run())
+    assert after == before * 0.75
+
+
+def test_stream_first_tokens_have_their_own_baseline():
+    async def run():
+        limiter = AdaptiveLimiter("test", 16)
+        for _ in range(10):
+            started = await limiter.acquire()
+            limiter.release(started, latency=60)
+            started = await limiter.acquire()
+            limiter.release(started, latency=0.5, signal="first_token")
+        before = limiter.limit
+        # A full call far slower than any first token is still normal for full calls
+        started = await limiter.acquire()
+        limiter.release(started, latency=70)
+        return before, limiter.limit, limiter.snapshot()["latency_baseline_seconds"]
+
+    before, after, baselines = asyncio.run(run())
+    assert after > before
+    assert baselines["call"] == pytest.approx(61.0)
+    assert baselines["first_token"] == pytest.approx(0.5)
+
+
+def test_limit_never_drops_below_the_minimum():
+    async def run():
+        limiter = AdaptiveLimiter("test", 4, min_limit=1)
+        for _ in range(10):
+            started = await limiter.acquire()
+            limiter.release(started, status=429)
+        return limiter.limit
+
+    assert asyncio.run(run()) == 1
+
+
+def test_other_failures_leave_the_limit_alone():
+    async def run():
+        limiter = AdaptiveLimiter("test", 8)
+        started = await limiter.acquire()
+        limiter.release(started, status=400)
+        return limiter.limit
+
+    assert asyncio.run(run()) == 4
+
+
+def test_waiters_are_served_by_priority():
+    async def run():
+        limiter = AdaptiveLimiter("test", 2)   # limit 1
+        held = await limiter.acquire()
+        order = []
+
+        async def call(priority):
+            started = await limiter.acquire(priority)
+            order.append(priority)
+            limiter.release(started, latency=0.1)
+
+        tasks = [asyncio.create_task(call(p)) for p in ("batch", "normal", "interactive")]
+        await asyncio.sleep(0)
+        limiter.release(held, latency=0.1)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(run()) == ["interactive", "normal", "batch"]
+
+
+def test_retry_after_pauses_the_queue():
+    async def run():
+        limiter = AdaptiveLimiter("test", 2)
+        started = await limiter.acquire()
+        limiter.release(started, status=429, retry_after=0.2)
+        loop = asyncio.get_running_loop()
+        requested = loop.time()
+        limiter.release(await limiter.acquire(), latency=0.1)
+        return loop.time() - requested
+
+    assert asyncio.run(run()) >= 0.15
+
+
+def test_overload_signal_reads_status_and_retry_after_through_the_chain():
+    try:
+        try:
+            raise _HTTPError(429, retry_after="3")
+        except _HTTPError as e:
+            raise RuntimeError("provider failed") from e
+    except RuntimeError as wrapped:
+        assert overload_signal(wrapped) == (429, 3.0)
+    assert overload_signal(asyncio.TimeoutError()) == (504, None)
+    assert overload_signal(ValueError("bad prompt")) == (None, None)
+
+
+def test_rate_limited_calls_are_retried(monkeypatch):
+    monkeypatch.setattr(limiter_module, "LLM_RETRY_BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(limiter_module, "LLM_RATE_LIMIT_RETRIES", 2)
+    llm = _FlakyLLM(failures=2)
+    limited = LimitedLLM(llm, AdaptiveLimiter("test", 4))
+
+    assert asyncio.run(limited.agenerate("q")) == "answer to q"
+    assert llm.calls == 3
+    assert limited.limiter.in_flight == 0
+
+
+def test_retries_are_bounded(monkeypatch):
+    monkeypatch.setattr(limiter_module, "LLM_RETRY_BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(limiter_module, "LLM_RATE_LIMIT_RETRIES", 1)
+    llm = _FlakyLLM(failures=5)
+    limited = LimitedLLM(llm, AdaptiveLimiter("test", 4))
+
+    with pytest.raises(_HTTPError):
+        asyncio.run(limited.agenerate("q"))
+    assert llm.calls == 2
+    assert limited.limiter.in_flight == 0
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
+
+
+def test_sync_calls_are_limited_and_retried(monkeypatch):
+    monkeypatch.setattr(limiter_module, "LLM_RETRY_BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(limiter_module, "LLM_RATE_LIMIT_RETRIES", 2)
+    llm = _FlakyLLM(failures=1)
+    limited = LimitedLLM(llm, AdaptiveLimiter("test", 4))
+
+    assert limited.generate("q") == "answer to q"
+    assert llm.calls == 2
+    assert limited.limiter.in_flight == 0
+    assert limited.limiter.throttled == 1
+
+
+def test_sync_calls_share_the_limit_with_threads():
+    limiter = AdaptiveLimiter("test", 2)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    class SlowLLM(_FlakyLLM):
+        def generate(self, prompt, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return prompt
+
+    limited = LimitedLLM(SlowLLM(), limiter)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(limited.generate, map(str, range(16)))) == list(map(str, range(16)))
+    # Eight threads, but never more calls than the limit can grow to
+    assert peak <= 2
+    assert limiter.in_flight == 0
+
+
+def test_sync_and_async_calls_share_one_queue():
+    async def run():
+        limiter = AdaptiveLimiter("test", 2)   # limit 1
+        held = await limiter.acquire()
+        thread_started = threading.Event()
+        order = []
+
+        def blocking_call():
+            thread_started.set()
+            started = limiter.acquire_sync("batch")
+            order.append("sync")
+            limiter.release(started)
+
+        loop = asyncio.get_running_loop()
+        sync_call = loop.run_in_executor(None, blocking_call)
+        await loop.run_in_executor(None, thread_started.wait)
+        while not limiter.snapshot()["queue_depth"]:
+            await asyncio.sleep(0.01)
+        async_call = asyncio.create_task(limiter.acquire("interactive"))
+        await asyncio.sleep(0.01)
+        # The slot frees up from a worker thread (without raising the limit); the async waiter goes first
+        await loop.run_in_executor(None, lambda: limiter.release(held))
+        started = await async_call
+        order.append("async")
+        limiter.release(started)
+        await sync_call
+        return order, limiter.in_flight
+
+    assert asyncio.run(run()) == (["async", "sync"], 0)
+
+
+def test_sync_acquire_refuses_to_block_the_event_loop():
+    async def run():
+        AdaptiveLimiter("test", 2).acquire_sync()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
@@ -0,0 +1,17 @@
+"""
+Live transcription: segments of a chunk are shifted to the chunk's offset
+on the meeting timeline.
+"""
+from app.core.transcription.live import shift_segments
+
+
+def _seg(start, end, text, **extra):
+    return {"start": start, "end": end, "text": text, **extra}
+
+
+def test_live_chunk_segments_are_shifted_by_the_chunk_start():
+    segments = [_seg(0.5, 1.5, "hi", words=[{"word": "hi", "start": 0.5, "end": 1.5}])]
+    shifted = shift_segments(segments, 120.0)
+    assert (shifted[0]["start"], shifted[0]["end"]) == (120.5, 121.5)
+    assert (shifted[0]["words"][0]["start"], shifted[0]["words"][0]["end"]) == (120.5, 121.5)
+    assert shift_segments(segments, 0.0) is segments
@@ -0,0 +1,38 @@
+"""
+ProgressHub: late subscribers get the latest event, and a new run of the
+same meeting doesn't replay the previous run's final event.
+"""
+import asyncio
+
+from app.core.progress import ProgressHub
+
+
+async def _collect(hub: ProgressHub, key: str) -> list[dict]:
+    return [event async for event in hub.subscribe(key)]
+
+
+def test_late_subscriber_gets_the_final_event_of_a_finished_run():
+    async def run():
+        hub = ProgressHub(min_interval_s=0)
+        hub.publish_partial("m1", "summary", "Draft")
+        hub.complete("m1", "summary", "Final")
+        return await _collect(hub, "m1")
+
+    assert asyncio.run(run()) == [{"stage": "summary", "text": "Final", "done": True}]
+
+
+def test_a_new_run_does_not_replay_the_previous_done_event():
+    async def run():
+        hub = ProgressHub(min_interval_s=0)
+        hub.complete("m1", "summary", "First run")
+
+        hub.start("m1")
+        subscriber = asyncio.create_task(_collect(hub, "m1"))
+        await asyncio.sleep(0)
+        assert not subscriber.done()
+        hub.publish_partial("m1", "summary", "Second")
+        hub.complete("m1", "summary", "Second run")
+        return await asyncio.wait_for(subscriber, 1)
+
+    events = asyncio.run(run())
+    assert [event["text"] for event in events] == ["Second", "Second run"]
@@ -0,0 +1,63 @@
+"""
+Shared transcription server: window segments are shifted back onto the
+request's timeline.
+"""
+import numpy as np
+import pytest
+
+from app.core.audio.frontend import SAMPLE_RATE
+from app.core.transcription import server, whisper_service
+
+# Tone bursts (start, end) in seconds, separated by silence
+BURSTS = [(1.0, 2.0), (5.0, 6.5), (9.0, 10.0), (13.0, 14.5)]
+DURATION = 16.0
+
+
+def _recording() -> np.ndarray:
+    t = np.arange(int(DURATION * SAMPLE_RATE)) / SAMPLE_RATE
+    pcm = np.random.default_rng(0).normal(0, 1e-4, t.size).astype(np.float32)
+    for start, end in BURSTS:
+        span = (t >= start) & (t < end)
+        pcm[span] += 0.3 * np.sin(2 * np.pi * 220 * t[span]).astype(np.float32)
+    return pcm
+
+
+def _seg(start, end, text, **extra):
+    return {"start": start, "end": end, "text": text, **extra}
+
+
+class _WindowBackend:
+    """Answers every window with one segment spanning it (window-relative times)."""
+
+    language = "ar"
+
+    def warmup(self):
+        pass
+
+    def transcribe(self, audio, batch_size=16):
+        duration = len(audio) / SAMPLE_RATE
+        return {"segments": [_seg(0.0, duration, f"{duration:.1f}s")]}
+
+
+def test_server_windows_are_shifted_onto_the_request_timeline(monkeypatch):
+    monkeypatch.setattr(whisper_service, "create_backend", lambda *args, **kwargs: _WindowBackend())
+    transcription_server = server.TranscriptionServer(max_batch=4, max_wait_s=0.01)
+    # Plan windows per speech region, as with a WhisperX build that batches across requests
+    transcription_server.batched = True
+    monkeypatch.setattr(transcription_server, "_infer_batched", lambda windows: [
+        transcription_server.backend.transcribe(w)["segments"] for w in windows
+    ])
+    # Short windows, so the recording spans several of them
+    plan_windows = server.plan_windows
+    monkeypatch.setattr(server, "plan_windows", lambda pcm: plan_windows(pcm, window_s=2.0))
+    transcription_server.start()
+
+    windows = plan_windows(_recording(), window_s=2.0)
+    assert len(windows) > 1
+    result = transcription_server.transcribe(_recording())
+
+    assert [(seg["start"], seg["end"]) for seg in result["segments"]] == [
+        pytest.approx(window, abs=1e-3) for window in windows
+    ]
+    for start, end in BURSTS:
+        assert any(seg["start"] <= start + 0.3 and seg["end"] >= end - 0.3 for seg in result["segments"])
@@ -0,0 +1,72 @@
+"""
+VAD: speech regions are found, compacted into one buffer, and segments
+transcribed from the compacted buffer are mapped back onto the original timeline.
+"""
+import numpy as np
+import pytest
+
+from app.core.audio import vad
+from app.core.audio.frontend import SAMPLE_RATE
+
+# Tone bursts (start, end) in seconds, separated by silence
+BURSTS = [(1.0, 2.0), (5.0, 6.5), (9.0, 10.0), (13.0, 14.5)]
+DURATION = 16.0
+
+
+def _recording() -> np.ndarray:
+    t = np.arange(int(DURATION * SAMPLE_RATE)) / SAMPLE_RATE
+    pcm = np.random.default_rng(0).normal(0, 1e-4, t.size).astype(np.float32)
+    for start, end in BURSTS:
+        span = (t >= start) & (t < end)
+        pcm[span] += 0.3 * np.sin(2 * np.pi * 220 * t[span]).astype(np.float32)
+    return pcm
+
+
+def _seg(start, end, text, **extra):
+    return {"start": start, "end": end, "text": text, **extra}
+
+
+def test_detected_regions_cover_the_bursts():
+    regions = vad.detect_speech(_recording())
+    assert len(regions) == len(BURSTS)
+    for (start, end), (burst_start, burst_end) in zip(regions, BURSTS):
+        assert start == pytest.approx(burst_start, abs=0.3)
+        assert end == pytest.approx(burst_end, abs=0.3)
+
+
+def test_compact_records_where_each_region_came_from():
+    pcm = _recording()
+    speech, offsets = vad.compact(pcm, BURSTS)
+    lengths = [end - start for start, end in BURSTS]
+    assert len(speech) / SAMPLE_RATE == pytest.approx(sum(lengths), abs=1e-3)
+    assert [original for _, original in offsets] == [start for start, _ in BURSTS]
+    assert [compacted for compacted, _ in offsets] == pytest.approx(np.cumsum([0.0] + lengths[:-1]).tolist(), abs=1e-3)
+
+
+def test_restore_timestamps_maps_segments_and_words_back():
+    _, offsets = vad.compact(_recording(), BURSTS)
+    # Compacted timeline: burst 1 at 0-1s, burst 2 at 1-2.5s, burst 3 at 2.5-3.5s, burst 4 at 3.5-5s
+    segments = [
+        _seg(0.2, 0.8, "one", words=[{"word": "one", "start": 0.2, "end": 0.8}]),
+        _seg(1.5, 2.0, "two"),
+        _seg(3.6, 4.9, "four", words=[{"word": "four", "start": 3.6, "end": None}]),
+        # Ends exactly where burst 1 ends in the compacted buffer, i.e. where burst 2 starts
+        _seg(0.5, 1.0, "edge", words=[{"word": "edge", "start": 0.5, "end": 1.0}]),
+        # Starts exactly at that boundary, so it belongs to burst 2
+        _seg(1.0, 1.2, "next"),
+    ]
+    restored = vad.restore_timestamps(segments, offsets)
+    assert [(seg["start"], seg["end"]) for seg in restored] == [
+        pytest.approx((1.2, 1.8)), pytest.approx((5.5, 6.0)), pytest.approx((13.1, 14.4)),
+        pytest.approx((1.5, 2.0)), pytest.approx((5.0, 5.2)),
+    ]
+    assert restored[0]["words"][0]["start"] == pytest.approx(1.2)
+    assert restored[2]["words"][0]["end"] is None
+    assert restored[3]["words"][0]["end"] == pytest.approx(2.0)
+    # The input is left untouched
+    assert segments[0]["start"] == 0.2
+
+
+def test_restore_without_offsets_is_identity():
+    segments = [_seg(1.0, 2.0, "a")]
+    assert vad.restore_timestamps(segments, []) == segments